@@ -1,9 +1,23 @@
-import re, json, os , time ,random , logging, hashlib, csv
+import json, os , time ,random , logging, hashlib, argparse, copy
 import mysql.connector
 from mysql.connector import Error
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional
 from datetime import datetime
 from dotenv import load_dotenv
+from amenity_tagger import AmenityTagger
+from browser_pool import BrowserPool
+from browser_profile import FACEBOOK_MEDIA_HOSTS, apply_lean_options, block_resources
+from checkpoint import Checkpoint
+from fetch_pool import AdaptiveThrottle, SessionPool
+from gazetteer import Gazetteer
+from listing_parser import ListingParser, ParsedListing, init_worker, parse_in_worker
+from near_duplicates import NearDuplicateIndex
+from parquet_sink import ParquetSink
+from parse_pipeline import ParsePipeline
+from post_sink import PostSink
+from run_metrics import RunMetrics, timed
+from seen_index import SeenIndex
+from street_index import StreetIndex
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
@@ -16,6 +30,56 @@ from selenium.common.exceptions import (
 
 load_dotenv()
 
+# Content containers tried in order, as in extract_post_content
+CONTENT_XPATHS = [
+    ".//div[@data-ad-rendering-role='story_message']",
+    ".//div[contains(@class, 'x6s0dn4') and contains(@class, 'xh8yej3')]",
+    ".//div[@class='xdj266r x11i5rnm xat24cr x1mh8g0r x1vvkbs x126k92a']"
+]
+
+# Runs in the page: expands "See more"/"Xem thêm" on every post from `start`
+# on, waits once for the expanded text to render, then returns each post's
+# text (whitespace-collapsed like WebElement.text) and timestamp attributes.
+EXTRACT_POSTS_JS = r"""
+const [xpath, start, contentXpaths, done] = arguments;
+const snapshot = document.evaluate(xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+const elements = [];
+for (let i = start; i < snapshot.snapshotLength; i++) elements.push(snapshot.snapshotItem(i));
+
+let clicked = 0;
+for (const el of elements) {
+  for (const btn of el.querySelectorAll("div[role='button']")) {
+    const text = btn.textContent || "";
+    if (text.includes("See more") || text.includes("Xem thêm")) { btn.click(); clicked++; }
+  }
+}
+
+const visibleText = (node) => (node.innerText || "").split("\n")
+  .map(line => line.replace(/\s+/g, " ").trim()).filter(line => line).join("\n");
+
+setTimeout(() => {
+  const posts = elements.map((el, i) => {
+    let content = "";
+    for (const path of contentXpaths) {
+      const node = document.evaluate(path, el, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+      if (node) { content = visibleText(node); break; }
+    }
+    const link = el.querySelector("a[href*='/posts/'], a[href*='/permalink/']");
+    const abbr = el.querySelector("abbr[data-utime]");
+    return {
+      index: start + i,
+      content: content,
+      permalink: link ? link.href.split("?")[0] : "",
+      utime: abbr ? abbr.getAttribute("data-utime") : "",
+      label: link ? (link.getAttribute("aria-label") || link.innerText || "") : "",
+      element: el,
+    };
+  });
+  done({total: snapshot.snapshotLength, posts: posts});
+}, clicked ? 500 : 0);
+"""
+
+
 class FacebookScraperLogger:
     def setup():
         logging.basicConfig(
@@ -37,7 +101,7 @@ class BrowserManager:
         ]
         return random.choice(user_agents)
 
-    def create_browser(headless=False):
+    def create_browser(headless=False, lean=True):
         options = Options()
         if headless:
             options.add_argument("--headless")
@@ -47,23 +111,155 @@ class BrowserManager:
         options.add_argument("--disable-dev-shm-usage")
         options.add_argument("--disable-blink-features=AutomationControlled")
         options.add_argument(f"user-agent={BrowserManager.get_random_user_agent()}")
-        return webdriver.Chrome(options=options)
+        if lean:
+            apply_lean_options(options)
+        driver = webdriver.Chrome(options=options)
+        if lean:
+            block_resources(driver, FACEBOOK_MEDIA_HOSTS)
+        return driver
+
+class PostParser:
+    """Browser-free parsing of FB post content into property details.
+
+    The field logic lives in ListingParser (shared with the web scraper);
+    this class keeps the FB CSV conventions: "" for a missing field, 0 for a
+    missing price and amenities as one sorted, comma-separated string.
+    """
+    def __init__(self, config_file, logger=None):
+        self.logger = logger or logging.getLogger("FacebookGroupScraper")
+        self.config: Dict = {} 
+        self.listing_parser = ListingParser({})
+        self.load_location_config(config_file)
+
+    @property
+    def gazetteer(self) -> Gazetteer:
+        return self.listing_parser.gazetteer
+
+    @property
+    def street_index(self) -> StreetIndex:
+        return self.listing_parser.street_index
+
+    @property
+    def amenity_tagger(self) -> AmenityTagger:
+        return self.listing_parser.amenity_tagger
+
+    def load_location_config(self, config_file):
+        try:
+            with open(config_file, 'r', encoding='utf-8') as f:
+                self.config = json.load(f)
+            self.listing_parser = ListingParser(self.config)
+            self.logger.info(f"Loaded {len(self.config.get('districts', []))} districts, "
+                             f"{len(self.config.get('wards', {}))} ward mappings, {len(self.street_index)} streets")
+        except Exception as e:
+            self.logger.error(f"Error loading config file: {e}")
+            self.config = {}
+            self.listing_parser = ListingParser({})
+
+    def _parse_price(self, content: str) -> int:
+        return self.listing_parser.parse_price(content) or 0
+
+    def _parse_location(self, content: str) -> tuple[str, str]:
+        if not content:
+            return "", ""
+        district, ward = self.listing_parser.parse_location(content)
+        return district or "", ward or ""
+
+    def _parse_amenities(self, content: str) -> str:
+        if not content:
+            return ""
+        return ", ".join(sorted(self.listing_parser.parse_amenities(content)))
+
+    def _parse_area(self, content: str) -> str:
+        area = self.listing_parser.parse_area(content)
+        return "" if area is None else area
+
+    def _parse_address(self, content: str) -> str:
+        return self.listing_parser.parse_address(content) or ""
+
+    def _parse_contact(self, content: str) -> str:
+        return self.listing_parser.parse_contact(content) or ""
+
+    def parse_property_details(self, content):
+        if not content:
+            return {
+                "area": "", "district": "", "ward": "", "address": "",
+                "amenities": "", "price": 0, "contact": ""
+            }
+        return self.details(self.listing_parser.parse(content))
+
+    def details(self, parsed: ParsedListing) -> Dict[str, Any]:
+        """A ParsedListing in the FB CSV's field conventions."""
+        return {
+            "area": "" if parsed.area is None else parsed.area,
+            "district": parsed.district or "",
+            "ward": parsed.ward or "",
+            "address": parsed.address or "",
+            "amenities": ", ".join(sorted(parsed.amenities)),
+            "price": parsed.price or 0,
+            "contact": parsed.contact or "",
+        }
 
 class FacebookGroupScraper:
-    def __init__(self, headless, cookies_file, config_file):
+    CSV_COLUMNS = ["postID", "postDate", "content", "area", "district", "ward", "address", "amenities", "price", "contact"]
+    POST_XPATH = ".//div[@class='x1yztbdb x1n2onr6 xh8yej3 x1ja2u2z']"
+
+    def __init__(self, headless, cookies_file, config_file, seen_index_file="seen_index.sqlite",
+                 checkpoint_file="fb_checkpoint.json", account_min_interval=0.5, account_start_interval=1.5,
+                 lean_browser=True, warm_browsers=1, browser_max_pages=300, browser_max_age=3600,
+                 near_duplicate_threshold=0.7, metrics_report="fb_run_report.json", metrics_prometheus="",
+                 parse_workers=2, parse_queue_size=100):
         self.logger = FacebookScraperLogger.setup()
-        self.driver = BrowserManager.create_browser(headless)
+        self.headless = headless
+        self.lean_browser = lean_browser
+        self.driver = None
         self.cookies_file = cookies_file
-        self.config: Dict = {} 
-        self.districts: List[str] = []
-        self.wards: Dict[str, List[str]] = {}
-        self.streets: List[str] = [] 
-        self.amenity_patterns: Dict[str, str] = {}
-        self.load_location_config(config_file)
+        # Logged-in browsers are kept between runs, so only a new session pays for the cookie login
+        self.browser_pool = BrowserPool(
+            lambda: BrowserManager.create_browser(headless, lean_browser),
+            prepare=self.sign_in,
+            check=lambda driver: not self.at_login_wall(driver),
+            max_pages=browser_max_pages,
+            max_age=browser_max_age,
+            max_idle=warm_browsers,
+        )
+        self.parser = PostParser(config_file, self.logger)
+        self.seen_index = SeenIndex(seen_index_file)
+        # Shares the seen index file, so reposts are matched across Facebook and phongtro123
+        self.near_duplicates = (NearDuplicateIndex(seen_index_file, near_duplicate_threshold)
+                                if near_duplicate_threshold else None)
+        self.checkpoint = Checkpoint(checkpoint_file)
+        # All workers share one account (the cookie jar), so feed loads are paced per account, not per browser
+        self.account_throttle = AdaptiveThrottle(account_min_interval, start_interval=account_start_interval,
+                                                 max_interval=60, slow_after=4)
+        self.metrics_report = metrics_report
+        self.metrics_prometheus = metrics_prometheus
+        self.metrics = self.new_metrics()
+        # Posts are parsed in worker processes, so the browsers never wait on the street scan
+        self.parse_workers = parse_workers
+        self.parse_queue_size = parse_queue_size
+        self.parse_stats = {}
         self.logger.info("Facebook group scraper initialized")
         self.db_connection = None
         self.db_cursor = None
 
+    def new_metrics(self) -> RunMetrics:
+        """Fresh stage timers for a crawl; a no-op recorder when no report is configured."""
+        return RunMetrics(enabled=bool(self.metrics_report or self.metrics_prometheus))
+
+    def write_metrics(self, sink: Optional[PostSink] = None):
+        """Write the crawl's timing report (and Prometheus textfile) with pacing, session and sink counts."""
+        if not self.metrics.enabled:
+            return
+        extra = {"account_pacing": self.account_throttle.metrics(), "browser_sessions": self.browser_pool.stats(),
+                 "parse_pipeline": self.parse_stats}
+        if sink:
+            extra["sink"] = {"written": sink.written, "skipped": sink.skipped, "reposts": sink.reposts,
+                             "db_rows": sink.db_rows}
+            for name, value in extra["sink"].items():
+                self.metrics.count(f"posts_{name}", value)
+        self.metrics.write_report(self.metrics_report, extra)
+        self.metrics.write_prometheus(self.metrics_prometheus, "facebook")
+
     def print_header(self, config):
         print("\n" + "="*50)
         print(" FACEBOOK GROUP SCRAPER & DATABASE IMPORTER")
@@ -75,47 +271,48 @@ class FacebookGroupScraper:
         print(f"• Import to database: {'Yes' if config.get('import_to_db', False) else 'No'}")
         print("="*50 + "\n")
         
-    def load_location_config(self, config_file):
-        try:
-            with open(config_file, 'r', encoding='utf-8') as f:
-                self.config = json.load(f)
-            self.districts = self.config.get("districts", [])
-            self.wards = self.config.get("wards", {})
-            self.streets = self.config.get("streets", []) 
-            self.amenity_patterns = self.config.get("amenity_patterns", {})
-            self.logger.info(f"Loaded {len(self.districts)} districts, {len(self.wards)} ward mappings")
-        except Exception as e:
-            self.logger.error(f"Error loading config file: {e}")
-            self.districts, self.wards,self.streets, self.amenity_patterns = [], [], [], {}
-
     def generate_content_hash(self, content):
         if not content:
             return ""
         normalized_content = ' '.join(content.lower().split())
         return hashlib.md5(normalized_content.encode('utf-8')).hexdigest()
 
-    def load_cookies(self):
+    def load_cookies(self, driver=None):
+        driver = driver or self.driver
         try:
             with open(self.cookies_file, "r") as file:
                 cookies = json.load(file)
             for cookie in cookies:
-                self.driver.add_cookie(cookie)
+                driver.add_cookie(cookie)
             self.logger.info(f"Cookies loaded from {self.cookies_file}")
         except (FileNotFoundError, json.JSONDecodeError) as e:
             self.logger.error(f"Cookie file error: {e}")
 
     def login(self):
+        """Take a logged-in browser from the pool; a new one signs in with the cookies first."""
+        if self.driver is not None:
+            return True
+        try:
+            self.driver = self.browser_pool.acquire()
+            return True
+        except Exception as e:
+            self.logger.error(f"Could not get a logged-in browser: {e}")
+            return False
+
+    @timed("sign_in")
+    def sign_in(self, driver):
         self.logger.info("Logging into Facebook...")
-        self.driver.get("https://www.facebook.com/")
-        WebDriverWait(self.driver, 5).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+        driver.get("https://www.facebook.com/")
+        WebDriverWait(driver, 5).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
         if self.cookies_file:
-            self.load_cookies()
-            self.driver.refresh()
-        return self.verify_login_status()
+            self.load_cookies(driver)
+            driver.refresh()
+        return self.verify_login_status(driver)
 
-    def verify_login_status(self):
+    def verify_login_status(self, driver=None):
+        driver = driver or self.driver
         try:
-            WebDriverWait(self.driver, 5).until(
+            WebDriverWait(driver, 5).until(
                 EC.presence_of_element_located((By.XPATH, ".//input[@placeholder='Search Facebook']"))
             )
             self.logger.info("Login successful")
@@ -173,13 +370,7 @@ class FacebookGroupScraper:
 
     def extract_post_content(self, post_element):
         """Extract post content using multiple fallback methods."""
-        selectors = [
-            ".//div[@data-ad-rendering-role='story_message']",
-            ".//div[contains(@class, 'x6s0dn4') and contains(@class, 'xh8yej3')]",
-            ".//div[@class='xdj266r x11i5rnm xat24cr x1mh8g0r x1vvkbs x126k92a']"
-        ]
-
-        for selector in selectors:
+        for selector in CONTENT_XPATHS:
             try:
                 content_element = post_element.find_element(By.XPATH, selector)
                 return content_element.text
@@ -189,175 +380,276 @@ class FacebookGroupScraper:
         self.logger.error("No content extracted with any selector")
         return ""
 
-    def _parse_price(self, content: str) -> int:
+    def extract_posts_batch(self, start=0):
+        """Expand and read every feed post from index `start` on in one script call.
+
+        Returns (number of posts in the feed, list of post dicts with index,
+        content, permalink, utime, label and element).
+        """
+        with self.metrics.stage("extract_batch"):
+            result = self.driver.execute_async_script(EXTRACT_POSTS_JS, self.POST_XPATH, start, CONTENT_XPATHS)
+        return result["total"], result["posts"]
+
+    def resolve_post_date(self, post):
+        """Post date from the timestamp attributes, hovering for the tooltip only if they carry none."""
+        if post.get("utime"):
+            return datetime.fromtimestamp(int(post["utime"])).strftime('%Y-%m-%d %H:%M:%S')
+        if post.get("label") and ' at ' in post["label"]:
+            return self.format_date(post["label"])
+        return self.extract_post_date(post["element"])
+
+    def at_login_wall(self, driver=None):
+        url = (driver or self.driver).current_url
+        return "/login" in url or "/checkpoint/" in url
+
+    @timed("scroll")
+    def scroll_feed(self, loaded):
+        """Scroll to the bottom and wait for more than `loaded` posts; False if none came."""
+        started = time.monotonic()
+        self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        self.browser_pool.page_loaded(self.driver)
         try:
-            content_lower = content.lower()
-            
-            match = re.search(r'(\d+[.,]?\d*)\s*(triệu|tr|tỷ|ty|trieu)\b', content_lower)
-            if match:
-                value = float(match.group(1).replace(',', '.'))
-                unit = match.group(2)
-                return int(value * (1_000_000_000 if unit in ['tỷ', 'ty'] else 1_000_000))
-            
-            match = re.search(r'(\d+)tr(\d)\b', content_lower)
-            if match:
-                value = float(f"{match.group(1)}.{match.group(2)}")
-                return int(value * 1_000_000)
-        except (ValueError, AttributeError):
-            self.logger.warning("Could not parse price")
+            WebDriverWait(self.driver, 5).until(
+                lambda d: len(d.find_elements(By.XPATH, self.POST_XPATH)) > loaded)
+            self.account_throttle.report(self.driver.current_url, True, time.monotonic() - started)
+            return True
+        except TimeoutException:
+            # The end of a feed also times out, so only a login wall counts against the account
+            if self.at_login_wall():
+                self.account_throttle.report(self.driver.current_url, False)
+            return False
+
+    def restore_feed_position(self, state):
+        """Scroll back to where an interrupted run stopped; returns the index of the first unprocessed post."""
+        processed = state.get("processed", 0)
+        if not processed:
             return 0
+        for _ in range(state.get("scrolls", 0)):
+            if not self.scroll_feed(len(self.driver.find_elements(By.XPATH, self.POST_XPATH))):
+                break
+        try:
+            _, posts = self.extract_posts_batch(processed - 1)
+            if posts and self.generate_content_hash(posts[0]["content"]) == state.get("last_hash"):
+                self.logger.info(f"Resuming feed after post {processed}")
+                return processed
+        except Exception as e:
+            self.logger.warning(f"Could not check checkpoint position: {e}")
+        self.logger.warning("Feed changed since the checkpoint, rescanning from the top")
         return 0
 
-    def _parse_location(self, content: str) -> tuple[str, str]:
-        if not content or not self.districts:
-            return "", ""
-        content_lower = content.lower()
-        detected_district = next((d for d in self.districts if re.search(r"\b" + re.escape(d.lower()) + r"\b", content_lower)), "")
-        detected_ward = ""
-        if detected_district and detected_district in self.wards:
-            detected_ward = next((w for w in self.wards[detected_district] if re.search(r"\b" + re.escape(w.lower()) + r"\b", content_lower)), "")
-        return detected_district, detected_ward
-
-    def _parse_amenities(self, content: str) -> str:
-        if not content or not self.amenity_patterns:
-            return ""
-        content_lower = content.lower()
-        amenities = {label for label, pattern in self.amenity_patterns.items() if re.search(pattern, content_lower, re.IGNORECASE)}
-        return ", ".join(sorted(amenities))
-
-    def _parse_area(self, content: str) -> str:
-        if not content:
-            return ""
-        matches = re.findall(r'(\d+(?:\.\d+)?)\s*(?:m2|m²|met vuong)\b', content, re.IGNORECASE)
-        return float(matches[0]) if matches else ""
-
-    def _parse_address(self, content: str) -> str:
-        if not content:
-            return ""
-
-        found_matches = []
-        for street in self.streets:
-            for match in re.finditer(r'\b(\d*\s*' + re.escape(street) + r'(?:\s+\d+)?)\b', content, re.IGNORECASE):
-                found_matches.append(match)
-
-        if found_matches:
-            first_match = sorted(found_matches, key=lambda m: m.start())[0]
-            return first_match.group(0).strip()
-
-        return ""
-
-    def _parse_contact(self, content: str) -> str:
-        if not content:
-            return ""
-        pattern = r'\b(?:0|\+84)\d{1,2}[\s.-]?\d{3,4}[\s.-]?\d{3,4}\b'
-        matches = re.findall(pattern, content, re.IGNORECASE)
-        if not matches:
-            return ""
-        contact = matches[0].replace('O', '0').replace('o', '0')
-        contact = re.sub(r'[^\d+]', '', contact)
-        if contact.startswith('+84') and 9 <= len(contact[3:]) <= 11:
-            return contact
-        if contact.startswith('0') and 9 <= len(contact) <= 11:
-            return contact
-        if contact.startswith('84') and 9 <= len(contact[2:]) <= 11:
-            return "0" + contact[2:]
-        if 9 <= len(contact) <= 10:
-            return "0" + contact
-        return ""
-
-    def parse_property_details(self, content):
-        if not content:
-            return {
-                "area": "", "district": "", "ward": "", "address": "",
-                "amenities": "", "price": 0, "contact": ""
-            }
-        price = self._parse_price(content)
-        district, ward = self._parse_location(content)
-        amenities = self._parse_amenities(content)
-        area = self._parse_area(content)
-        address = self._parse_address(content)
-        contact = self._parse_contact(content)
-        return {
-            "area": area, "district": district, "ward": ward, "address": address,
-            "amenities": amenities, "price": price, "contact": contact
-        }
-
-    def load_existing_csv_data(self, csv_file_path):
-        existing_posts = []
-        content_hashes = set()
-        if os.path.exists(csv_file_path):
-            try:
-                with open(csv_file_path, 'r', encoding='utf-8', newline='') as f:
-                    csv_reader = csv.DictReader(f)
-                    for row in csv_reader:
-                        existing_posts.append(row)
-                        content_hashes.add(row.get("postID", ""))
-            except Exception as e:
-                self.logger.error(f"Error loading CSV: {e}")
-        return existing_posts, content_hashes
+    def scrape_group_posts(self, group_url, max_posts, sink: PostSink, resume=False,
+                           pipeline: Optional[ParsePipeline] = None):
+        """Scrape one group's feed; returns the posts scraped, or None if the feed did not load.
+
+        With a pipeline, posts are handed to it raw instead of parsed here.
+        """
+        section = f"fb:{group_url}"
+        state = self.checkpoint.get(section) if resume else {}
+        if not resume:
+            self.checkpoint.clear(section)
+        elif state.get("done"):
+            self.logger.info(f"Group already finished before the restart: {group_url}")
+            return 0
 
-    def scrape_group_posts(self, group_url, max_posts, csv_file_path):
         self.logger.info(f"Scraping group: {group_url}")
-        self.driver.get(group_url)
+        self.metrics.observe("throttle_wait", self.account_throttle.wait(group_url))
+        started = time.monotonic()
         try:
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.XPATH, ".//div[@class='x1yztbdb x1n2onr6 xh8yej3 x1ja2u2z']")))
+            with self.metrics.stage("group_load", group_url):
+                self.driver.get(group_url)
+                self.browser_pool.page_loaded(self.driver)
+                WebDriverWait(self.driver, 10).until(
+                    EC.presence_of_element_located((By.XPATH, self.POST_XPATH)))
+            self.account_throttle.report(group_url, True, time.monotonic() - started)
         except TimeoutException:
+            self.metrics.count("group_load_timeout")
+            self.account_throttle.report(group_url, not self.at_login_wall(), time.monotonic() - started)
             self.logger.error("Posts did not load")
-            return 0
-
-        csv_columns = ["postID", "postDate", "content", "area", "district", "ward", "address", "amenities", "price", "contact"]
-        all_posts, content_hashes = self.load_existing_csv_data(csv_file_path)
-        posts_scraped = 0
+            # A failed group keeps its checkpoint, so --resume picks its feed up where it stopped
+            return None
+
+        posts_scraped = state.get("posts_scraped", 0)
+        scrolls = state.get("scrolls", 0)
+        # Feed posts stay in the DOM, so each pass only needs to look at the ones loaded since the last scroll
+        processed = self.restore_feed_position(state)
+        # Hashes handed to the pipeline but maybe not written yet, so a post shown twice is only queued once
+        queued = set()
+
+        def save(progress, record=None, content=None):
+            # With a pipeline, its sink thread moves the checkpoint once the posts queued before are written
+            if pipeline:
+                pipeline.put(content, (section, progress, record))
+                return
+            parsed = None
+            if record is not None:
+                with self.metrics.stage("parse_post", record["url"] or record["postID"]):
+                    parsed = self.parser.listing_parser.parse(content)
+            self.save_post(sink, section, progress, record, parsed)
 
         while posts_scraped < max_posts:
-            post_elements = self.driver.find_elements(By.XPATH, ".//div[@class='x1yztbdb x1n2onr6 xh8yej3 x1ja2u2z']")
+            self.metrics.observe("throttle_wait", self.account_throttle.wait(group_url))
+            try:
+                total, posts = self.extract_posts_batch(processed)
+                if total < processed:
+                    processed = 0
+                    total, posts = self.extract_posts_batch(0)
+            except Exception as e:
+                self.logger.warning(f"Error reading feed posts: {e}")
+                break
             new_posts = 0
 
-            for post in post_elements:
+            for post in posts:
                 if posts_scraped >= max_posts:
                     break
+                processed = post["index"] + 1
                 try:
-                    self.driver.execute_script("arguments[0].scrollIntoView(true);", post)
-                    self.expand_post_content(post)
-                    content = self.extract_post_content(post)
+                    content = post["content"]
+                    if not content:
+                        self.logger.error("No content extracted with any selector")
                     content_hash = self.generate_content_hash(content)
-                    if content_hash in content_hashes:
+                    progress = {"processed": processed, "scrolls": scrolls, "posts_scraped": posts_scraped,
+                                "last_hash": content_hash}
+                    if content_hash in queued or not sink.is_new(content_hash):
+                        save(progress)
                         continue
-                    content_hashes.add(content_hash)
-                    post_date = self.extract_post_date(post)
-                    property_details = self.parse_property_details(content)
-                    all_posts.append({
-                        "postID": content_hash, "postDate": post_date, "content": content,
-                        **property_details
-                    })
+                    queued.add(content_hash)
+                    # Feed posts have no page of their own; the permalink (or hash) keys their timings
+                    key = post.get("permalink") or content_hash
+                    with self.metrics.stage("post_date", key):
+                        post_date = self.resolve_post_date(post)
+                    record = {"postID": content_hash, "postDate": post_date, "content": content,
+                              "url": post.get("permalink")}
+                    save({**progress, "posts_scraped": posts_scraped + 1}, record, content)
                     posts_scraped += 1
                     new_posts += 1
                     self.logger.info(f"Scraped post {posts_scraped}/{max_posts}")
-                    time.sleep(random.uniform(1, 2))
                 except Exception as e:
                     self.logger.warning(f"Error scraping post: {e}")
                     continue
 
             if not new_posts:
                 break
-            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            try:
-                WebDriverWait(self.driver, 5).until(
-                    lambda d: len(d.find_elements(By.XPATH, ".//div[@class='x1yztbdb x1n2onr6 xh8yej3 x1ja2u2z']")) > len(post_elements))
-            except TimeoutException:
+            if not self.scroll_feed(total):
                 break
+            scrolls += 1
+
+        save({"force": True, "done": True, "posts_scraped": posts_scraped})
+        return posts_scraped
+
+    def save_post(self, sink: PostSink, section: str, progress: Dict[str, Any],
+                  record: Optional[Dict[str, Any]] = None, parsed: Optional[ParsedListing] = None):
+        """Write a feed post (if given), then move its group's checkpoint past it."""
+        if record is not None:
+            self.write_post(sink, record, parsed)
+        self.checkpoint.update(section, **progress)
+
+    def write_post(self, sink: PostSink, record: Dict[str, Any], parsed: ParsedListing) -> bool:
+        """Save a feed post with its parsed property details."""
+        with self.metrics.stage("sink_write", record.get("url") or record["postID"]):
+            return sink.write({**record, **self.parser.details(parsed)})
+
+    def open_parse_pipeline(self, sink: PostSink) -> ParsePipeline:
+        """Parse stage between the browsers and the sink: worker processes parse, one thread writes.
+
+        Items are (section, checkpoint progress, record or None), so a group's
+        checkpoint only moves past posts that have been written.
+        """
+        return ParsePipeline(
+            parse_in_worker,
+            lambda item, parsed: self.save_post(sink, *item, parsed),
+            workers=self.parse_workers,
+            queue_size=self.parse_queue_size,
+            initializer=init_worker,
+            initargs=(self.parser.listing_parser,),
+            metrics=self.metrics,
+        )
 
+    def spawn_worker(self):
+        """A logged-in scraper on its own browser, sharing this one's cookies, parser, indexes and rate limit."""
+        worker = copy.copy(self)
+        worker.driver = None
+        worker.db_connection = None
+        worker.db_cursor = None
+        if not worker.login():
+            raise RuntimeError("Worker could not log in with the shared cookies")
+        return worker
+
+    def session_alive(self):
         try:
-            with open(csv_file_path, 'w', encoding='utf-8', newline='') as f:
-                writer = csv.DictWriter(f, fieldnames=csv_columns)
-                writer.writeheader()
-                writer.writerows(all_posts)
-            self.logger.info(f"Saved {len(all_posts)} posts to {csv_file_path}")
-        except Exception as e:
-            self.logger.error(f"Error saving CSV: {e}")
+            self.driver.current_url
+            return True
+        except Exception:
+            return False
 
-        return posts_scraped, all_posts
+    def close_browser(self):
+        """Hand the browser back to the pool, which keeps it logged in for the next run unless it died."""
+        if self.driver is None:
+            return
+        self.browser_pool.release(self.driver, self.session_alive())
+        self.driver = None
+
+    def scrape_groups(self, groups, max_posts, sink: PostSink, resume=False, workers=1,
+                      pipeline: Optional[ParsePipeline] = None):
+        """Scrape every group into one sink; with several workers each gets its own logged-in browser.
+
+        Yields (group_url, posts scraped or None if the group failed) as groups finish, in order.
+        """
+        if workers <= 1:
+            for group_url in groups:
+                yield group_url, self.scrape_group_posts(group_url, max_posts, sink, resume, pipeline)
+            return
+
+        # The pool's browsers do the work; this one was only needed to check the login
+        self.close_browser()
+        pool = SessionPool(
+            spawn=self.spawn_worker,
+            fetch=lambda worker, group_url: worker.scrape_group_posts(group_url, max_posts, sink, resume, pipeline),
+            is_alive=lambda worker: worker.session_alive(),
+            close=lambda worker: worker.close_browser(),
+            size=min(workers, len(groups)),
+        )
+        self.logger.info(f"Scraping {len(groups)} groups on {pool.size} browsers")
+        yield from pool.imap(groups)
+
+    def run_groups(self, groups, max_posts, sink: PostSink, resume=False, workers=1):
+        """One crawl of every group on pooled browsers; False if no logged-in browser was available."""
+        if not self.login():
+            return False
+        pipeline = self.open_parse_pipeline(sink)
+        try:
+            finished = []
+            for group_url, posts_scraped in self.scrape_groups(groups, max_posts, sink, resume, workers, pipeline):
+                if posts_scraped is None:
+                    self.logger.error(f"Failed to scrape {group_url}")
+                    continue
+                self.logger.info(f"Scraped {posts_scraped} posts from {group_url}")
+                finished.append(group_url)
+        finally:
+            # Posts still queued are parsed and written before the sink closes
+            pipeline.close()
+            self.parse_stats = pipeline.stats()
+            self.close_browser()
+        # The run is over, so the next one starts finished groups from the top of their feeds
+        for group_url in finished:
+            self.checkpoint.clear(f"fb:{group_url}")
+        return True
+
+    def open_sink(self, csv_file_path, import_to_db=False, db_batch_size=100, csv_flush_every=1, db_flush_interval=60,
+                  skip_near_duplicates=True, parquet_dir="parquet"):
+        """Sink that appends each post to the CSV and, if asked, upserts it in batches."""
+        return PostSink(
+            csv_file_path,
+            fieldnames=self.CSV_COLUMNS,
+            source="fb",
+            seen_index=self.seen_index,
+            db_writer=(lambda batch: self.import_to_database(batch, db_batch_size)) if import_to_db else None,
+            db_batch_size=db_batch_size,
+            csv_flush_every=csv_flush_every,
+            db_flush_interval=db_flush_interval,
+            near_duplicates=self.near_duplicates,
+            skip_near_duplicates=skip_near_duplicates,
+            parquet=ParquetSink(parquet_dir, "fb") if parquet_dir else None,
+        )
 
     def connect_to_db(self):
         """Connect to the MySQL database."""
@@ -385,6 +677,7 @@ class FacebookGroupScraper:
             self.db_connection.close()
             self.logger.info("Database connection closed")
 
+    @timed("db_upsert")
     def import_to_database(self, data: List[Dict[str, Any]], batch_size: int = 100) -> bool:
         """Import data to MySQL database with upsert (replace if exists)."""
         if not data:
@@ -461,22 +754,39 @@ class FacebookGroupScraper:
             self.close_db_connection()
     
     def close(self):
-        try:
-            self.driver.quit()
-            self.logger.info("Browser closed")
-        except Exception:
-            self.logger.info("No browser instance to close")
+        self.checkpoint.save(force=True)
+        self.seen_index.close()
+        if self.near_duplicates:
+            self.near_duplicates.close()
+        self.close_browser()
+        self.browser_pool.close()
+        self.logger.info(f"Browsers closed: {self.browser_pool.stats()}")
 
 def main():
+    parser = argparse.ArgumentParser(description="Scrape Facebook group posts to CSV and MySQL.")
+    parser.add_argument("--resume", action="store_true", help="continue interrupted groups from the checkpoint")
+    parser.add_argument("--every", type=float, default=0, metavar="MINUTES",
+                        help="stay running and crawl again every MINUTES, reusing logged-in browsers")
+    args = parser.parse_args()
+
     headless = False
+    lean_browser = True
     cookies_file = "facebook_cookies.json"
     config_file = "config.json"
     max_posts = 5
     csv_file_path = 'scrapData.csv'
+    parquet_dir = 'parquet'
     groups = ["https://www.facebook.com/groups/281184089051767"]
 
+    workers = 1
+    parse_workers = 2
+    account_min_interval = 0.5
+    account_start_interval = 1.5
+
     import_to_db = False
     db_batch_size = 100
+    db_flush_interval = 60
+    csv_flush_every = 1
     
     config_dict = {
         "groups": groups,
@@ -486,30 +796,39 @@ def main():
         "import_to_db": import_to_db
     }
     
-    scraper = FacebookGroupScraper(headless, cookies_file, config_file)
+    scraper = FacebookGroupScraper(headless, cookies_file, config_file, account_min_interval=account_min_interval,
+                                   account_start_interval=account_start_interval, lean_browser=lean_browser,
+                                   warm_browsers=workers, parse_workers=parse_workers)
     scraper.print_header(config_dict)
     start_time = time.time()
     
     try:
-        if not scraper.login():
-            logging.error("Login failed")
-            return
-        
-        all_scraped_data = []
-        for group_url in groups:
-            posts_scraped, posts_data = scraper.scrape_group_posts(group_url, max_posts, csv_file_path)
-            scraper.logger.info(f"Scraped {posts_scraped} posts from {group_url}")
-            all_scraped_data.extend(posts_data[-posts_scraped:] if posts_scraped > 0 else [])
-
-        if import_to_db and all_scraped_data:
-            scraper.logger.info(f"Importing {len(all_scraped_data)} posts to database...")
-            scraper.import_to_database(all_scraped_data, db_batch_size)
-        elif import_to_db:
-            scraper.logger.info("No new data to import to database.")
+        resume = args.resume
+        while True:
+            scraper.metrics = scraper.new_metrics()
+            sink = None
+            try:
+                with scraper.open_sink(csv_file_path, import_to_db, db_batch_size, csv_flush_every,
+                                       db_flush_interval, parquet_dir=parquet_dir) as sink:
+                    if not scraper.run_groups(groups, max_posts, sink, resume, workers):
+                        logging.error("Login failed")
+                        return
+            finally:
+                scraper.write_metrics(sink)
+            scraper.logger.info(f"Saved {sink.written} new posts to {csv_file_path}")
+            if import_to_db:
+                scraper.logger.info(f"Imported {sink.db_rows} posts to database")
+            if args.every <= 0:
+                break
+            # The browsers stay open and logged in until the next crawl
+            scraper.logger.info(f"Next crawl in {args.every:g} minutes")
+            time.sleep(args.every * 60)
+            resume = False
             
     except Exception as e:
         logging.error(f"Script error: {e}")
     finally:
+        scraper.logger.info(f"Account pacing: {scraper.account_throttle.metrics()}")
         scraper.close()
         print(f"⏱️ Total execution time: {time.time() - start_time:.2f} seconds")
         
@@ -1,36 +1,96 @@
-import re, json, os , time ,random , logging, hashlib, csv
+import json, os , time , logging, hashlib, copy, argparse, itertools
 import smtplib
 from email.message import EmailMessage
 import mysql.connector
 from mysql.connector import Error
-from typing import Dict, List, Any, Optional, Tuple
+from mysql.connector.constants import ClientFlag
+from typing import Callable, Dict, Iterable, Iterator, List, Any, NamedTuple, Optional, Tuple
 from datetime import datetime
 from dotenv import load_dotenv
+from browser_pool import BrowserPool
+from browser_profile import apply_lean_options, block_resources
+from checkpoint import Checkpoint, Frontier
+from fetch_pool import AdaptiveThrottle, SessionPool
+from http_fetch import HttpFetcher, is_error_page, page_title, parse_detail_page, validate_detail_page
+from index_crawler import IndexCrawler
+from listing_parser import ListingParser
+from near_duplicates import NearDuplicateIndex
+from parquet_sink import ParquetSink
+from parse_pipeline import ParsePipeline
+from post_sink import PostSink
+from post_store import PostStore
+from run_metrics import RunMetrics, timed
+from seen_index import SeenIndex
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.action_chains import ActionChains
 from selenium.common.exceptions import (
-    NoSuchElementException, TimeoutException, StaleElementReferenceException
+    NoSuchElementException, TimeoutException
 )
 
 
 # ======== CONFIGURATION ========
 DEFAULT_CONFIG = {
+    "base_url": "https://phongtro123.com",  # Site root
     "city": "da-nang",                      # City to scrape data from (URL path)
     "post_limit": 5,                        # Number of posts to scrape (0 = all)
     "output_file": "phongtro_data.csv",      # Output filename
+    "parquet_dir": "parquet",               # Typed Parquet dataset written alongside the CSV ("" = CSV only)
     "headless": True,                       # Run browser in headless mode
-    "random_delay": True,                   # Add random delay between operations
-    "min_delay": 1,                         # Minimum delay (seconds)
-    "max_delay": 3,                         # Maximum delay (seconds)
+    "lean_browser": True,                   # Block images, media, fonts and ad/tracker hosts; eager page loads
     "import_to_db": True,                   # Import data to database
-    "db_batch_size": 100,                   # Records in each batch
+    "db_batch_size": 500,                   # Records in each multi-row upsert
+    "db_flush_interval": 60,                # Upsert queued posts at least this often (seconds)
+    "csv_flush_every": 1,                   # Flush the CSV to disk every N posts
     "db_retry_limit": 3,                    # Retries for database operations
+    "detail_workers": 1,                    # Browser sessions fetching detail pages in parallel
+    "host_min_interval": 0.5,               # Fastest pacing per host, all sessions (0 = no pacing)
+    "host_start_interval": 2.0,             # Pacing per host at start, adapted to how it responds
+    "host_max_interval": 30,                # Slowest pacing per host after repeated backoffs
+    "slow_page_seconds": 5,                 # Responses slower than this count as a backoff signal
+    "detail_retries": 2,                    # Retries of a URL after its session crashed
+    "browser_max_pages": 200,               # Recycle a browser session after this many page loads
+    "browser_max_age": 3600,                # ... or once it is this old (seconds)
+    "fetch_engine": "http",                 # "http" (plain GET, Selenium fallback) or "selenium"
+    "index_engine": "http",                 # "http" (concurrent page crawl) or "selenium" (click "Trang sau")
+    "index_concurrency": 4,                 # Listing pages fetched in parallel
+    "index_rate": 2.0,                      # Max listing page requests per second
+    "index_max_pages": 0,                   # Stop after this many listing pages (0 = no limit)
+    "seen_index": "seen_index.sqlite",      # Persistent URL/postID index ("" = re-read the output CSV)
+    "revisit_after_hours": 0,               # Re-fetch seen URLs older than this (0 = never)
+    "near_duplicate_threshold": 0.7,        # Content similarity that makes a post a repost (0 = off; kept in seen_index)
+    "skip_near_duplicates": True,           # Don't save reposts again, only cluster them under their listing
+    "checkpoint_file": "crawl_checkpoint.json",  # Crawl frontier for --resume ("" = no checkpoints)
+    "metrics_report": "run_report.json",    # Per-stage/per-URL timing report after each run ("" = off)
+    "metrics_prometheus": "",               # Also write the timings as a Prometheus textfile (.prom path)
+    "parse_workers": 2,                     # Processes turning fetched pages into posts (0 = parse inline)
+    "parse_queue_size": 100,                # Pages waiting to be parsed before the browsers are held back
 }
 
+UPSERT_SQL = """
+    INSERT INTO post (
+        postID, p_date, content, district, ward,
+        street_address, price, area, amenities, contact_info
+    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE
+        p_date = VALUES(p_date),
+        content = VALUES(content),
+        district = VALUES(district),
+        ward = VALUES(ward),
+        street_address = VALUES(street_address),
+        price = VALUES(price),
+        area = VALUES(area),
+        amenities = VALUES(amenities),
+        contact_info = VALUES(contact_info)
+"""
+
+# Largest value the `price` INT column holds; sale prices in tỷ can exceed it
+MAX_DB_PRICE = 2_147_483_647
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/90.0.4430.212 Safari/537.36"
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -41,15 +101,123 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+class RawPage(NamedTuple):
+    """A fetched page's HTML, waiting for the parse stage."""
+    url: str
+    html: str
+    # Over HTTP a page missing required fields needs a browser instead of being saved as is
+    http: bool = False
+
+
+def extract_datetime(date_time_str: str) -> str:
+    """Extract date and time from string and format it as 'YYYY-MM-DD HH:MM:SS'."""
+    try:
+        parts = date_time_str.split(', ')
+        if len(parts) < 2:
+            return ""
+        raw_datetime = parts[1]
+        dt = datetime.strptime(raw_datetime, "%H:%M %d/%m/%Y")
+        return dt.strftime("%Y-%m-%d %H:%M:%S")
+    except Exception as e:
+        logger.error(f"Error extracting date and time: {str(e)}")
+        return ""
+
+
+def generate_post_id(content: str) -> str:
+    """Generate unique ID from post content."""
+    return hashlib.md5(content.encode('utf-8')).hexdigest()
+
+
+def tag_amenities(parser: ListingParser, amenity_texts: List[str], content: str) -> List[str]:
+    """Map amenity block texts and post content to amenity labels."""
+    detected_amenities = set()
+    for text in amenity_texts:
+        if text:
+            detected_amenities.add(parser.amenity_tagger.first(text) or text)
+    detected_amenities.update(parser.amenity_tagger.tag(content))
+    return list(detected_amenities)
+
+
+def build_post(parser: ListingParser, page: Dict[str, Any]) -> Dict[str, Any]:
+    """Turn raw detail-page fields into a post record."""
+    content = page["content"]
+    district, ward = parser.parse_location(page["address"]) if page["address"] and parser.config else (None, None)
+    return {
+        "postID": generate_post_id(content),
+        "time": extract_datetime(page["time"]),
+        "content": content,
+        "address": page["address"],
+        "ward": ward,
+        "district": district,
+        "area": parser.parse_area(page["area"]),
+        "price": parser.parse_price(page["price"]),
+        "amenities": tag_amenities(parser, page["amenities"], content),
+        "contact": page["contact"],
+    }
+
+
+# The parser of this parse worker process (see WebScraper.open_parse_pipeline)
+_worker_parser: Optional[ListingParser] = None
+
+
+def init_parse_worker(parser: ListingParser):
+    """Pool initializer: keep one parser per worker process instead of shipping it with every page."""
+    global _worker_parser
+    _worker_parser = parser
+
+
+def build_post_in_worker(page: RawPage) -> Optional[Dict[str, Any]]:
+    """Parse a fetched page into its post with the parser init_parse_worker installed in this process.
+
+    Returns None for an HTTP page missing required fields, which needs a browser instead.
+    """
+    fields = parse_detail_page(page.html)
+    if page.http and validate_detail_page(fields):
+        return None
+    return {**build_post(_worker_parser, fields), "url": page.url}
+
+
 class WebScraper:
     def __init__(self, config: Dict[str, Any] = None):
         """Initialize scraper with configuration."""
         self.config = config or DEFAULT_CONFIG
         self.driver = None
         self.patterns = self._load_config()
+        # One compiled parser, shared with the Facebook scraper's field logic
+        self.parser = ListingParser(self.patterns)
+        self.gazetteer = self.parser.gazetteer
+        self.amenity_tagger = self.parser.amenity_tagger
         self.db_connection = None
         self.db_cursor = None
+        self.host_throttle = AdaptiveThrottle(
+            self.config.get("host_min_interval", 0),
+            start_interval=self.config.get("host_start_interval"),
+            max_interval=self.config.get("host_max_interval", 30),
+            slow_after=self.config.get("slow_page_seconds", 5),
+        )
+        self.metrics = self.new_metrics()
+        # Set while write_posts runs: browsers then hand page snapshots to it instead of parsing them
+        self.parse_pipeline = None
+        self.parse_stats = {}
+        self.http_fetcher = HttpFetcher(USER_AGENT, pool_size=max(1, self.config.get("detail_workers", 1)))
+        index_path = self.config.get("seen_index")
+        self.seen_index = SeenIndex(index_path) if index_path else None
+        threshold = self.config.get("near_duplicate_threshold", 0)
+        self.near_duplicates = NearDuplicateIndex(index_path, threshold) if index_path and threshold else None
+        checkpoint_path = self.config.get("checkpoint_file")
+        self.frontier = Frontier(Checkpoint(checkpoint_path), "web") if checkpoint_path else None
+        # Browsers outlive a run, so a scheduled crawl starts on a warm session
+        self.browser_pool = BrowserPool(
+            self.create_driver,
+            max_pages=self.config.get("browser_max_pages", 200),
+            max_age=self.config.get("browser_max_age", 3600),
+            max_idle=max(1, self.config.get("detail_workers", 1)),
+        )
     
+    def new_metrics(self) -> RunMetrics:
+        """Fresh stage timers for a run; a no-op recorder when no report is configured."""
+        return RunMetrics(enabled=bool(self.config.get("metrics_report") or self.config.get("metrics_prometheus")))
+
     def print_header(self):
         """Print program header."""
         print("\n" + "="*50)
@@ -72,7 +240,12 @@ class WebScraper:
             return {}
     
     def setup_driver(self) -> webdriver.Chrome:
-        """Set up and return WebDriver instance."""
+        """Take a browser session from the pool (starting one if none is idle) and return it."""
+        self.driver = self.browser_pool.acquire()
+        return self.driver
+
+    def create_driver(self) -> webdriver.Chrome:
+        """Start a new Chrome session."""
         options = Options()
         if self.config["headless"]:
             options.add_argument("--headless")  
@@ -84,26 +257,22 @@ class WebScraper:
         options.add_argument("--disable-dev-shm-usage")
         
         # Add user-agent to avoid detection as bot
-        options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/90.0.4430.212 Safari/537.36")
+        options.add_argument(f"user-agent={USER_AGENT}")
+        if self.config["lean_browser"]:
+            apply_lean_options(options)
         
-        self.driver = webdriver.Chrome(options=options)
-        return self.driver
-
-    def random_delay(self) -> float:
-        """Create random delay if configured."""
-        if self.config["random_delay"]:
-            delay = random.uniform(self.config["min_delay"], self.config["max_delay"])
-            time.sleep(delay)
-            return delay
-        return 0
+        driver = webdriver.Chrome(options=options)
+        if self.config["lean_browser"]:
+            block_resources(driver)
+        return driver
 
     def check_and_move_to_next_page(self) -> bool:
         """Check and move to next page"""
         try:
             next_button = self.driver.find_element(By.XPATH, "//a[text()='Trang sau »']")
             if next_button.is_enabled():
+                delay = self.host_throttle.wait(self.listing_url())
                 next_button.click()
-                delay = self.random_delay()
                 logger.info(f"Moved to next page (waited {delay:.2f}s)")
                 return True
             else:
@@ -133,6 +302,8 @@ class WebScraper:
                 
                 for element in post_elements:
                     url = element.get_attribute('href')
+                    if self.is_known_url(url):
+                        continue
                     all_post_url.append(url)
                     logger.debug(f"Added URL: {url}")
                     
@@ -153,313 +324,250 @@ class WebScraper:
         
         return all_post_url
 
-    def extract_datetime(self, date_time_str: str) -> str:
-        """Extract date and time from string and format it as 'YYYY-MM-DD HH:MM:SS'."""
-        try:
-            parts = date_time_str.split(', ')
-            if len(parts) < 2:
-                return ""
-            raw_datetime = parts[1] 
-            dt = datetime.strptime(raw_datetime, "%H:%M %d/%m/%Y")
-            return dt.strftime("%Y-%m-%d %H:%M:%S")
-        except Exception as e:
-            logger.error(f"Error extracting date and time: {str(e)}")
-            return ""
-
-    def get_post_content(self) -> str:
-        """Get post content from description."""
-        try:
-            # Wait for element to load
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.XPATH, "//div[@class='border-bottom pb-3 mb-4']"))
+    def listing_url(self) -> str:
+        return f"{self.config.get('base_url', DEFAULT_CONFIG['base_url'])}/tinh-thanh/{self.config['city']}?orderby=moi-nhat"
+
+    def get_index_urls(self, max_posts: int = 0, resume: bool = False) -> Iterable[str]:
+        """Post URLs from the listing pages: streamed by the async crawler, or collected by clicking through.
+
+        With resume, URLs left pending by an interrupted run come first and the
+        crawl continues after the last listing page it reached.
+        """
+        pending, last_page = [], 0
+        if self.frontier:
+            if resume:
+                pending, last_page = self.frontier.restore()
+                pending = [url for url in pending if not self.is_known_url(url)]
+                logger.info(f"Resuming after listing page {last_page} with {len(pending)} pending URLs")
+            else:
+                self.frontier.reset()
+        if max_posts > 0 and len(pending) >= max_posts:
+            return pending[:max_posts]
+        remaining = max_posts - len(pending) if max_posts > 0 else 0
+        on_page = self.frontier.add_page if self.frontier else None
+        resumed = set(pending)
+
+        if self.config.get("index_engine", "selenium") == "http":
+            crawler = IndexCrawler(
+                self.config.get("base_url", DEFAULT_CONFIG["base_url"]),
+                self.config["city"],
+                USER_AGENT,
+                concurrency=self.config.get("index_concurrency", 4),
+                rate=self.config.get("index_rate", 2.0),
+                max_pages=self.config.get("index_max_pages", 0),
+                known=self.is_known_url,
+                start_page=last_page + 1,
+                on_page=on_page,
             )
-            
-            paragraphs = self.driver.find_elements(By.XPATH, "//div[@class='border-bottom pb-3 mb-4']/p")
-            
-            post_content_paragraphs = [p.text.strip() for p in paragraphs]
-            post_content = "\n".join(post_content_paragraphs)
-            return post_content.strip()  
+            urls = crawler.iter_urls(limit=remaining)
+            return itertools.chain(pending, (url for url in urls if url not in resumed))
+
+        if self.driver is None:
+            self.setup_driver()
+        self.metrics.observe("throttle_wait", self.host_throttle.wait(self.listing_url()))
+        with self.metrics.stage("index_selenium"):
+            self.driver.get(self.listing_url())
+            self.browser_pool.page_loaded(self.driver)
+            urls = [url for url in self.get_all_urls(remaining) if url not in resumed]
+        if on_page:
+            on_page(0, urls)
+        return pending + urls
+
+    def is_known_url(self, url: str) -> bool:
+        """True if the seen index says this URL needs no visit this run."""
+        if not self.seen_index:
+            return False
+        return self.seen_index.seen_url(url, self.config.get("revisit_after_hours", 0))
 
-        except TimeoutException:
-            logger.warning("Timeout waiting for description element")
-            return ""
-        except Exception as e:
-            logger.error(f"Error getting post content: {str(e)}")
-            return ""
+    def extract_datetime(self, date_time_str: str) -> str:
+        """Extract date and time from string and format it as 'YYYY-MM-DD HH:MM:SS'."""
+        return extract_datetime(date_time_str)
 
     def generate_post_id(self, content: str) -> str:
         """Generate unique ID from post content."""
-        return hashlib.md5(content.encode('utf-8')).hexdigest()
+        return generate_post_id(content)
 
     def get_district_and_ward(self, address: str) -> Tuple[Optional[str], Optional[str]]:
-        """Extract district and ward from address string using keyword matching."""
+        """Extract district and ward from address string using the gazetteer."""
         if not address or not self.patterns:
             return None, None
-
-        try:
-            # Get district list from config
-            districts = self.patterns.get("districts", [])
-            wards = self.patterns.get("wards", {})
-
-            detected_district = None
-            for district in districts:
-                if re.search(r"\b" + re.escape(district) + r"\b", address, re.IGNORECASE):
-                    detected_district = district
-                    break
-
-            detected_ward = None
-            if detected_district and detected_district in wards:
-                for ward in wards[detected_district]:
-                    if re.search(r"\b" + re.escape(ward) + r"\b", address, re.IGNORECASE):
-                        detected_ward = ward
-                        break
-
-            # Fall back to simple substring match if regex fails
-            if not detected_ward and detected_district:
-                address_lower = address.lower()
-                for ward in wards[detected_district]:
-                    if ward.lower() in address_lower:
-                        detected_ward = ward
-                        break
-
-            return detected_district, detected_ward
-
-        except Exception as e:
-            logger.error(f"Error parsing address '{address}': {str(e)}")
-            return None, None
+        return self.parser.parse_location(address)
         
-    def get_amenities(self, content: str) -> List[str]:
-        """Get amenities list from post."""
-        if not self.patterns:
-            return []
-        
-        # Get amenity patterns from config
-        amenity_patterns = self.patterns.get("amenity_patterns", {})
-        detected_amenities = set()
-        try:
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_all_elements_located((
-                    By.XPATH,
-                    "//div[@class='text-body d-flex pt-1 pb-1' and not(contains(@style, '--bs-text-opacity: 0.1;'))]")))
-            amenity_elements = self.driver.find_elements(
-                By.XPATH,
-                "//div[@class='text-body d-flex pt-1 pb-1' and not(contains(@style, '--bs-text-opacity: 0.1;'))]")
-            
-            for element in amenity_elements:
-                text = element.text.strip()
-                if text:
-                    matched = False
-                    for label, pattern in amenity_patterns.items():
-                        if re.search(pattern, text, re.IGNORECASE):
-                            detected_amenities.add(label)
-                            matched = True
-                            break
-                    if not matched:
-                        detected_amenities.add(text) 
-                        
-            # Get from content
-            for label, pattern in amenity_patterns.items():
-                if re.search(pattern, content, re.IGNORECASE):
-                    detected_amenities.add(label)
-            return list(detected_amenities)
-        except TimeoutException:
-            logger.warning("Timeout waiting for amenity elements")
-            return list(detected_amenities)
-        except Exception as e:
-            logger.error(f"Error getting amenities: {str(e)}")
-            return list(detected_amenities)
+    def tag_amenities(self, amenity_texts: List[str], content: str) -> List[str]:
+        """Map amenity block texts and post content to amenity labels."""
+        return tag_amenities(self.parser, amenity_texts, content)
 
     def extract_price_value(self, price_str: str) -> Optional[int]:
         """Extract numeric value from price string and return as integer (VND)."""
-        try:
-            s = price_str.lower().replace('đồng', '').replace('vnd', '').replace('/tháng', '').strip()
-
-            if m := re.search(r'(\d+)[.,](\d+)\s*triệu', s):
-                return int(m.group(1)) * 1_000_000 + int(m.group(2).ljust(2, '0')) * 10_000
-            elif m := re.search(r'(\d+)\s*triệu', s):
-                return int(m.group(1)) * 1_000_000
-            elif m := re.search(r'(\d{3,}(?:[.,]\d{3})*)', s):
-                return int(m.group(1).replace('.', '').replace(',', ''))
-
-            return None
-        except Exception as e:
-            logger.error(f"Error processing price: {e}")
-            return None
+        return self.parser.parse_price(price_str)
     
-    def extract_area_value(self, area_str: str) -> Optional[float | int]:
+    def extract_area_value(self, area_str: str) -> Optional[float]:
         """Extract numeric value from area string."""
-        try:
-            match = re.search(r'([\d.,]+)', area_str)
-            if not match:
-                return None
+        return self.parser.parse_area(area_str)
 
-            number = float(match.group(1).replace(',', '.'))
-            return number
-        except Exception as e:
-            logger.error(f"Error processing area: {str(e)}")
-            return None
+    def get_post_data(self, url: str) -> Optional[Dict[str, Any] | RawPage]:
+        """Get post data from URL with the browser, parsing one page_source snapshot locally.
 
-        
-    def get_element_text_safely(self, xpath: str, default: str = "") -> str:
-        """Safely get text from an element with fallback."""
-        try:
-            element = self.driver.find_element(By.XPATH, xpath)
-            return element.text.strip()
-        except (NoSuchElementException, StaleElementReferenceException):
-            return default
-        
-    def extract_metadata(self) -> Dict[str, Any]:
-        raw = self.get_element_text_safely(
-            "(//td[@class='border-0 pb-0'])[2]",
-            self.get_element_text_safely("(//table[@class='table table-borderless align-middle m-0'])/tbody//tr[5]")
-        )
-        return {
-            "time": self.extract_datetime(raw)
-        }
-
-    def extract_address_and_location(self) -> Dict[str, Any]:
-        address = self.get_element_text_safely(
-            "(//td[@colspan='3'])[3]",
-            self.get_element_text_safely("(//table[@class='table table-borderless align-middle m-0'])/tbody//tr[3]/td[2]")
-        )
-        district, ward = self.get_district_and_ward(address)
-        return {
-            "address": address,
-            "district": district,
-            "ward": ward
-        }
-
-    def extract_info(self, content: str) -> Dict[str, Any]:
-        price_str = self.get_element_text_safely(
-            "//span[@class='text-price fs-5 fw-bold']",
-            self.get_element_text_safely("//span[@class='text-green fs-5 fw-bold']")
-        )
-        area_str = self.get_element_text_safely("//div[@class='d-flex justify-content-between']/div/span[3]")
-        return {
-            "price": self.extract_price_value(price_str),
-            "area": self.extract_area_value(area_str),
-            "amenities": self.get_amenities(content)
-        }
-
-    def extract_contact(self) -> str:
-        return self.get_element_text_safely(
-            "//div[@class='mb-4']//i[@class='icon telephone-fill white me-2']/.."
-        ).strip()
-
-    def get_post_data(self, url: str) -> Optional[Dict[str, Any]]:
-        """Get post data from URL by extracting parts separately."""
+        While a parse pipeline is running, the snapshot is returned as a RawPage for it to parse instead.
+        """
         try:
-            self.driver.get(url)
-            delay = self.random_delay()
+            delay = self.host_throttle.wait(url)
+            self.metrics.observe("throttle_wait", delay, url)
+            started = time.monotonic()
+            with self.metrics.stage("driver_get", url):
+                self.driver.get(url)
+            recycle = self.browser_pool.page_loaded(self.driver)
             logger.info(f"Loading page {url} (waited {delay:.2f}s)")
 
             if "Page not found" in self.driver.title or "Error" in self.driver.title:
                 logger.warning(f"Page doesn't exist or has error: {url}")
+                self.host_throttle.report(url, "Page not found" in self.driver.title, time.monotonic() - started)
                 return None
+            self.host_throttle.report(url, True, time.monotonic() - started)
 
-            content = self.get_post_content()
-            post_id = self.generate_post_id(content)
-
-            metadata = self.extract_metadata()
-            address_data = self.extract_address_and_location()
-            des_info = self.extract_info(content)
-            contact = self.extract_contact()
-
-            return {
-                "postID": post_id,
-                "time": metadata["time"],
-                "content": content,
-                "address": address_data["address"],
-                "ward": address_data["ward"],
-                "district": address_data["district"],
-                "area": des_info["area"],
-                "price": des_info["price"],
-                "amenities": des_info["amenities"],
-                "contact": contact,
-            }
+            # The description is the only block worth waiting for; optional ones are simply absent from the snapshot
+            try:
+                with self.metrics.stage("wait_description", url):
+                    WebDriverWait(self.driver, 10).until(
+                        EC.presence_of_element_located((By.XPATH, "//div[@class='border-bottom pb-3 mb-4']"))
+                    )
+            except TimeoutException:
+                self.metrics.count("description_timeout")
+                logger.warning("Timeout waiting for description element")
+
+            html = self.driver.page_source
+            if recycle:
+                # The next fallback starts on a fresh session
+                self.close_driver()
+            if self.parse_pipeline:
+                return RawPage(url, html)
+            with self.metrics.stage("parse_html", url):
+                page = parse_detail_page(html)
+            with self.metrics.stage("extract_fields", url):
+                return self.build_post(page)
 
         except Exception as e:
             logger.error(f"Error getting data from URL {url}: {str(e)}")
             return None
 
+    def get_post_data_http(self, url: str) -> Tuple[Optional[Dict[str, Any] | RawPage], bool]:
+        """Get post data with a plain GET; returns (data, needs_browser_fallback).
+
+        While a parse pipeline is running, the page is returned as a RawPage for it to parse instead.
+        """
+        self.metrics.observe("throttle_wait", self.host_throttle.wait(url), url)
+        started = time.monotonic()
+        status, html = self.http_fetcher.fetch(url)
+        elapsed = time.monotonic() - started
+        self.metrics.observe("http_fetch", elapsed, url)
+        if status == 404:
+            # A missing listing is a normal answer, not a sign the host is struggling
+            self.host_throttle.report(url, True, elapsed)
+            logger.warning(f"Page doesn't exist: {url}")
+            return None, False
+        if status != 200:
+            self.host_throttle.report(url, False, elapsed)
+            logger.info(f"HTTP {status} for {url}")
+            return None, True
+
+        if self.parse_pipeline:
+            title = page_title(html)
+            self.host_throttle.report(url, "Error" not in title, elapsed)
+            if is_error_page({"title": title}):
+                logger.warning(f"Page doesn't exist or has error: {url}")
+                return None, False
+            return RawPage(url, html, http=True), False
+
+        with self.metrics.stage("parse_html", url):
+            page = parse_detail_page(html)
+        self.host_throttle.report(url, "Error" not in page["title"], elapsed)
+        if is_error_page(page):
+            logger.warning(f"Page doesn't exist or has error: {url}")
+            return None, False
+        missing = validate_detail_page(page)
+        if missing:
+            logger.info(f"HTTP page missing {', '.join(missing)}: {url}")
+            return None, True
+        with self.metrics.stage("extract_fields", url):
+            return self.build_post(page), False
+
+    def build_post(self, page: Dict[str, Any]) -> Dict[str, Any]:
+        """Turn raw detail-page fields into a post record."""
+        return build_post(self.parser, page)
+
+    def fetch_post(self, url: str, browser: bool = False) -> Optional[Dict[str, Any] | RawPage]:
+        """Get post data over HTTP when configured, falling back to Selenium; browser=True skips HTTP."""
+        with self.metrics.stage("post", url):
+            return self._fetch_post(url, browser)
+
+    def _fetch_post(self, url: str, browser: bool = False) -> Optional[Dict[str, Any] | RawPage]:
+        data, fallback = None, True
+        if self.config.get("fetch_engine", "selenium") == "http" and not browser:
+            data, fallback = self.get_post_data_http(url)
+            if fallback:
+                self.metrics.count("selenium_fallback")
+                logger.info(f"Falling back to Selenium for {url}")
+        if fallback:
+            if self.driver is None:
+                with self.metrics.stage("browser_start"):
+                    self.setup_driver()
+            data = self.get_post_data(url)
+        if isinstance(data, dict):
+            data["url"] = url
+        return data
+
+    def open_sink(self, filename: str, import_to_db: bool = False) -> PostSink:
+        """Sink that appends each post to the CSV and, if asked, upserts it in batches."""
+        return PostSink(
+            filename,
+            source="web",
+            seen_index=self.seen_index,
+            db_writer=self.import_to_database if import_to_db else None,
+            db_batch_size=self.config["db_batch_size"],
+            csv_flush_every=self.config.get("csv_flush_every", 1),
+            db_flush_interval=self.config.get("db_flush_interval", 60),
+            near_duplicates=self.near_duplicates,
+            skip_near_duplicates=self.config.get("skip_near_duplicates", True),
+            parquet=ParquetSink(self.config["parquet_dir"], "web") if self.config.get("parquet_dir") else None,
+        )
+
     def save_to_csv(self, data: List[Dict], filename: str) -> bool:
         """Save data to CSV file, skipping already existing posts."""
         try:
             if not data:
                 logger.warning("No data to save to CSV.")
                 return False
-            
-            # Get existing post IDs if file exists
-            existing_post_ids = set()
-            if os.path.exists(filename):
-                try:
-                    with open(filename, 'r', encoding='utf-8', newline='') as csvfile:
-                        reader = csv.DictReader(csvfile)
-                        existing_post_ids = {row.get('postID') for row in reader if row.get('postID')}
-                    logger.info(f"Found {len(existing_post_ids)} existing posts in {filename}")
-                except Exception as e:
-                    logger.warning(f"Could not read existing CSV file: {str(e)}")
-            
-            # Filter out already existing posts
-            new_data = [post for post in data if post.get('postID') not in existing_post_ids]
-            
-            if not new_data:
-                logger.info("All posts already exist in CSV file. No new data to save.")
-                return True
-            
-            logger.info(f"Saving {len(new_data)} new posts (skipped {len(data) - len(new_data)} existing)")
-            
-            # Get field names from the first item
-            fieldnames = list(data[0].keys())
-            
-            # Append to existing file or create new one
-            file_mode = 'a' if existing_post_ids else 'w'
-            write_header = not existing_post_ids
-            
-            with open(filename, file_mode, encoding='utf-8', newline='') as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                if write_header:
-                    writer.writeheader()
-                
-                for row in new_data:
-                    row_copy = row.copy()
-                    if isinstance(row_copy["amenities"], list):
-                        row_copy["amenities"] = json.dumps(row_copy["amenities"], ensure_ascii=False)
-                    writer.writerow(row_copy)
-            
-            logger.info(f"Saved {len(new_data)} new posts to {filename}")
+            with self.open_sink(filename) as sink:
+                for post in data:
+                    sink.write(post)
             return True
-            
         except Exception as e:
             logger.error(f"Error saving data to CSV file: {str(e)}")
             return False
 
-    def print_summary(self, post_data_list: List[Dict]):
+    def print_summary(self, posts: PostStore | List[Dict]):
         """Print summary of collected data."""
-        if not post_data_list:
+        if not posts:
             print("No data collected!")
             return
+        store = posts if isinstance(posts, PostStore) else PostStore.from_posts(posts)
             
         print("\n" + "="*50)
         print(f"🏠 PHONGTRO DATA COLLECTION SUMMARY 🏠")
         print("="*50)
-        print(f"✅ Number of posts collected: {len(post_data_list)}")
+        print(f"✅ Number of posts collected: {len(store)}")
         
         # District stats
-        districts = {}
-        for post in post_data_list:
-            district = post.get("district", "")
-            if district:
-                districts[district] = districts.get(district, 0) + 1
-        
+        districts = store.district_counts()
         if districts:
             print("\n📍 Distribution by district:")
-            for district, count in sorted(districts.items(), key=lambda x: x[1], reverse=True):
+            for district, count in districts.items():
                 print(f"  • District {district}: {count} posts")
         
         # Price stats
-        prices = [post.get("price", "") for post in post_data_list if post.get("price")]
-        if prices:
+        prices = store.prices()
+        prices = prices[prices > 0]
+        if len(prices):
             print("\n💰 Price information:")
             print(f"  • Number of posts with price info: {len(prices)}")
         
@@ -470,15 +578,160 @@ class WebScraper:
             
         print("="*50 + "\n")
 
-    def collect_posts(self, urls: List[str]) -> List[Dict[str, Any]]:
-        posts = []
-        for i, url in enumerate(urls):
-            print(f"Processing post {i+1}/{len(urls)}", end='\r')
-            logger.info(f"Processing {i+1}/{len(urls)}: {url}")
-            data = self.get_post_data(url)
+    def write_metrics(self, sink: Optional[PostSink] = None):
+        """Write the run's timing report (and Prometheus textfile) with pacing, session and sink counts."""
+        if not self.metrics.enabled:
+            return
+        extra = {"host_pacing": self.host_throttle.metrics(), "browser_sessions": self.browser_pool.stats(),
+                 "parse_pipeline": self.parse_stats}
+        if sink:
+            extra["sink"] = {"written": sink.written, "skipped": sink.skipped, "reposts": sink.reposts,
+                             "db_rows": sink.db_rows}
+            for name, value in extra["sink"].items():
+                self.metrics.count(f"posts_{name}", value)
+        self.metrics.write_report(self.config.get("metrics_report"), extra)
+        self.metrics.write_prometheus(self.config.get("metrics_prometheus"), "phongtro")
+
+    def open_parse_pipeline(self, handle: Callable[[str | Dict[str, Any], Optional[Dict[str, Any]]], None]) -> ParsePipeline:
+        """Parse stage: worker processes turn fetched pages into posts, one thread hands them to handle()."""
+        return ParsePipeline(
+            build_post_in_worker,
+            handle,
+            workers=self.config.get("parse_workers", 2),
+            queue_size=self.config.get("parse_queue_size", 100),
+            initializer=init_parse_worker,
+            initargs=(self.parser,),
+            metrics=self.metrics,
+        )
+
+    def write_posts(self, urls: Iterable[str], sink: PostSink,
+                    done: Optional[Callable[[str], None]] = None) -> PostStore:
+        """Fetch every URL and write its post to the sink; returns the posts written.
+
+        Fetched pages are parsed into posts in the parse stage's worker
+        processes, and every post is written on its sink thread, so neither
+        parsing nor CSV/database writes hold up the fetchers. HTTP pages the
+        workers find incomplete are fetched again with a browser once the
+        stage has drained. done(url) is called once a URL's post is written;
+        URLs that failed stay pending, so a resumed crawl tries them again.
+        """
+        summary = PostStore()
+        fallback = []
+
+        def write(post: Dict[str, Any]):
+            with self.metrics.stage("sink_write", post["url"]):
+                written = sink.write(post)
+            if written:
+                summary.append(post, "web")
+            if done:
+                done(post["url"])
+
+        def handle(fetched: str | Dict[str, Any], post: Optional[Dict[str, Any]]):
+            if isinstance(fetched, dict):
+                write(fetched)
+            elif post is None:
+                fallback.append(fetched)
+            else:
+                write(post)
+
+        pipeline = self.open_parse_pipeline(handle)
+        self.parse_pipeline = pipeline
+        try:
+            for data in self.iter_posts(urls):
+                if isinstance(data, RawPage):
+                    pipeline.put(data, data.url)
+                else:
+                    pipeline.put(None, data)
+        finally:
+            # Pages still queued are parsed and written before the sink closes
+            self.parse_pipeline = None
+            pipeline.close()
+            self.parse_stats = pipeline.stats()
+
+        if fallback:
+            self.metrics.count("selenium_fallback", len(fallback))
+            logger.info(f"Falling back to Selenium for {len(fallback)} incomplete HTTP pages")
+            for post in self.iter_posts(fallback, browser=True):
+                write(post)
+        return summary
+
+    def collect_posts(self, urls: Iterable[str]) -> List[Dict[str, Any]]:
+        return list(self.iter_posts(urls))
+
+    def iter_posts(self, urls: Iterable[str], done: Optional[Callable[[str], None]] = None,
+                   browser: bool = False) -> Iterator[Dict[str, Any] | RawPage]:
+        """Yield post data for each URL in order, on one or several browser sessions.
+
+        done(url) is called once a URL's post has been consumed (or it failed).
+        While a parse pipeline runs, fetched pages come out as RawPages.
+        browser=True fetches every URL with Selenium, even under the http engine.
+        """
+        workers = self.config.get("detail_workers", 1)
+        total = f"/{len(urls)}" if hasattr(urls, "__len__") else ""
+        if workers <= 1:
+            for i, url in enumerate(urls):
+                print(f"Processing post {i+1}{total}", end='\r')
+                logger.info(f"Processing {i+1}{total}: {url}")
+                data = self.fetch_post(url, browser)
+                if data:
+                    yield data
+                if done:
+                    done(url)
+            return
+
+        pool = SessionPool(
+            spawn=self._spawn_worker,
+            fetch=lambda worker, url: worker.fetch_post(url, browser),
+            is_alive=lambda worker: worker.session_alive(),
+            close=lambda worker: worker.close_driver(),
+            size=workers,
+            max_retries=self.config.get("detail_retries", 2),
+        )
+        logger.info(f"Fetching detail pages on {workers} workers")
+        for i, (url, data) in enumerate(pool.imap(urls)):
+            print(f"Processing post {i+1}{total}", end='\r')
+            logger.info(f"Processed {i+1}{total}: {url}")
             if data:
-                posts.append(data)
-        return posts
+                yield data
+            if done:
+                done(url)
+        logger.info(f"Detail fetch finished ({pool.restarts} session restarts)")
+
+    def _spawn_worker(self) -> "WebScraper":
+        """Create a copy of this scraper with its own browser session."""
+        worker = copy.copy(self)
+        worker.driver = None
+        worker.db_connection = None
+        worker.db_cursor = None
+        # HTTP workers only start a browser if a page needs the Selenium fallback.
+        if self.config.get("fetch_engine", "selenium") != "http":
+            worker.setup_driver()
+        return worker
+
+    def close_driver(self):
+        """Hand the browser session back to the pool, which keeps it warm unless it is dead or worn out."""
+        if self.driver:
+            self.browser_pool.release(self.driver, self.session_alive())
+            self.driver = None
+
+    def close(self):
+        """Quit the pooled browsers and close the seen index; call once the last run is over."""
+        self.close_driver()
+        self.browser_pool.close()
+        if self.seen_index:
+            self.seen_index.close()
+        if self.near_duplicates:
+            self.near_duplicates.close()
+
+    def session_alive(self) -> bool:
+        """Check whether the browser session still responds."""
+        if self.driver is None:
+            return True
+        try:
+            self.driver.current_url
+            return True
+        except Exception:
+            return False
 
     def connect_to_db(self):
         """Connect to the MySQL database."""
@@ -487,10 +740,13 @@ class WebScraper:
             
             self.db_connection = mysql.connector.connect(
                 host=os.getenv('db_host'),
+                port=int(os.getenv('db_port', 3306)),
                 user=os.getenv('db_user'),
                 password=os.getenv('db_password'),
                 database=os.getenv('db_name'),
-                connection_timeout=10
+                connection_timeout=10,
+                # Affected rows then count an unchanged duplicate as 1, so updated rows are exactly rows - affected
+                client_flags=[ClientFlag.FOUND_ROWS]
             )
             self.db_connection.autocommit = False  # Disable autocommit for batch processing
             self.db_cursor = self.db_connection.cursor()
@@ -510,6 +766,7 @@ class WebScraper:
             logger.info("Database connection closed")
             print("Database connection closed")
 
+    @timed("db_upsert")
     def import_to_database(self, data: List[Dict[str, Any]]) -> bool:
         """Import data to MySQL database with upsert (replace if exists)."""
         if not data:
@@ -544,85 +801,36 @@ class WebScraper:
                 logger.error(f"Error creating table: {str(e)}")
                 return False
                 
-            # Prepare SQL for inserting or updating
-            upsert_sql = """
-                INSERT INTO post (
-                    postID, p_date, content, district, ward,
-                    street_address, price, area, amenities, contact_info
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                ON DUPLICATE KEY UPDATE
-                    p_date = VALUES(p_date),
-                    content = VALUES(content),
-                    district = VALUES(district),
-                    ward = VALUES(ward),
-                    street_address = VALUES(street_address),
-                    price = VALUES(price),
-                    area = VALUES(area),
-                    amenities = VALUES(amenities),
-                    contact_info = VALUES(contact_info)
-            """
-            
             records_processed = 0
             records_updated = 0
-            records_inserted = 0
+            batch_size = max(1, self.config["db_batch_size"])
             
-            # Process data in batches
-            for i, row in enumerate(data):
+            for offset in range(0, len(data), batch_size):
+                batch = data[offset:offset + batch_size]
                 try:
-                    # Check if post already exists
-                    check_sql = "SELECT COUNT(*) FROM post WHERE postID = %s"
-                    self.db_cursor.execute(check_sql, (row["postID"],))
-                    exists = self.db_cursor.fetchone()[0] > 0
-                    
-                    amenities_json = json.dumps(row["amenities"], ensure_ascii=False) if isinstance(row["amenities"], list) else row["amenities"]
-                    
-                    # Prepare values tuple
-                    values = (
-                        row["postID"],
-                        row["time"],
-                        row["content"],
-                        row["district"],
-                        row["ward"],
-                        row["address"],
-                        row["price"],
-                        row["area"],
-                        amenities_json,
-                        row["contact"]
-                    )
-                    
-                    # Try to insert/update with retries
-                    for attempt in range(self.config["db_retry_limit"]):
+                    affected = self.upsert_batch([self.post_to_db_row(row) for row in batch])
+                    records_processed += len(batch)
+                    # MySQL counts 1 per inserted or unchanged row and 2 per updated row
+                    records_updated += affected - len(batch)
+                    logger.info(f"Committed batch of {len(batch)} records (total: {records_processed})")
+                    print(f"Processed {records_processed} records ({records_processed - records_updated} new or unchanged, {records_updated} updated)")
+                except Exception as e:
+                    self.db_connection.rollback()
+                    logger.error(f"Error processing rows {offset}-{offset + len(batch) - 1}: {str(e)}; "
+                                 f"retrying them one by one")
+                    # One bad value fails the whole statement, so only rows that also fail alone are skipped
+                    for i, row in enumerate(batch, offset):
                         try:
-                            self.db_cursor.execute(upsert_sql, values)
+                            affected = self.upsert_batch([self.post_to_db_row(row)])
                             records_processed += 1
-                            
-                            if exists:
-                                records_updated += 1
-                            else:
-                                records_inserted += 1
-                                
-                            break 
-                        except mysql.connector.errors.DatabaseError as e:
-                            if "Lock wait timeout exceeded" in str(e) and attempt < self.config["db_retry_limit"] - 1:
-                                logger.warning(f"Lock timeout on row {i}, retrying ({attempt + 1}/{self.config['db_retry_limit']})...")
-                                time.sleep(2)
-                            else:
-                                raise
-                    
-                    # Commit every batch_size records
-                    if i % self.config["db_batch_size"] == 0 and i > 0:
-                        self.db_connection.commit()
-                        logger.info(f"Committed batch of {self.config['db_batch_size']} records (total: {records_processed})")
-                        print(f"Processed {records_processed} records ({records_inserted} new, {records_updated} updated)")
-                
-                except Exception as e:
-                    logger.error(f"Error processing row {i}: {str(e)}")
-                    print(f"Error processing row {i}: {str(e)}")
+                            records_updated += affected - 1
+                        except Exception as e:
+                            self.db_connection.rollback()
+                            logger.error(f"Error processing row {i} ({row.get('postID')}): {str(e)}")
+                            print(f"Error processing row {i}: {str(e)}")
             
-            # Final commit for remaining records
-            self.db_connection.commit()
-            logger.info(f"Database import complete. Total: {records_processed} records ({records_inserted} new, {records_updated} updated)")
-            print(f"Database import complete. Total: {records_processed} records ({records_inserted} new, {records_updated} updated)")
+            logger.info(f"Database import complete. Total: {records_processed} records ({records_processed - records_updated} new or unchanged, {records_updated} updated)")
+            print(f"Database import complete. Total: {records_processed} records ({records_processed - records_updated} new or unchanged, {records_updated} updated)")
             return True
             
         except Error as e:
@@ -633,6 +841,45 @@ class WebScraper:
         finally:
             self.close_db_connection()
             
+    def post_to_db_row(self, row: Dict[str, Any]) -> Tuple:
+        """Map a post record to the column order of UPSERT_SQL."""
+        amenities_json = json.dumps(row["amenities"], ensure_ascii=False) if isinstance(row["amenities"], list) else row["amenities"]
+        price = row["price"]
+        if price is not None and price > MAX_DB_PRICE:
+            price = None
+        return (
+            row["postID"],
+            row["time"],
+            row["content"],
+            row["district"],
+            row["ward"],
+            row["address"],
+            price,
+            row["area"],
+            amenities_json,
+            row["contact"]
+        )
+
+    def upsert_batch(self, rows: List[Tuple]) -> int:
+        """Upsert rows as one multi-row statement and commit; returns MySQL's affected-rows count."""
+        retry_limit = self.config["db_retry_limit"]
+        for attempt in range(retry_limit):
+            try:
+                # executemany rewrites the INSERT into a single multi-row VALUES list
+                self.db_cursor.executemany(UPSERT_SQL, rows)
+                affected = self.db_cursor.rowcount
+                self.db_connection.commit()
+                return affected
+            except mysql.connector.errors.DatabaseError as e:
+                if "Lock wait timeout exceeded" in str(e) or "Deadlock found" in str(e):
+                    self.db_connection.rollback()
+                    if attempt < retry_limit - 1:
+                        logger.warning(f"Lock timeout on batch of {len(rows)}, retrying ({attempt + 1}/{retry_limit})...")
+                        time.sleep(2)
+                        continue
+                raise
+        return 0
+
     def send_log_via_email(self, logfile: str, subject: str = "Scraper Log"):
             """Send the log file to your email address."""
             load_dotenv()
@@ -690,7 +937,7 @@ class WebScraper:
         except Exception as e:
             logger.error(f"Failed to send CSV via email: {str(e)}")
             
-    def run(self):
+    def run(self, resume: bool = False):
         """Run the complete workflow: scrape data, save to CSV, and import to database."""
         print("Scraper started...")
         self.print_header()
@@ -699,37 +946,46 @@ class WebScraper:
             return
 
         start_time = time.time()
-        self.setup_driver()
+        self.metrics = self.new_metrics()
+        sink = None
 
         try:
-            self.driver.get(f"https://phongtro123.com/tinh-thanh/{self.config['city']}?orderby=moi-nhat")
-            self.random_delay()
+            urls = self.get_index_urls(self.config["post_limit"], resume)
+            done = self.frontier.done if self.frontier else None
 
-            urls = self.get_all_urls(self.config["post_limit"])
-            posts = self.collect_posts(urls)
+            # Each post is appended to the CSV (and queued for the database) as soon as it is parsed
+            with self.open_sink(self.config["output_file"], self.config["import_to_db"]) as sink:
+                summary = self.write_posts(urls, sink, done)
+            if self.frontier:
+                self.frontier.reset()
 
-            if posts:
-                # Save to CSV
-                self.save_to_csv(posts, self.config["output_file"])
-                
-                # Import to database if configured
-                if self.config["import_to_db"]:
-                    try:
-                        self.import_to_database(posts)
-                    except Exception as e:
-                        import traceback
-                        print(f"[❌ DB IMPORT ERROR] {traceback.format_exc()}")
-                            
-                        self.print_summary(posts)
-                    else:
-                        print("No data collected.")
+            if summary:
+                self.print_summary(summary)
+            else:
+                print("No data collected.")
         finally:
-            if self.driver:
-                self.driver.quit()
+            self.close_driver()
+            if self.frontier:
+                self.frontier.checkpoint.save(force=True)
+            logger.info(f"Host pacing: {self.host_throttle.metrics()}")
+            logger.info(f"Browser sessions: {self.browser_pool.stats()}")
+            self.write_metrics(sink)
             print(f"⏱️ Execution time: {time.time() - start_time:.2f} seconds")
             self.send_csv_via_email(self.config["output_file"])
             self.send_log_via_email('phongtro_data.log') 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape phongtro123 listings to CSV and MySQL.")
+    parser.add_argument("--resume", action="store_true", help="continue an interrupted crawl from its checkpoint")
+    parser.add_argument("--every", type=float, default=0, metavar="MINUTES",
+                        help="stay running and crawl again every MINUTES, reusing warm browser sessions")
+    args = parser.parse_args()
     scraper = WebScraper(DEFAULT_CONFIG)
-    scraper.run()
\ No newline at end of file
+    try:
+        scraper.run(resume=args.resume)
+        while args.every > 0:
+            logger.info(f"Next crawl in {args.every:g} minutes")
+            time.sleep(args.every * 60)
+            scraper.run()
+    finally:
+        scraper.close()
\ No newline at end of file
@@ -0,0 +1,67 @@
+import re
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+class AmenityTagger:
+    """Amenity patterns from config.json, compiled once and applied in batches.
+
+    Text is lowercased once per post and plain patterns are lowercased at
+    build time, so matching runs without re.IGNORECASE (the bulk of the old
+    per-post cost). Patterns that use escapes keep IGNORECASE, since
+    lowercasing them would change their meaning (\\S vs \\s).
+    """
+
+    def __init__(self, patterns: Dict[str, str]):
+        self.labels: List[str] = list(patterns)
+        self.patterns: List[re.Pattern] = []
+        for pattern in patterns.values():
+            if '\\' in pattern:
+                self.patterns.append(re.compile(pattern, re.IGNORECASE))
+            else:
+                self.patterns.append(re.compile(pattern.lower()))
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "AmenityTagger":
+        """Build a tagger from a loaded config.json dict."""
+        return cls(config.get("amenity_patterns", {}))
+
+    def _row(self, text: str) -> List[bool]:
+        text = text.lower()
+        return [pattern.search(text) is not None for pattern in self.patterns]
+
+    def tag(self, text: str) -> List[str]:
+        """Return the labels matched in text, in config order."""
+        if not text:
+            return []
+        return [label for label, hit in zip(self.labels, self._row(text)) if hit]
+
+    def first(self, text: str) -> Optional[str]:
+        """Return the first label (in config order) whose pattern matches text."""
+        if not text:
+            return None
+        text = text.lower()
+        for label, pattern in zip(self.labels, self.patterns):
+            if pattern.search(text):
+                return label
+        return None
+
+    def tag_matrix(self, texts: Iterable[str]) -> np.ndarray:
+        """Tag a batch of texts; returns a (len(texts), len(labels)) boolean matrix."""
+        texts = list(texts)
+        matrix = np.zeros((len(texts), len(self.labels)), dtype=bool)
+        for i, text in enumerate(texts):
+            if isinstance(text, str) and text:
+                matrix[i] = self._row(text)
+        return matrix
+
+    def tag_frame(self, texts) -> pd.DataFrame:
+        """Tag a list or Series of texts; returns a boolean DataFrame with one column per label."""
+        index = texts.index if isinstance(texts, pd.Series) else None
+        return pd.DataFrame(self.tag_matrix(texts), columns=self.labels, index=index)
+
+    def labels_from_matrix(self, matrix: np.ndarray) -> List[List[str]]:
+        """Turn rows of a tag matrix back into label lists."""
+        return [[self.labels[j] for j in np.flatnonzero(row)] for row in matrix]
@@ -0,0 +1,69 @@
+"""Benchmark: AmenityTagger.tag_matrix vs. per-post re.search over every pattern.
+
+Usage: python benchmarks/bench_amenity_tagger.py [--posts 20000] [--seed 7]
+"""
+import argparse, json, os, random, re, sys, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from amenity_tagger import AmenityTagger
+
+FILLER = (
+    "cho thuê phòng trọ giá rẻ gần trường đại học liên hệ chính chủ "
+    "sạch sẽ thoáng mát khu dân cư yên tĩnh giá điện nước theo nhà nước"
+).split()
+AMENITY_WORDS = [
+    "Máy lạnh", "wifi", "tủ lạnh", "gác lửng", "WC riêng", "bếp từ", "ban công",
+    "chỗ để xe", "camera an ninh", "truyền hình cáp quang", "không chung chủ", "TV",
+]
+
+
+def legacy_tag(patterns, content):
+    """The original per-post loop from FacebookGroupScraper._parse_amenities."""
+    content_lower = content.lower()
+    return {label for label, pattern in patterns.items() if re.search(pattern, content_lower, re.IGNORECASE)}
+
+
+def build_corpus(size, seed):
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(size):
+        words = [rng.choice(FILLER) for _ in range(100)]
+        for _ in range(rng.randint(0, 5)):
+            words.insert(rng.randrange(len(words)), rng.choice(AMENITY_WORDS))
+        corpus.append(" ".join(words))
+    return corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--posts", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--config", default=os.path.join(ROOT, "config.json"))
+    args = parser.parse_args()
+
+    with open(args.config, 'r', encoding='utf-8') as f:
+        patterns = json.load(f).get("amenity_patterns", {})
+    corpus = build_corpus(args.posts, args.seed)
+    tagger = AmenityTagger(patterns)
+
+    start = time.perf_counter()
+    legacy = [legacy_tag(patterns, content) for content in corpus]
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matrix = tagger.tag_matrix(corpus)
+    batch_time = time.perf_counter() - start
+
+    mismatches = sum(set(row) != old for row, old in zip(tagger.labels_from_matrix(matrix), legacy))
+    print(f"Patterns: {len(patterns)}  Posts: {len(corpus)}")
+    print(f"Legacy per-post: {legacy_time:.3f} s  ({legacy_time / len(corpus) * 1e6:.1f} us/post)")
+    print(f"tag_matrix:      {batch_time:.3f} s  ({batch_time / len(corpus) * 1e6:.1f} us/post)")
+    print(f"Speedup:         {legacy_time / batch_time:.1f}x")
+    print(f"Mismatches:      {mismatches}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+"""Benchmark: WebScraper.import_to_database (multi-row upsert) vs. the old per-row probe + upsert.
+
+Needs a scratch MySQL/MariaDB server, e.g.
+    docker run -d --rm --name bench-db -p 3306:3306 \
+        -e MARIADB_ROOT_PASSWORD=bench -e MARIADB_DATABASE=scraper_bench mariadb:11
+
+Usage: python benchmarks/bench_db_upsert.py [--rows 10000 100000] [--legacy-max 10000]
+           [--host 127.0.0.1] [--port 3306] [--user root] [--password bench] [--database scraper_bench]
+
+Each size runs twice against an empty `post` table: a first pass that inserts
+every row and a second pass where half the rows changed. The legacy loop is
+only timed up to --legacy-max rows (two round trips per row gets slow).
+"""
+import argparse, hashlib, os, random, sys, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from Scrapping_Web import DEFAULT_CONFIG, UPSERT_SQL, WebScraper
+
+DISTRICTS = ["Hải Châu", "Thanh Khê", "Sơn Trà", "Ngũ Hành Sơn", "Liên Chiểu", "Cẩm Lệ"]
+AMENITIES = ["Có máy lạnh", "Có gác", "Có kệ bếp", "Có máy giặt", "Sân phơi đồ", "Có wifi"]
+
+
+def build_posts(size, seed, changed=0.0):
+    rng = random.Random(seed)
+    posts = []
+    for i in range(size):
+        content = f"Cho thuê phòng trọ số {i} " + " ".join(rng.choice(DISTRICTS) for _ in range(60))
+        posts.append({
+            "postID": hashlib.md5(content.encode("utf-8")).hexdigest(),
+            "time": "2025-04-10 14:30:00",
+            "content": content,
+            "address": f"K{i}/5 Nguyễn Văn Thoại",
+            "ward": "An Hải Đông",
+            "district": rng.choice(DISTRICTS),
+            "area": float(rng.randint(12, 60)),
+            "price": rng.randint(10, 80) * 100_000 + (1 if rng.random() < changed else 0),
+            "amenities": rng.sample(AMENITIES, rng.randint(0, 4)),
+            "contact": "0905 123 456",
+        })
+    return posts
+
+
+def legacy_import(scraper, data):
+    """The original loop: SELECT COUNT(*) probe, then a single-row upsert, per post."""
+    scraper.connect_to_db()
+    inserted = updated = 0
+    try:
+        for i, row in enumerate(data):
+            scraper.db_cursor.execute("SELECT COUNT(*) FROM post WHERE postID = %s", (row["postID"],))
+            exists = scraper.db_cursor.fetchone()[0] > 0
+            scraper.db_cursor.execute(UPSERT_SQL, scraper.post_to_db_row(row))
+            if exists:
+                updated += 1
+            else:
+                inserted += 1
+            if i % scraper.config["db_batch_size"] == 0 and i > 0:
+                scraper.db_connection.commit()
+        scraper.db_connection.commit()
+    finally:
+        scraper.close_db_connection()
+    return inserted, updated
+
+
+def reset_table(scraper, sample):
+    """Recreate an empty `post` table with the scraper's own DDL."""
+    scraper.connect_to_db()
+    scraper.db_cursor.execute("DROP TABLE IF EXISTS post")
+    scraper.close_db_connection()
+    scraper.import_to_database(sample)
+    scraper.connect_to_db()
+    scraper.db_cursor.execute("TRUNCATE TABLE post")
+    scraper.close_db_connection()
+
+
+def timed(label, size, func):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<28} {elapsed:8.2f} s  {size / elapsed:10.0f} rows/s")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--legacy-max", type=int, default=10000)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_CONFIG["db_batch_size"])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3306)
+    parser.add_argument("--user", default="root")
+    parser.add_argument("--password", default="bench")
+    parser.add_argument("--database", default="scraper_bench")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    # connect_to_db reads these; values already in the environment win over a local .env
+    os.environ.update({"db_host": args.host, "db_port": str(args.port), "db_user": args.user,
+                       "db_password": args.password, "db_name": args.database})
+    config = {**DEFAULT_CONFIG, "db_batch_size": args.batch_size, "seen_index": ""}
+    scraper = WebScraper(config)
+    if not scraper.connect_to_db():
+        print(f"No database at {args.host}:{args.port}; start one with the docker command above.")
+        return 1
+    scraper.close_db_connection()
+
+    for size in args.rows:
+        first = build_posts(size, args.seed)
+        second = build_posts(size, args.seed, changed=0.5)
+        print(f"{size} rows (batch size {args.batch_size}):")
+
+        if size <= args.legacy_max:
+            reset_table(scraper, first[:1])
+            timed("legacy insert", size, lambda: legacy_import(scraper, first))
+            timed("legacy update", size, lambda: legacy_import(scraper, second))
+
+        reset_table(scraper, first[:1])
+        timed("bulk upsert insert", size, lambda: scraper.import_to_database(first))
+        timed("bulk upsert update", size, lambda: scraper.import_to_database(second))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
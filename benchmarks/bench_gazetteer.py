@@ -0,0 +1,106 @@
+"""Benchmark: Gazetteer.resolve vs. the per-name regex loops it replaced.
+
+Usage: python benchmarks/bench_gazetteer.py [--addresses 5000] [--seed 7]
+"""
+import argparse, json, os, random, re, sys, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from gazetteer import Gazetteer, fold_text
+
+
+def legacy_web(districts, wards, address):
+    """The original WebScraper.get_district_and_ward."""
+    detected_district = None
+    for district in districts:
+        if re.search(r"\b" + re.escape(district) + r"\b", address, re.IGNORECASE):
+            detected_district = district
+            break
+    detected_ward = None
+    if detected_district and detected_district in wards:
+        for ward in wards[detected_district]:
+            if re.search(r"\b" + re.escape(ward) + r"\b", address, re.IGNORECASE):
+                detected_ward = ward
+                break
+    if not detected_ward and detected_district:
+        address_lower = address.lower()
+        # Unaccented district names have no ward list; the original caught
+        # the KeyError and returned (None, None).
+        if detected_district not in wards:
+            return None, None
+        for ward in wards[detected_district]:
+            if ward.lower() in address_lower:
+                detected_ward = ward
+                break
+    return detected_district, detected_ward
+
+
+def legacy_fb(districts, wards, content):
+    """The original FacebookGroupScraper._parse_location."""
+    content_lower = content.lower()
+    detected_district = next((d for d in districts if re.search(r"\b" + re.escape(d.lower()) + r"\b", content_lower)), "")
+    detected_ward = ""
+    if detected_district and detected_district in wards:
+        detected_ward = next((w for w in wards[detected_district] if re.search(r"\b" + re.escape(w.lower()) + r"\b", content_lower)), "")
+    return detected_district, detected_ward
+
+
+def build_addresses(wards, size, seed):
+    """Addresses in the shapes seen on phongtro123 and in FB posts."""
+    rng = random.Random(seed)
+    pairs = [(d, w) for d, ws in wards.items() for w in ws]
+    addresses = []
+    for _ in range(size):
+        district, ward = rng.choice(pairs)
+        number = rng.randint(1, 300)
+        shape = rng.randrange(5)
+        if shape == 0:
+            text = f"{number} Lê Duẩn, Phường {ward}, Quận {district}, Đà Nẵng"
+        elif shape == 1:
+            text = f"Kiệt {number} phường {ward}, quận {district}".lower()
+        elif shape == 2:
+            text = f"Phòng trọ gần chợ, phường {ward}, Đà Nẵng"
+        elif shape == 3:
+            text = f"K{number}/{rng.randint(1, 40)} {fold_text(district).title()}, TP Da Nang"
+        else:
+            text = f"Cho thuê phòng ở {district} giá rẻ, liên hệ 0905{number:06d}"
+        addresses.append(text)
+    return addresses
+
+
+def run(label, fn, addresses):
+    start = time.perf_counter()
+    results = [fn(a) for a in addresses]
+    elapsed = time.perf_counter() - start
+    found = sum(1 for d, w in results if d)
+    wards = sum(1 for d, w in results if w)
+    print(f"{label:<14}{elapsed:8.3f} s  {elapsed / len(addresses) * 1e6:8.1f} us/address  "
+          f"district {found:>5}  ward {wards:>5}")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--addresses", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--config", default=os.path.join(ROOT, "config.json"))
+    args = parser.parse_args()
+
+    with open(args.config, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    districts, wards = config.get("districts", []), config.get("wards", {})
+    addresses = build_addresses(wards, args.addresses, args.seed)
+
+    start = time.perf_counter()
+    gazetteer = Gazetteer.from_config(config)
+    print(f"Gazetteer build: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    web = run("legacy web", lambda a: legacy_web(districts, wards, a), addresses)
+    fb = run("legacy fb", lambda a: legacy_fb(districts, wards, a), addresses)
+    new = run("gazetteer", gazetteer.resolve, addresses)
+    print(f"Speedup: {web / new:.1f}x vs web, {fb / new:.1f}x vs fb")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Benchmark: detail-page loads with the lean browser profile vs. a default Chrome session.
+
+Serves a copy of the detail fixture padded with the kind of payload a live
+listing page carries (photos, a video, web fonts, a tracker script on a
+second "third-party" host) and loads it through WebScraper.get_post_data.
+Needs Chrome and a matching chromedriver on PATH.
+
+Usage: python benchmarks/bench_lean_browser.py [--pages 20] [--latency 0.05] [--headed]
+
+Reports wall time per page (driver.get until the description is parsed),
+DOMContentLoaded/load from the Navigation Timing API, and the bytes both
+local servers sent, which is what the browser would have downloaded.
+"""
+import argparse, os, shutil, statistics, sys, tempfile, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+
+from selenium.common.exceptions import WebDriverException
+
+from browser_profile import block_resources
+from fixture_site import FIXTURES, FixtureSite
+from Scrapping_Web import DEFAULT_CONFIG, WebScraper
+
+PHOTOS = 8
+PHOTO_BYTES = 180_000
+VIDEO_BYTES = 1_500_000
+FONT_BYTES = 90_000
+SCRIPT_BYTES = 120_000
+
+TIMING_JS = """
+const t = performance.getEntriesByType('navigation')[0];
+return t ? [t.domContentLoadedEventEnd, t.loadEventEnd] : [0, 0];
+"""
+
+
+def third_party_host(tracker):
+    """The tracker is addressed as localhost so the page sees it as another site."""
+    return f"localhost:{tracker.server.server_address[1]}"
+
+
+def build_site(root, third_party_url):
+    """Write the padded detail page and its assets into root."""
+    with open(os.path.join(FIXTURES, "phongtro123", "detail_basic.html"), encoding="utf-8") as f:
+        html = f.read()
+    head = (
+        '<style>@font-face{font-family:"Lexend";src:url("/assets/lexend.woff2") format("woff2")}'
+        '@font-face{font-family:"Lexend";font-weight:700;src:url("/assets/lexend-bold.woff2") format("woff2")}'
+        'body{font-family:"Lexend",sans-serif}</style>'
+        f'<script async src="{third_party_url}/gtag.js"></script>'
+    )
+    body = "".join(f'<img src="/assets/photo-{i}.jpg" width="640" height="480">' for i in range(PHOTOS))
+    body += '<video src="/assets/tour.mp4" autoplay muted preload="auto"></video>'
+    html = html.replace("</head>", head + "</head>").replace("</main>", body + "</main>")
+
+    os.makedirs(os.path.join(root, "assets"))
+    with open(os.path.join(root, "detail.html"), "w", encoding="utf-8") as f:
+        f.write(html)
+    assets = {f"photo-{i}.jpg": PHOTO_BYTES for i in range(PHOTOS)}
+    assets.update({"tour.mp4": VIDEO_BYTES, "lexend.woff2": FONT_BYTES, "lexend-bold.woff2": FONT_BYTES})
+    for name, size in assets.items():
+        with open(os.path.join(root, "assets", name), "wb") as f:
+            f.write(os.urandom(size))
+
+
+def run_profile(label, lean, args, site, tracker):
+    config = {**DEFAULT_CONFIG, "headless": not args.headed, "lean_browser": lean,
+              "host_min_interval": 0, "import_to_db": False, "seen_index": "", "checkpoint_file": ""}
+    scraper = WebScraper(config)
+    driver = scraper.setup_driver()
+    if lean:
+        block_resources(driver, [third_party_host(tracker)])
+    try:
+        walls, dcl, loads = [], [], []
+        site.bytes_sent = tracker.bytes_sent = 0
+        for i in range(args.pages):
+            # Unique query strings keep Chrome's cache out of the measurement
+            url = site.url(f"detail.html?run={label}-{i}")
+            start = time.perf_counter()
+            post = scraper.get_post_data(url)
+            walls.append(time.perf_counter() - start)
+            if not post or post["price"] != 3_500_000:
+                print(f"  {label}: page {i} did not parse")
+            dom_ready, loaded = driver.execute_script(TIMING_JS)
+            dcl.append(dom_ready)
+            loads.append(loaded)
+        total_bytes = site.bytes_sent + tracker.bytes_sent
+    finally:
+        scraper.close()
+
+    print(f"  {label:<8} {statistics.median(walls) * 1000:8.0f} ms  {max(walls) * 1000:8.0f} ms"
+          f"  {statistics.median(dcl):9.0f} ms  {statistics.median(loads):9.0f} ms"
+          f"  {total_bytes / args.pages / 1024:10.0f} KiB")
+    return statistics.median(walls), total_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds added to every request")
+    parser.add_argument("--headed", action="store_true")
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="lean-browser-")
+    try:
+        with FixtureSite(os.path.join(root, "tracker"), latency=args.latency * 4) as tracker:
+            os.makedirs(tracker.root)
+            with open(os.path.join(tracker.root, "gtag.js"), "w") as f:
+                f.write("/*" + "x" * SCRIPT_BYTES + "*/")
+            build_site(os.path.join(root, "site"), f"http://{third_party_host(tracker)}")
+            with FixtureSite(os.path.join(root, "site"), latency=args.latency) as site:
+                print(f"{args.pages} detail pages, {args.latency * 1000:.0f} ms latency per request")
+                print(f"  {'profile':<8} {'p50 wall':>11}  {'max wall':>11}  {'DOM ready':>12}  {'load':>12}  {'sent/page':>14}")
+                try:
+                    default_wall, default_bytes = run_profile("default", False, args, site, tracker)
+                    lean_wall, lean_bytes = run_profile("lean", True, args, site, tracker)
+                except WebDriverException as e:
+                    print(f"Could not start Chrome: {e.msg}")
+                    return 1
+        print(f"Lean profile: {default_wall / lean_wall:.1f}x faster, "
+              f"{(1 - lean_bytes / max(default_bytes, 1)) * 100:.0f}% fewer bytes")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+"""Benchmark and guard the price/area/contact extractors on the generated snippet corpus.
+
+Times every extractor over --size snippets of its kind (see
+parser_corpus.py) for --rounds rounds and prints ns/op statistics in the
+layout pytest-benchmark uses. Also reports:
+
+  accuracy      share of snippets where each extractor returns the true value
+  differential  snippets where the web and Facebook extractors disagree on
+                price or area, grouped by the snippet's shape, with examples
+  golden        a hash of each extractor's outputs over the whole corpus,
+                compared with benchmarks/fixtures/parser_golden.json, so an
+                optimization that changes any single result is caught
+
+Exits 1 if an extractor's outputs no longer match the golden file. After an
+intended behavior change, record the new outputs with --update-golden.
+
+Usage: python benchmarks/bench_parsers.py [--size 100000] [--rounds 5] [--seed 7] [--examples 3]
+           [--update-golden]
+"""
+import argparse, collections, hashlib, json, os, re, statistics, sys, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+
+from parser_corpus import generate
+from Scrapping_FB import PostParser
+from Scrapping_Web import DEFAULT_CONFIG, WebScraper
+
+GOLDEN = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "parser_golden.json")
+GOLDEN_SAMPLE = 100
+
+
+def extractors():
+    """name -> (snippet kind, function) for every extractor under test."""
+    config = {**DEFAULT_CONFIG, "seen_index": "", "checkpoint_file": "", "metrics_report": "",
+              "parquet_dir": "", "import_to_db": False}
+    web = WebScraper(config)
+    fb = PostParser(os.path.join(ROOT, "config.json"))
+    return web, {
+        "web.extract_price_value": ("price", web.extract_price_value),
+        "fb._parse_price": ("price", fb._parse_price),
+        "web.extract_area_value": ("area", web.extract_area_value),
+        "fb._parse_area": ("area", fb._parse_area),
+        "fb._parse_contact": ("phone", fb._parse_contact),
+    }
+
+
+def normalize(kind, value):
+    """Compare outputs by meaning: 0, "" and None all mean "no value"; +84 numbers in 0 form."""
+    if value in (None, "", 0):
+        return None
+    if kind == "phone":
+        return "0" + value[3:] if value.startswith("+84") else value
+    return float(value)
+
+
+def shape(text):
+    """Snippet shape for grouping: digits become 9, whitespace runs collapse."""
+    return re.sub(r"\s+", " ", re.sub(r"\d+", "9", text))
+
+
+def time_rounds(func, texts, rounds):
+    """ns/op for each round, one round being a pass over every text."""
+    results = []
+    for _ in range(rounds):
+        start = time.perf_counter_ns()
+        collections.deque(map(func, texts), maxlen=0)
+        results.append((time.perf_counter_ns() - start) / len(texts))
+    return results
+
+
+def digest(outputs):
+    hasher = hashlib.sha256()
+    for value in outputs:
+        hasher.update(json.dumps(value, ensure_ascii=False).encode("utf-8"))
+        hasher.update(b"\n")
+    return hasher.hexdigest()
+
+
+def print_timings(timings, rounds):
+    header = f"{'Name (time in ns/op)':<26} {'Min':>9} {'Max':>9} {'Mean':>9} {'StdDev':>9} {'Median':>9} " \
+             f"{'OPS (Kops/s)':>13} {'Rounds':>7}"
+    print(header)
+    print("-" * len(header))
+    for name, values in sorted(timings.items(), key=lambda item: statistics.mean(item[1])):
+        mean = statistics.mean(values)
+        deviation = statistics.stdev(values) if len(values) > 1 else 0.0
+        print(f"{name:<26} {min(values):>9.1f} {max(values):>9.1f} {mean:>9.1f} {deviation:>9.1f} "
+              f"{statistics.median(values):>9.1f} {1e6 / mean:>13.1f} {rounds:>7}")
+
+
+def print_differential(pairs, corpora, outputs, examples):
+    for kind, (left, right) in pairs.items():
+        snippets = corpora[kind]
+        groups = collections.defaultdict(list)
+        for snippet, a, b in zip(snippets, outputs[left], outputs[right]):
+            if normalize(kind, a) != normalize(kind, b):
+                groups[shape(snippet.text)].append((snippet, a, b))
+        disagreements = sum(len(group) for group in groups.values())
+        print(f"{left} vs {right}: {disagreements} of {len(snippets)} snippets disagree "
+              f"({disagreements / len(snippets):.1%}), {len(groups)} shapes")
+        for group_shape, group in sorted(groups.items(), key=lambda item: -len(item[1]))[:examples]:
+            snippet, a, b = group[0]
+            print(f"  {len(group):>6}x {group_shape!r}")
+            print(f"          e.g. {snippet.text!r}: web {a!r}, fb {b!r}, true {snippet.truth!r}")
+
+
+def check_golden(path, key, outputs, corpora, kinds, update):
+    """Compare output hashes with the golden file (or rewrite it); returns the names that changed."""
+    golden = {}
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            golden = json.load(f)
+    current = {
+        name: {"sha256": digest(values),
+               "sample": [[snippet.text, value] for snippet, value in
+                          zip(corpora[kinds[name]][:GOLDEN_SAMPLE], values[:GOLDEN_SAMPLE])]}
+        for name, values in outputs.items()
+    }
+    if update:
+        golden[key] = current
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(golden, f, ensure_ascii=False, indent=1, sort_keys=True)
+            f.write("\n")
+        print(f"Golden outputs for corpus {key} written to {path}")
+        return []
+    if key not in golden:
+        print(f"No golden outputs for corpus {key}; record them with --update-golden")
+        return []
+    changed = []
+    for name, entry in current.items():
+        expected = golden[key].get(name)
+        if expected is None:
+            print(f"  new  {name} (not in the golden file)")
+        elif expected["sha256"] == entry["sha256"]:
+            print(f"  ok   {name}")
+        else:
+            changed.append(name)
+            diffs = [(text, old, new) for (text, old), (_, new) in zip(expected["sample"], entry["sample"])
+                     if old != new]
+            print(f"  FAIL {name}: outputs changed ({len(diffs)} of the first {GOLDEN_SAMPLE} differ)")
+            for text, old, new in diffs[:5]:
+                print(f"         {text!r}: {old!r} -> {new!r}")
+    return changed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=100_000, help="snippets per kind")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--examples", type=int, default=3, help="disagreement shapes to show per field")
+    parser.add_argument("--golden", default=GOLDEN)
+    parser.add_argument("--update-golden", action="store_true")
+    args = parser.parse_args()
+
+    web, functions = extractors()
+    kinds = {name: kind for name, (kind, _) in functions.items()}
+    corpora = {kind: generate(kind, args.size, args.seed) for kind in set(kinds.values())}
+    print(f"Corpus: {args.size} snippets each of {', '.join(sorted(corpora))} (seed {args.seed})")
+
+    outputs, timings = {}, {}
+    for name, (kind, func) in functions.items():
+        texts = [snippet.text for snippet in corpora[kind]]
+        outputs[name] = [func(text) for text in texts]
+        timings[name] = time_rounds(func, texts, args.rounds)
+    web.close()
+
+    print()
+    print_timings(timings, args.rounds)
+
+    print("\nAccuracy against the generated values:")
+    for name, values in outputs.items():
+        kind = kinds[name]
+        correct = sum(normalize(kind, value) == normalize(kind, snippet.truth)
+                      for snippet, value in zip(corpora[kind], values))
+        print(f"  {name:<26} {correct / len(values):7.1%}")
+
+    print("\nDifferential (web vs Facebook):")
+    print_differential({"price": ("web.extract_price_value", "fb._parse_price"),
+                        "area": ("web.extract_area_value", "fb._parse_area")}, corpora, outputs, args.examples)
+
+    print("\nGolden outputs:")
+    changed = check_golden(args.golden, f"seed={args.seed},size={args.size}", outputs, corpora, kinds,
+                           args.update_golden)
+    return 1 if changed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""Benchmark: memory for historical posts held as CSV row dicts vs. in a PostStore.
+
+Writes a synthetic output CSV of --rows posts, then loads it twice: the way
+the scrapers used to (every csv.DictReader row kept as a dict) and with
+PostStore.from_csv. Reports retained memory (tracemalloc), load time and
+the time to build the district summary from each.
+
+Usage: python benchmarks/bench_post_store.py [--rows 1000000] [--keep-csv]
+"""
+import argparse, csv, gc, hashlib, json, os, random, sys, tempfile, time, tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from post_store import PostStore
+
+DISTRICTS = ["Hải Châu", "Thanh Khê", "Sơn Trà", "Ngũ Hành Sơn", "Liên Chiểu", "Cẩm Lệ", "Hòa Vang"]
+WARDS = ["An Hải Đông", "Phước Mỹ", "Hòa Minh", "Thạch Thang", "Mỹ An", "Khuê Mỹ", "Hòa Khánh Bắc"]
+AMENITIES = ["Có máy lạnh", "Có gác", "Có kệ bếp", "Có máy giặt", "Sân phơi đồ", "Có wifi", "Giờ giấc tự do"]
+FIELDS = ["postID", "time", "content", "address", "ward", "district", "area", "price", "amenities", "contact", "url"]
+
+
+def write_csv(path, rows, seed):
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        for i in range(rows):
+            content = f"Cho thuê phòng trọ số {i}, {rng.choice(AMENITIES).lower()}, gần chợ, giá tốt"
+            writer.writerow({
+                "postID": hashlib.md5(content.encode("utf-8")).hexdigest(),
+                "time": f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} 14:30:00",
+                "content": content,
+                "address": f"K{i % 500}/5 Nguyễn Văn Thoại",
+                "ward": rng.choice(WARDS),
+                "district": rng.choice(DISTRICTS),
+                "area": float(rng.randint(12, 60)),
+                "price": rng.randint(10, 80) * 100_000,
+                "amenities": json.dumps(rng.sample(AMENITIES, rng.randint(0, 4)), ensure_ascii=False),
+                "contact": "0905 123 456",
+                "url": f"https://phongtro123.com/post-{i}.html",
+            })
+
+
+def measure(label, load, summarize):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    data = load()
+    load_time = time.perf_counter() - start
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    start = time.perf_counter()
+    summarize(data)
+    summary_time = time.perf_counter() - start
+    print(f"  {label:<22} {retained / 2**20:9.1f} MiB {peak / 2**20:9.1f} MiB "
+          f"{load_time:8.1f} s {summary_time * 1000:10.1f} ms")
+    del data
+    return retained
+
+
+def dict_summary(rows):
+    districts = {}
+    for post in rows:
+        if post.get("district"):
+            districts[post["district"]] = districts.get(post["district"], 0) + 1
+    prices = [post["price"] for post in rows if post.get("price")]
+    return districts, len(prices)
+
+
+def load_dicts(path):
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--keep-csv", action="store_true")
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.gettempdir(), f"bench_post_store_{args.rows}.csv")
+    if not os.path.exists(path):
+        print(f"Writing {args.rows} posts to {path}")
+        write_csv(path, args.rows, args.seed)
+    try:
+        print(f"{args.rows} posts ({os.path.getsize(path) / 2**20:.0f} MiB CSV):")
+        print(f"  {'container':<22} {'retained':>13} {'peak':>13} {'load':>10} {'summary':>13}")
+        dicts = measure("list of row dicts", lambda: load_dicts(path), dict_summary)
+        store = measure("PostStore", lambda: PostStore.from_csv(path),
+                        lambda s: (s.district_counts(), len(s.prices())))
+        text = measure("PostStore, keep_text", lambda: PostStore.from_csv(path, keep_text=True),
+                       lambda s: (s.district_counts(), len(s.prices())))
+        print(f"PostStore keeps {store / dicts * 100:.1f}% of the row-dict memory "
+              f"({text / dicts * 100:.1f}% with free text)")
+    finally:
+        if not args.keep_csv:
+            os.remove(path)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,245 @@
+"""Benchmark: WebScraper end to end against a local replay of phongtro123.com.
+
+Serves a replay set (see replay_fixtures.py) from a FixtureSite in a child
+process, with --latency/--jitter seconds added to every response, and runs
+the scraper's own pipeline over it: listing pages -> detail pages -> parse
+stage -> CSV/Parquet -> database. The database is a stand-in that converts
+each batch with post_to_db_row and upserts it into an in-memory SQLite
+table after --db-latency seconds, so MySQL is not needed.
+
+Reports posts/second, CPU time per post (this process and any browsers
+it started, not the fixture server) and peak RSS, plus the median time of
+each scraper stage. The best of --repeat runs is compared with the
+scenario's entry in benchmarks/baseline.json; --update-baseline records it.
+Exits 1 if throughput or CPU per post is more than --tolerance worse, or
+peak RSS grew by more than that.
+
+Usage: python benchmarks/bench_scraper.py [--posts 200] [--latency 0.02] [--jitter 0.01]
+           [--workers 4] [--engine http] [--repeat 3] [--fixtures DIR] [--update-baseline]
+"""
+import argparse, json, multiprocessing, os, platform, shutil, sqlite3, statistics, sys, tempfile, threading, time
+from datetime import date
+
+import psutil
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+
+from fixture_site import FixtureSite
+from replay_fixtures import load_routes, synthesize
+from Scrapping_Web import DEFAULT_CONFIG, WebScraper
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+STAGES = ["http_fetch", "driver_get", "parse_html", "parse_pool", "extract_fields", "sink_write", "db_upsert"]
+
+
+class StandInDbScraper(WebScraper):
+    """WebScraper whose upserts go to an in-memory SQLite table instead of MySQL."""
+
+    def __init__(self, config, db_latency=0.0):
+        super().__init__(config)
+        self.db_latency = db_latency
+        self.db_rows = 0
+        self.db = sqlite3.connect(":memory:", check_same_thread=False)
+        self.db.execute("CREATE TABLE post (postID TEXT PRIMARY KEY, p_date TEXT, content TEXT, district TEXT, "
+                        "ward TEXT, street_address TEXT, price INTEGER, area REAL, amenities TEXT, "
+                        "contact_info TEXT)")
+
+    def import_to_database(self, data):
+        with self.metrics.stage("db_upsert"):
+            rows = [self.post_to_db_row(row) for row in data]
+            time.sleep(self.db_latency)
+            with self.db:
+                self.db.executemany("INSERT OR REPLACE INTO post VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            self.db_rows += len(rows)
+            return True
+
+
+def serve(root, routes, latency, jitter, port, stop):
+    """Child process: serve the replay set until told to stop."""
+    with FixtureSite(root, latency, routes, jitter) as site:
+        port.send(site.server.server_address[1])
+        stop.wait()
+
+
+class ResourceSampler:
+    """Peak RSS and CPU time of this process and its children (browsers), sampled on a thread.
+
+    exclude holds child PIDs that are not part of the scraper (the fixture server).
+    """
+
+    def __init__(self, exclude=(), interval=0.05):
+        self.exclude = set(exclude)
+        self.interval = interval
+        self.process = psutil.Process()
+        self.peak_rss = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._children = {}
+
+    def _sample(self):
+        rss = self.process.memory_info().rss
+        for child in self.process.children(recursive=True):
+            if child.pid in self.exclude:
+                continue
+            try:
+                rss += child.memory_info().rss
+                self._children[child.pid] = child.cpu_times()
+            except psutil.Error:
+                pass
+        self.peak_rss = max(self.peak_rss, rss)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def cpu_seconds(self):
+        times = self.process.cpu_times()
+        total = times.user + times.system
+        # Children that already exited keep the last CPU times seen for them
+        return total + sum(t.user + t.system for t in self._children.values())
+
+    def __enter__(self):
+        self._sample()
+        self.cpu_start = self.cpu_seconds()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+        self.cpu = self.cpu_seconds() - self.cpu_start
+
+
+def run_once(args, base_url, city, workdir, server_pid):
+    engine = args.engine
+    config = {
+        **DEFAULT_CONFIG,
+        "base_url": base_url, "city": city, "post_limit": args.posts,
+        "output_file": os.path.join(workdir, "posts.csv"),
+        "parquet_dir": os.path.join(workdir, "parquet") if args.parquet else "",
+        "seen_index": os.path.join(workdir, "seen_index.sqlite"),
+        "checkpoint_file": os.path.join(workdir, "crawl_checkpoint.json"),
+        "metrics_report": os.path.join(workdir, "run_report.json"), "metrics_prometheus": "",
+        "import_to_db": True, "db_batch_size": args.db_batch_size,
+        "detail_workers": args.workers, "fetch_engine": engine, "index_engine": engine,
+        "index_rate": 0, "host_min_interval": 0, "headless": True,
+    }
+    scraper = StandInDbScraper(config, args.db_latency)
+    sink = None
+    try:
+        with ResourceSampler(exclude=[server_pid]) as resources:
+            start = time.perf_counter()
+            urls = scraper.get_index_urls(args.posts)
+            with scraper.open_sink(config["output_file"], True) as sink:
+                scraper.write_posts(urls, sink)
+            elapsed = time.perf_counter() - start
+        scraper.write_metrics(sink)
+    finally:
+        scraper.close()
+    with open(config["metrics_report"], encoding="utf-8") as f:
+        stages = json.load(f)["stages"]
+    return {
+        "posts": sink.written,
+        "db_rows": scraper.db_rows,
+        "seconds": round(elapsed, 3),
+        "posts_per_second": round(sink.written / elapsed, 2),
+        "cpu_ms_per_post": round(resources.cpu / max(1, sink.written) * 1000, 3),
+        "peak_rss_mib": round(resources.peak_rss / 2**20, 1),
+        "stage_p50_ms": {name: round(stages[name]["p50"] * 1000, 3) for name in STAGES if name in stages},
+    }
+
+
+def compare(result, baseline, tolerance):
+    """Lines describing the change against the baseline, and whether any is a regression."""
+    checks = [("posts_per_second", "posts/s", -1), ("cpu_ms_per_post", "CPU ms/post", 1),
+              ("peak_rss_mib", "peak RSS MiB", 1)]
+    lines, regressed = [], False
+    for key, label, worse in checks:
+        old, new = baseline[key], result[key]
+        change = (new - old) / old if old else 0.0
+        bad = change * worse > tolerance
+        regressed |= bad
+        lines.append(f"  {label:<14} {old:>10} -> {new:<10} {change:+7.1%}{'  REGRESSION' if bad else ''}")
+    return lines, regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.01, help="extra random 0..jitter seconds per response")
+    parser.add_argument("--workers", type=int, default=4, help="detail_workers")
+    parser.add_argument("--engine", choices=["http", "selenium"], default="http")
+    parser.add_argument("--db-batch-size", type=int, default=100)
+    parser.add_argument("--db-latency", type=float, default=0.005, help="seconds per stand-in upsert batch")
+    parser.add_argument("--parquet", action="store_true", help="also write the Parquet dataset")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--fixtures", help="captured replay set (default: a synthesized one)")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--tolerance", type=float, default=0.15)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    scratch = tempfile.mkdtemp(prefix="bench_scraper_")
+    fixtures = args.fixtures or os.path.join(scratch, "replay")
+    manifest = load_routes(fixtures) if args.fixtures else synthesize(fixtures, args.posts)
+    name = (f"{args.engine}-{os.path.basename(os.path.normpath(args.fixtures)) if args.fixtures else 'synthetic'}"
+            f"-{args.posts}posts-{args.workers}w-{args.latency * 1000:g}ms")
+
+    port, child_port = multiprocessing.Pipe()
+    stop = multiprocessing.Event()
+    server = multiprocessing.Process(target=serve, args=(fixtures, manifest["routes"], args.latency, args.jitter,
+                                                         child_port, stop), daemon=True)
+    server.start()
+    runs = []
+    try:
+        base_url = f"http://127.0.0.1:{port.recv()}"
+        print(f"Scenario {name}, replay served at {base_url}")
+        for i in range(args.repeat):
+            workdir = os.path.join(scratch, f"run-{i}")
+            os.makedirs(workdir)
+            result = run_once(args, base_url, manifest["city"], workdir, server.pid)
+            runs.append(result)
+            print(f"  run {i + 1}: {result['posts']} posts in {result['seconds']} s, "
+                  f"{result['posts_per_second']} posts/s, {result['cpu_ms_per_post']} CPU ms/post, "
+                  f"{result['peak_rss_mib']} MiB peak RSS")
+    finally:
+        stop.set()
+        server.join(5)
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    best = max(runs, key=lambda r: r["posts_per_second"])
+    best["cpu_ms_per_post"] = round(statistics.median(r["cpu_ms_per_post"] for r in runs), 3)
+    best["peak_rss_mib"] = max(r["peak_rss_mib"] for r in runs)
+    print(f"Best of {len(runs)}: {best['posts_per_second']} posts/s; stage p50 (ms): {best['stage_p50_ms']}")
+    if best["posts"] < args.posts or best["db_rows"] != best["posts"]:
+        print(f"FAIL: expected {args.posts} posts in CSV and database, got {best['posts']} and {best['db_rows']}")
+        return 1
+
+    baselines = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baselines = json.load(f)
+    if args.update_baseline:
+        baselines[name] = {**best, "recorded": date.today().isoformat(), "python": platform.python_version(),
+                           "machine": f"{platform.machine()}, {psutil.cpu_count()} CPUs"}
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Baseline for {name} written to {args.baseline}")
+        return 0
+    if name not in baselines:
+        print(f"No baseline for {name}; record one with --update-baseline")
+        return 0
+    lines, regressed = compare(best, baselines[name], args.tolerance)
+    print(f"Against the baseline from {baselines[name].get('recorded')} (tolerance {args.tolerance:.0%}):")
+    print("\n".join(lines))
+    return 1 if regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
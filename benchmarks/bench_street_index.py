@@ -0,0 +1,79 @@
+"""Micro-benchmark: StreetIndex vs. the per-street re.finditer loop.
+
+Usage: python benchmarks/bench_street_index.py [--posts 100] [--seed 7]
+"""
+import argparse, json, os, random, re, sys, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from street_index import StreetIndex
+
+FILLER = (
+    "cho thuê phòng trọ giá rẻ gần trường đại học có gác máy lạnh wifi "
+    "liên hệ chính chủ sạch sẽ thoáng mát an ninh tốt giờ giấc tự do"
+).split()
+
+
+def legacy_parse_address(streets, content):
+    """The original FacebookGroupScraper._parse_address loop."""
+    found_matches = []
+    for street in streets:
+        for match in re.finditer(r'\b(\d*\s*' + re.escape(street) + r'(?:\s+\d+)?)\b', content, re.IGNORECASE):
+            found_matches.append(match)
+    if found_matches:
+        return sorted(found_matches, key=lambda m: m.start())[0].group(0).strip()
+    return ""
+
+
+def build_corpus(streets, size, seed):
+    """Generate posts of ~80 words; two out of three mention a street, some in lower case."""
+    rng = random.Random(seed)
+    corpus = []
+    for i in range(size):
+        words = [rng.choice(FILLER) for _ in range(80)]
+        if i % 3:
+            street = rng.choice(streets)
+            if rng.random() < 0.3:
+                street = street.lower()
+            words.insert(rng.randrange(len(words)), f"{rng.randint(1, 400)} {street}")
+        corpus.append(" ".join(words))
+    return corpus
+
+
+def timed(fn, corpus):
+    start = time.perf_counter()
+    results = [fn(content) for content in corpus]
+    return time.perf_counter() - start, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--posts", type=int, default=100, help="Synthetic posts to parse")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--config", default=os.path.join(ROOT, "config.json"))
+    args = parser.parse_args()
+
+    with open(args.config, 'r', encoding='utf-8') as f:
+        streets = json.load(f).get("streets", [])
+    corpus = build_corpus(streets, args.posts, args.seed)
+
+    start = time.perf_counter()
+    index = StreetIndex(streets)
+    build_time = time.perf_counter() - start
+
+    legacy_time, legacy_results = timed(lambda c: legacy_parse_address(streets, c), corpus)
+    index_time, index_results = timed(index.find, corpus)
+    mismatches = sum(a != b for a, b in zip(legacy_results, index_results))
+
+    print(f"Streets: {len(streets)}  Posts: {len(corpus)}")
+    print(f"Index build:   {build_time * 1000:.1f} ms (once per config load)")
+    print(f"Legacy loop:   {legacy_time:.3f} s  ({legacy_time / len(corpus) * 1000:.2f} ms/post)")
+    print(f"StreetIndex:   {index_time:.3f} s  ({index_time / len(corpus) * 1000:.3f} ms/post)")
+    print(f"Speedup:       {legacy_time / index_time:.0f}x")
+    print(f"Mismatches:    {mismatches}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
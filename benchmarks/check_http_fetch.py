@@ -0,0 +1,71 @@
+"""Check and time the HTTP detail-page engine against the local fixture site.
+
+Usage: python benchmarks/check_http_fetch.py [--requests 200]
+"""
+import argparse, os, sys, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+
+from fixture_site import FIXTURES, FixtureSite
+from Scrapping_Web import DEFAULT_CONFIG, WebScraper
+
+EXPECTED = {
+    "time": "2025-04-10 14:30:00",
+    "address": "K12/5 Nguyễn Văn Thoại, Phường An Hải Đông, Quận Sơn Trà, Đà Nẵng",
+    "district": "Sơn Trà",
+    "ward": "An Hải Đông",
+    "price": 3_500_000,
+    "area": 25.0,
+    "contact": "0905 123 456",
+}
+
+
+def check(label, ok):
+    print(f"  {'ok  ' if ok else 'FAIL'} {label}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    # No seen index, checkpoint, report or dataset: a check must not touch the crawl state in the repo root
+    config = {**DEFAULT_CONFIG, "fetch_engine": "http", "host_min_interval": 0, "import_to_db": False,
+              "seen_index": "", "checkpoint_file": "", "metrics_report": "", "parquet_dir": ""}
+    scraper = WebScraper(config)
+    results = []
+
+    with FixtureSite(os.path.join(FIXTURES, "phongtro123")) as site:
+        print("Detail page parsed over HTTP:")
+        post, fallback = scraper.get_post_data_http(site.url("detail_basic.html"))
+        results.append(check("parsed without fallback", post is not None and not fallback))
+        for field, value in EXPECTED.items():
+            results.append(check(f"{field} = {value!r}", post and post[field] == value))
+        results.append(check("content keeps paragraphs and <br> breaks",
+                             post and post["content"].count("\n") == 3))
+        results.append(check("amenities from page block and content",
+                             post and {"Có máy lạnh", "Có kệ bếp", "Sân phơi đồ", "Có gác"} <= set(post["amenities"])))
+        results.append(check("hidden amenity skipped", post and "Có máy giặt" not in post["amenities"]))
+
+        print("Validation:")
+        post, fallback = scraper.get_post_data_http(site.url("detail_no_content.html"))
+        results.append(check("page without description falls back to Selenium", post is None and fallback))
+        post, fallback = scraper.get_post_data_http(site.url("missing.html"))
+        results.append(check("404 returns None without fallback", post is None and not fallback))
+
+        start = time.perf_counter()
+        for _ in range(args.requests):
+            scraper.get_post_data_http(site.url("detail_basic.html"))
+        elapsed = time.perf_counter() - start
+        print(f"HTTP engine: {args.requests} pages in {elapsed:.2f} s "
+              f"({elapsed / args.requests * 1000:.1f} ms/page, keep-alive session)")
+
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""Local HTTP server that serves saved pages from benchmarks/fixtures."""
+import os, random, threading, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+NOT_FOUND = b"<html><head><title>Page not found</title></head><body>404</body></html>"
+
+
+class FixtureSite:
+    """Serve a fixture directory on 127.0.0.1, optionally adding latency per request.
+
+    Each request sleeps latency plus a uniform random 0..jitter seconds.
+    routes maps request paths to files under root, matched first with the
+    query string (listing pages differ only by ?page=) and then without;
+    any other path is looked up as a file relative to root.
+    """
+
+    def __init__(self, root: str = FIXTURES, latency: float = 0.0, routes: Optional[Dict[str, str]] = None,
+                 jitter: float = 0.0):
+        self.root = root
+        self.latency = latency
+        self.jitter = jitter
+        self.routes = routes or {}
+        self.requests = 0
+        self.bytes_sent = 0
+        self.server: Optional[ThreadingHTTPServer] = None
+        self.thread: Optional[threading.Thread] = None
+
+    def _handler(self):
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                site.requests += 1
+                if site.latency or site.jitter:
+                    time.sleep(site.latency + random.uniform(0, site.jitter))
+                path = urlparse(self.path).path
+                relative = site.routes.get(self.path) or site.routes.get(path, path.lstrip("/"))
+                file_path = os.path.normpath(os.path.join(site.root, relative))
+                if file_path.startswith(os.path.normpath(site.root)) and os.path.isfile(file_path):
+                    with open(file_path, "rb") as f:
+                        body, status = f.read(), 200
+                else:
+                    body, status = NOT_FOUND, 404
+                self.send_response(status)
+                self.send_header("Content-Type", _content_type(file_path))
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                site.bytes_sent += len(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "FixtureSite":
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url(self, path: str) -> str:
+        return self.base_url + "/" + path.lstrip("/")
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def _content_type(path: str) -> str:
+    if path.endswith((".html", ".htm")) or "." not in os.path.basename(path):
+        return "text/html; charset=utf-8"
+    if path.endswith(".css"):
+        return "text/css"
+    if path.endswith(".js"):
+        return "application/javascript"
+    if path.endswith(".png"):
+        return "image/png"
+    if path.endswith((".jpg", ".jpeg")):
+        return "image/jpeg"
+    if path.endswith(".woff2"):
+        return "font/woff2"
+    if path.endswith(".mp4"):
+        return "video/mp4"
+    return "application/octet-stream"
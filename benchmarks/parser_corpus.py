@@ -0,0 +1,186 @@
+"""Generated corpus of Vietnamese price, area and phone snippets with their true values.
+
+Snippets mix the spellings seen on phongtro123 and in Facebook groups
+("3tr5", "3,5 triệu", "1,2 tỷ", "3.500.000đ", "25m2", "4x5m", "+84 905...")
+with the noise real posts carry: missing diacritics, decomposed (NFD)
+accents, upper case, emoji, extra spaces and unrelated numbers nearby.
+Each kind has a deterministic generator, so a seed always gives the same
+corpus and outputs can be compared across runs.
+
+Usage: python benchmarks/parser_corpus.py [--size 100000] [--seed 7] [--out corpus.jsonl]
+"""
+import argparse, json, os, random, sys, unicodedata
+from typing import Iterator, List, NamedTuple
+
+
+class Snippet(NamedTuple):
+    kind: str      # "price", "area" or "phone"
+    text: str
+    truth: object  # VND int, m² float, "0xxxxxxxxx" or None when the snippet holds no value
+
+
+PRICE_PREFIXES = ["", "Giá: ", "giá ", "Giá thuê ", "chỉ ", "💰 ", "Giá phòng: ", "gia ", "GIÁ "]
+PRICE_SUFFIXES = ["", "/tháng", "/th", " 1 tháng", " / tháng", "/phòng", "/tháng 🔥", " bao điện nước"]
+AREA_PREFIXES = ["", "Diện tích: ", "DT ", "dt: ", "rộng ", "Phòng ", "S = "]
+PHONE_PREFIXES = ["", "LH ", "Liên hệ: ", "Zalo ", "📞 ", "sđt ", "SĐT/Zalo: ", "lh chính chủ "]
+CONTEXT = [
+    "Cho thuê phòng trọ gần biển Mỹ Khê", "phòng mới xây, có gác", "K12/5 Nguyễn Văn Thoại",
+    "cọc 1 tháng", "điện 3.5k/số, nước 100k/người", "cách ĐH Bách Khoa 500m", "vào ở ngay 1/5/2025",
+    "ưu tiên sinh viên", "phòng tầng 2, ban công rộng", "xe máy để trong nhà",
+]
+CARRIERS = ["90", "91", "93", "94", "96", "97", "98", "32", "33", "35", "36", "37", "38", "39", "70", "76",
+            "77", "78", "79", "81", "82", "83", "84", "85", "86", "88", "89", "56", "58", "59"]
+
+
+def _noise(rng: random.Random, text: str) -> str:
+    """Apply the damage real posts do to a snippet, each kind with a small probability."""
+    roll = rng.random()
+    if roll < 0.05:
+        text = unicodedata.normalize("NFD", text)
+    elif roll < 0.10:
+        text = text.upper()
+    elif roll < 0.15:
+        text = unicodedata.normalize("NFD", text).encode("ascii", "ignore").decode("ascii")
+    if rng.random() < 0.1:
+        text = text.replace(" ", "  ")
+    return text
+
+
+def _in_context(rng: random.Random, text: str) -> str:
+    roll = rng.random()
+    if roll < 0.4:
+        return text
+    if roll < 0.7:
+        return f"{rng.choice(CONTEXT)}. {text}"
+    if roll < 0.9:
+        return f"{text}, {rng.choice(CONTEXT).lower()}"
+    return f"{rng.choice(CONTEXT)}, {text}. {rng.choice(CONTEXT)}"
+
+
+def price_snippet(rng: random.Random) -> Snippet:
+    whole, tenth = rng.randint(1, 15), rng.randint(0, 9)
+    millions = whole * 1_000_000 + tenth * 100_000
+    form = rng.randrange(12)
+    if form == 0:
+        body, truth = f"{whole}.{tenth} triệu", millions
+    elif form == 1:
+        body, truth = f"{whole},{tenth} triệu", millions
+    elif form == 2:
+        body, truth = f"{whole}tr{tenth}", millions
+    elif form == 3:
+        body, truth = f"{whole} triệu {tenth}", millions
+    elif form == 4:
+        body, truth = rng.choice([f"{whole} triệu", f"{whole}tr", f"{whole} tr", f"{whole}trieu", f"{whole} củ"]), \
+            whole * 1_000_000
+    elif form == 5:
+        body, truth = f"{whole}.{tenth}tr", millions
+    elif form in (6, 7):
+        digits = f"{millions:,}"
+        body = rng.choice([digits.replace(",", "."), digits, str(millions)]) + \
+            rng.choice(["đ", " đồng", " vnd", " VNĐ", "", " d"])
+        truth = millions
+    elif form == 8:
+        body, truth = f"{rng.randint(1, 5)}{rng.choice(['', '0'])}", None
+        body = f"{body} người ở"
+    elif form == 9:
+        billions = rng.randint(1, 9)
+        body, truth = rng.choice([(f"{billions},{tenth} tỷ", billions * 10**9 + tenth * 10**8),
+                                  (f"{billions} tỷ", billions * 10**9), (f"{billions} ty", billions * 10**9)])
+    elif form == 10:
+        body, truth = rng.choice(["thỏa thuận", "liên hệ", "giá tốt", "giá sinh viên"]), None
+    else:
+        thousands = rng.randint(15, 95) * 100
+        body, truth = f"{thousands}k", thousands * 1000
+    text = rng.choice(PRICE_PREFIXES) + body + (rng.choice(PRICE_SUFFIXES) if truth and truth < 10**9 else "")
+    return Snippet("price", _noise(rng, _in_context(rng, text)), truth)
+
+
+def area_snippet(rng: random.Random) -> Snippet:
+    size = rng.randint(10, 80)
+    form = rng.randrange(9)
+    if form == 0:
+        body, truth = f"{size} m²", float(size)
+    elif form == 1:
+        body, truth = f"{size}m2", float(size)
+    elif form == 2:
+        body, truth = rng.choice([f"{size} m2", f"{size}M2", f"{size} m^2"]), float(size)
+    elif form == 3:
+        half = rng.choice([5, 2, 8])
+        body, truth = rng.choice([f"{size},{half} m²", f"{size}.{half}m2"]), size + half / 10
+    elif form == 4:
+        body, truth = rng.choice([f"{size} mét vuông", f"{size} met vuong", f"{size}m vuông"]), float(size)
+    elif form == 5:
+        width, length = rng.randint(3, 6), rng.randint(4, 10)
+        body, truth = rng.choice([f"{width}x{length}m", f"{width} x {length} m", f"{width}m x {length}m"]), \
+            float(width * length)
+    elif form == 6:
+        body, truth = f"{size}m²", float(size)
+    elif form == 7:
+        body, truth = rng.choice(["rộng rãi", "thoáng mát", "phòng lớn"]), None
+    else:
+        body, truth = f"{size} m² sàn + gác {rng.randint(5, 15)} m²", float(size)
+    text = rng.choice(AREA_PREFIXES) + body
+    return Snippet("area", _noise(rng, _in_context(rng, text)), truth)
+
+
+def phone_snippet(rng: random.Random) -> Snippet:
+    number = "0" + rng.choice(CARRIERS) + "".join(str(rng.randint(0, 9)) for _ in range(7))
+    form = rng.randrange(8)
+    groups = [number[:4], number[4:7], number[7:]]
+    if form == 0:
+        body = number
+    elif form in (1, 2):
+        body = rng.choice([" ", ".", "-"]).join(groups)
+    elif form == 3:
+        body = f"{number[:3]} {number[3:6]} {number[6:]}"
+    elif form == 4:
+        body = rng.choice(["+84 ", "+84", "84"]) + number[1:4] + rng.choice([" ", ""]) + number[4:7] + \
+            rng.choice([" ", ""]) + number[7:]
+    elif form == 5:
+        # Zeros typed as the letter O to dodge group filters
+        body = " ".join(groups).replace("0", "O")
+    elif form == 6:
+        body = f"{number[:4]}.{number[4:7]}.{number[7:]} (Zalo)"
+    else:
+        return Snippet("phone", _noise(rng, _in_context(rng, rng.choice(["ib mình nhé", "inbox", "nhắn tin"]))),
+                       None)
+    text = rng.choice(PHONE_PREFIXES) + body
+    return Snippet("phone", _noise(rng, _in_context(rng, text)), number)
+
+
+GENERATORS = {"price": price_snippet, "area": area_snippet, "phone": phone_snippet}
+
+
+def generate(kind: str, size: int, seed: int = 7) -> List[Snippet]:
+    rng = random.Random(f"{kind}:{seed}")
+    make = GENERATORS[kind]
+    return [make(rng) for _ in range(size)]
+
+
+def corpus(size: int = 100_000, seed: int = 7) -> Iterator[Snippet]:
+    """`size` snippets of every kind."""
+    for kind in GENERATORS:
+        yield from generate(kind, size, seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=100_000, help="snippets per kind")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--out", help="write JSON lines here instead of printing a sample")
+    args = parser.parse_args()
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            for snippet in corpus(args.size, args.seed):
+                f.write(json.dumps(snippet._asdict(), ensure_ascii=False) + "\n")
+        print(f"Wrote {args.size * len(GENERATORS)} snippets to {args.out} ({os.path.getsize(args.out) / 2**20:.1f} MiB)")
+        return 0
+    for kind in GENERATORS:
+        for snippet in generate(kind, 5, args.seed):
+            print(f"{kind:<6} {snippet.text!r:<70} -> {snippet.truth!r}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+"""Replay fixtures for the offline scraper benchmark: capture live pages or synthesize a site.
+
+A replay set is a directory of saved listing and detail pages plus a
+manifest.json that maps request paths (with their query string) to files:
+
+    {"city": "da-nang", "routes": {"/tinh-thanh/da-nang?orderby=moi-nhat": "index-1.html", ...}}
+
+FixtureSite(root, routes=manifest["routes"]) then serves the set, so
+WebScraper can crawl it exactly as it crawls phongtro123.com.
+
+Usage: python benchmarks/replay_fixtures.py capture [--pages 3] [--out benchmarks/fixtures/replay]
+       python benchmarks/replay_fixtures.py synthesize [--posts 200] [--out DIR]
+
+capture fetches live pages once, politely (--interval seconds apart), and
+rewrites links to the site root so the saved pages link to each other.
+Captured pages hold real contact details; keep them out of the repository.
+"""
+import argparse, json, os, random, re, sys, time
+from typing import Any, Dict
+from urllib.parse import urlparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from http_fetch import HttpFetcher
+from index_crawler import IndexCrawler, parse_listing_urls
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+TEMPLATE = os.path.join(BENCHMARKS, "fixtures", "phongtro123", "detail_basic.html")
+MANIFEST = "manifest.json"
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/90.0.4430.212 Safari/537.36"
+
+PHRASES = [
+    "phòng mới xây sạch sẽ thoáng mát", "có gác lửng rộng", "có máy lạnh và nóng lạnh", "wifi tốc độ cao miễn phí",
+    "giờ giấc tự do không chung chủ", "có chỗ để xe máy rộng rãi", "gần chợ và siêu thị", "cách biển năm phút đi bộ",
+    "gần trường đại học bách khoa", "khu dân cư an ninh yên tĩnh", "có kệ bếp nấu ăn riêng", "nhà vệ sinh khép kín",
+    "có ban công cửa sổ lớn", "sân phơi đồ chung trên sân thượng", "điện nước giá nhà nước", "có tủ lạnh và máy giặt",
+    "full nội thất giường nệm tủ quần áo", "camera an ninh hai tư giờ", "phù hợp sinh viên và người đi làm",
+    "ưu tiên ở lâu dài", "cọc một tháng", "hẻm xe hơi vào tận nơi", "đường rộng không ngập nước",
+    "gần bệnh viện và công viên", "phòng tầng trệt tiện đi lại", "có thang máy", "cho nuôi thú cưng nhỏ",
+    "có bảo vệ và khóa vân tay", "miễn phí dịch vụ vệ sinh", "view sông hàn thoáng đãng",
+]
+
+
+def _names(values):
+    """config.json lists each place with and without diacritics; keep the accented spelling."""
+    return [value for value in values if re.search(r"[^\x00-\x7f]", value)]
+
+
+def load_routes(root: str) -> Dict[str, Any]:
+    with open(os.path.join(root, MANIFEST), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_manifest(root: str, city: str, routes: Dict[str, str]):
+    with open(os.path.join(root, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump({"city": city, "routes": routes}, f, ensure_ascii=False, indent=2)
+
+
+def synthesize(root: str, posts: int = 200, per_page: int = 20, city: str = "da-nang", seed: int = 7) -> Dict[str, Any]:
+    """Write a deterministic replay set of `posts` distinct detail pages behind paged listing pages."""
+    with open(os.path.join(ROOT, "config.json"), encoding="utf-8") as f:
+        places = json.load(f)
+    with open(TEMPLATE, encoding="utf-8") as f:
+        template = f.read()
+    districts = [d for d in _names(places["districts"]) if _names(places["wards"].get(d, []))]
+    streets = _names(places["streets"])
+    rng = random.Random(seed)
+    os.makedirs(os.path.join(root, "detail"), exist_ok=True)
+    crawler = IndexCrawler("", city, USER_AGENT)
+    routes, links = {}, []
+    for i in range(posts):
+        district = rng.choice(districts)
+        ward = rng.choice(_names(places["wards"][district]))
+        address = f"K{rng.randint(1, 400)}/{rng.randint(1, 40)} {rng.choice(streets)}, Phường {ward}, Quận {district}, Đà Nẵng"
+        price = rng.randint(12, 90) / 10
+        description = rng.sample(PHRASES, 6)
+        page = (template
+                .replace("3.5 triệu/tháng", f"{price:g} triệu/tháng")
+                .replace("25 m²", f"{rng.randint(12, 60)} m²")
+                .replace("#691234", f"#{700000 + i}")
+                .replace("K12/5 Nguyễn Văn Thoại, Phường An Hải Đông, Quận Sơn Trà, Đà Nẵng", address)
+                .replace("14:30 10/04/2025", f"{rng.randint(6, 22):02d}:{rng.randint(0, 59):02d} "
+                                             f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/2025")
+                .replace("Cho thuê phòng trọ mới xây,   sạch sẽ, có gác lửng.",
+                         f"Cho thuê phòng trọ số {i} đường {rng.choice(streets)}, {description[0]}.")
+                .replace("Phòng có máy lạnh, wifi, tủ lạnh, WC riêng.<br>Giờ giấc tự do, có chỗ để xe.",
+                         f"{', '.join(description[1:4]).capitalize()}.<br>{', '.join(description[4:]).capitalize()}.")
+                .replace("0905 123 456", f"09{rng.randint(0, 99):02d} {rng.randint(0, 999):03d} {rng.randint(0, 999):03d}"))
+        name = f"phong-tro-{i}-pr{700000 + i}.html"
+        with open(os.path.join(root, "detail", name), "w", encoding="utf-8") as f:
+            f.write(page)
+        routes[f"/{name}"] = f"detail/{name}"
+        links.append(f"/{name}")
+    for page in range((posts + per_page - 1) // per_page):
+        html = "".join(f'<h3><a class="line-clamp-2" href="{link}">Phòng trọ</a></h3>\n'
+                       for link in links[page * per_page:(page + 1) * per_page])
+        name = f"index-{page + 1}.html"
+        with open(os.path.join(root, name), "w", encoding="utf-8") as f:
+            f.write(f"<html><body><main>\n{html}</main></body></html>\n")
+        routes[crawler.page_url(page + 1)] = name
+    write_manifest(root, city, routes)
+    return load_routes(root)
+
+
+def capture(root: str, base_url: str = "https://phongtro123.com", city: str = "da-nang", pages: int = 3,
+            interval: float = 2.0) -> Dict[str, Any]:
+    """Save `pages` live listing pages and every detail page they link to."""
+    fetcher = HttpFetcher(USER_AGENT, pool_size=1)
+    crawler = IndexCrawler(base_url, city, USER_AGENT)
+    origin = re.compile(re.escape(base_url.rstrip("/")) + r"(?=/)")
+    os.makedirs(os.path.join(root, "detail"), exist_ok=True)
+    routes = {}
+    try:
+        for page in range(1, pages + 1):
+            url = crawler.page_url(page)
+            status, html = fetcher.fetch(url)
+            if status != 200:
+                print(f"Listing page {page}: HTTP {status}, stopping")
+                break
+            name = f"index-{page}.html"
+            with open(os.path.join(root, name), "w", encoding="utf-8") as f:
+                f.write(origin.sub("", html))
+            routes[url[len(base_url.rstrip("/")):]] = name
+            details = parse_listing_urls(html, url)
+            print(f"Listing page {page}: {len(details)} posts")
+            for detail in details:
+                path = urlparse(detail).path
+                if path in routes:
+                    continue
+                time.sleep(interval)
+                status, html = fetcher.fetch(detail)
+                if status != 200:
+                    print(f"  HTTP {status} for {detail}")
+                    continue
+                name = "detail/" + (os.path.basename(path) or f"post-{len(routes)}.html")
+                with open(os.path.join(root, name), "w", encoding="utf-8") as f:
+                    f.write(origin.sub("", html))
+                routes[path] = name
+            time.sleep(interval)
+    finally:
+        fetcher.close()
+    write_manifest(root, city, routes)
+    print(f"Captured {len(routes)} pages to {root}")
+    return load_routes(root)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("mode", choices=["capture", "synthesize"])
+    parser.add_argument("--out", default=os.path.join(BENCHMARKS, "fixtures", "replay"))
+    parser.add_argument("--base-url", default="https://phongtro123.com")
+    parser.add_argument("--city", default="da-nang")
+    parser.add_argument("--pages", type=int, default=3, help="listing pages to capture")
+    parser.add_argument("--interval", type=float, default=2.0, help="seconds between live requests")
+    parser.add_argument("--posts", type=int, default=200, help="detail pages to synthesize")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    if args.mode == "capture":
+        capture(args.out, args.base_url, args.city, args.pages, args.interval)
+    else:
+        manifest = synthesize(args.out, args.posts, city=args.city, seed=args.seed)
+        print(f"Wrote {len(manifest['routes'])} pages to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class BrowserPool:
+    """Warm browser sessions kept alive between crawls and handed out to scrapers.
+
+    create() starts a browser and prepare(driver) readies it (the Facebook
+    scraper logs in with its cookies there); both only run when no idle
+    session passes the health check. A session is retired after max_pages
+    page loads or max_age seconds so Chrome's memory growth stays bounded.
+    At most max_idle sessions are kept between leases. Safe to share between
+    scraper threads.
+    """
+
+    def __init__(self, create: Callable[[], Any], prepare: Optional[Callable[[Any], bool]] = None,
+                 check: Optional[Callable[[Any], bool]] = None, max_pages: int = 200, max_age: float = 3600,
+                 max_idle: int = 1):
+        self.create = create
+        self.prepare = prepare
+        self.check = check
+        self.max_pages = max_pages
+        self.max_age = max_age
+        self.max_idle = max(1, max_idle)
+        self._lock = threading.Lock()
+        self._idle: List[Any] = []
+        self._sessions: Dict[int, Dict[str, float]] = {}
+        self._closed = False
+        self.created = 0
+        self.reused = 0
+        self.recycled = 0
+
+    def acquire(self) -> Any:
+        """A healthy session: an idle one if there is any, otherwise a new, prepared one."""
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                driver = self._idle.pop()
+            if self.is_healthy(driver):
+                with self._lock:
+                    self.reused += 1
+                return driver
+            logger.info("Discarding an idle browser session that failed its health check")
+            self._quit(driver)
+
+        driver = self.create()
+        with self._lock:
+            self._sessions[id(driver)] = {"pages": 0, "created": time.monotonic()}
+            self.created += 1
+        try:
+            if self.prepare and not self.prepare(driver):
+                raise RuntimeError("New browser session could not be prepared")
+        except Exception:
+            self._quit(driver)
+            raise
+        return driver
+
+    def page_loaded(self, driver: Any) -> bool:
+        """Count a page load on this session; True once it is due for recycling."""
+        with self._lock:
+            state = self._sessions.get(id(driver))
+            if state is None:
+                return False
+            state["pages"] += 1
+        return self._expired(state)
+
+    def _expired(self, state: Dict[str, float]) -> bool:
+        return ((self.max_pages and state["pages"] >= self.max_pages)
+                or (self.max_age and time.monotonic() - state["created"] >= self.max_age))
+
+    def is_healthy(self, driver: Any) -> bool:
+        with self._lock:
+            state = self._sessions.get(id(driver))
+        if state is None or self._expired(state):
+            return False
+        try:
+            driver.execute_script("return 1")
+        except Exception:
+            return False
+        try:
+            return not self.check or bool(self.check(driver))
+        except Exception:
+            return False
+
+    def release(self, driver: Any, healthy: bool = True):
+        """Return a session to the pool, or quit it if it is broken, worn out or surplus."""
+        if driver is None:
+            return
+        with self._lock:
+            state = self._sessions.get(id(driver))
+            keep = (healthy and not self._closed and state is not None and not self._expired(state)
+                    and len(self._idle) < self.max_idle)
+            if keep:
+                self._idle.append(driver)
+                return
+            if state is not None and self._expired(state):
+                self.recycled += 1
+                logger.info(f"Recycling browser session after {int(state['pages'])} pages")
+        self._quit(driver)
+
+    def _quit(self, driver: Any):
+        with self._lock:
+            self._sessions.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"created": self.created, "reused": self.reused, "recycled": self.recycled,
+                    "idle": len(self._idle), "open": len(self._sessions)}
+
+    def close(self):
+        """Quit every idle session; sessions still leased are quit when released."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for driver in idle:
+            self._quit(driver)
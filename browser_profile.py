@@ -0,0 +1,61 @@
+import logging
+from typing import Iterable, List
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+
+logger = logging.getLogger(__name__)
+
+# Resource types the scrapers never read; matched by Network.setBlockedURLs wildcards
+BLOCKED_RESOURCE_PATTERNS = [
+    "*.jpg*", "*.jpeg*", "*.png*", "*.gif*", "*.webp*", "*.avif*", "*.svg*", "*.ico*",
+    "*.mp4*", "*.webm*", "*.m3u8*", "*.mp3*",
+    "*.woff*", "*.woff2*", "*.ttf*", "*.otf*", "*.eot*",
+]
+
+# Ad, analytics and widget hosts loaded by phongtro123 and Facebook pages
+THIRD_PARTY_HOSTS = [
+    "googletagmanager.com", "google-analytics.com", "doubleclick.net", "googlesyndication.com",
+    "googleadservices.com", "adservice.google.com", "connect.facebook.net", "fonts.googleapis.com",
+    "fonts.gstatic.com", "tiktok.com", "hotjar.com", "clarity.ms", "zalo.me",
+]
+
+# Facebook serves photos and video from scontent/video CDN hosts; its scripts come from static.*.fbcdn.net
+FACEBOOK_MEDIA_HOSTS = ["scontent*.fbcdn.net", "video*.fbcdn.net"]
+
+# Chrome content settings: 2 = block
+LEAN_PREFS = {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.managed_default_content_settings.media_stream": 2,
+    "profile.managed_default_content_settings.plugins": 2,
+    "profile.managed_default_content_settings.geolocation": 2,
+    "profile.managed_default_content_settings.notifications": 2,
+    "profile.default_content_setting_values.automatic_downloads": 2,
+}
+
+
+def blocked_url_patterns(extra_hosts: Iterable[str] = ()) -> List[str]:
+    """URL patterns for Network.setBlockedURLs: media/font types plus whole third-party hosts."""
+    hosts = list(THIRD_PARTY_HOSTS) + list(extra_hosts)
+    return BLOCKED_RESOURCE_PATTERNS + [f"*://*{host}/*" for host in hosts]
+
+
+def apply_lean_options(options: Options) -> Options:
+    """Text-only profile: return from get() at DOMContentLoaded and never render images or media."""
+    options.page_load_strategy = "eager"
+    options.add_experimental_option("prefs", LEAN_PREFS)
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    options.add_argument("--mute-audio")
+    return options
+
+
+def block_resources(driver: webdriver.Chrome, extra_hosts: Iterable[str] = ()) -> bool:
+    """Drop image, media, font and third-party requests before they leave the browser."""
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocked_url_patterns(extra_hosts)})
+        return True
+    except Exception as e:
+        # Content-settings prefs still keep images out if CDP is unavailable
+        logger.warning(f"Could not set blocked URLs over CDP: {str(e)}")
+        return False
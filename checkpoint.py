@@ -0,0 +1,109 @@
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class Checkpoint:
+    """Crawl progress kept in a small JSON file so an interrupted run can resume.
+
+    State is grouped in named sections (e.g. "web", "fb:<group url>"). Writes
+    go through a temp file and os.replace, and are spaced at least
+    min_interval seconds apart unless forced.
+    """
+
+    def __init__(self, path: str, min_interval: float = 2.0):
+        self.path = path
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._last_save = 0.0
+        self._dirty = False
+        self.state: Dict[str, Dict[str, Any]] = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable checkpoint {self.path}: {str(e)}")
+            return {}
+
+    def get(self, section: str) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.state.get(section, {}))
+
+    def update(self, section: str, force: bool = False, **values):
+        with self._lock:
+            self.state.setdefault(section, {}).update(values)
+            self.state[section]["updated"] = time.time()
+            self._dirty = True
+        self.save(force)
+
+    def clear(self, section: str):
+        with self._lock:
+            if self.state.pop(section, None) is None:
+                return
+            self._dirty = True
+        self.save(force=True)
+
+    def save(self, force: bool = False):
+        with self._lock:
+            if not self._dirty or (not force and time.monotonic() - self._last_save < self.min_interval):
+                return
+            tmp_path = f"{self.path}.tmp"
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(self.state, f, ensure_ascii=False)
+                os.replace(tmp_path, self.path)
+                self._dirty = False
+                self._last_save = time.monotonic()
+            except Exception as e:
+                logger.error(f"Could not write checkpoint {self.path}: {str(e)}")
+
+
+class Frontier:
+    """Pending URLs and the last listing page of a crawl, mirrored to a checkpoint section.
+
+    A page's URLs are added before any of them is handed out, so every URL
+    from pages up to last_page is either finished or still pending.
+    """
+
+    def __init__(self, checkpoint: Checkpoint, section: str):
+        self.checkpoint = checkpoint
+        self.section = section
+        self._lock = threading.Lock()
+        self._pending: Dict[str, None] = {}
+        self.last_page = 0
+
+    def restore(self) -> Tuple[List[str], int]:
+        """Load the saved frontier; returns (pending URLs, last page)."""
+        state = self.checkpoint.get(self.section)
+        with self._lock:
+            self._pending = dict.fromkeys(state.get("pending", []))
+            self.last_page = state.get("last_page", 0)
+            return list(self._pending), self.last_page
+
+    def reset(self):
+        with self._lock:
+            self._pending = {}
+            self.last_page = 0
+        self.checkpoint.clear(self.section)
+
+    def add_page(self, page: int, urls: List[str]):
+        with self._lock:
+            self._pending.update(dict.fromkeys(urls))
+            self.last_page = max(self.last_page, page)
+            pending, last_page = list(self._pending), self.last_page
+        self.checkpoint.update(self.section, force=True, pending=pending, last_page=last_page)
+
+    def done(self, url: str):
+        with self._lock:
+            self._pending.pop(url, None)
+            pending, last_page = list(self._pending), self.last_page
+        self.checkpoint.update(self.section, pending=pending, last_page=last_page)
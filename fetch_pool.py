@@ -0,0 +1,234 @@
+import logging
+import queue
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Generic, Iterable, Iterator, Optional, Tuple, TypeVar
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+S = TypeVar("S")   # a browser session (or anything that can fetch)
+R = TypeVar("R")   # a fetch result
+
+_DONE = object()
+
+
+class AdaptiveThrottle:
+    """Per-host request pacing that adapts to how the host is responding (AIMD).
+
+    Each host gets a rate in requests per second. It rises by `step` after every
+    fast, healthy response and is multiplied by `backoff` after a slow page, an
+    error or a login wall. It always stays between 1/max_interval and
+    1/min_interval. Callers reserve the next free slot under a lock and sleep
+    only until their own slot, so concurrent workers overlap their waits with
+    each other's fetches. min_interval <= 0 disables pacing.
+    """
+
+    HEALTHY_STREAK = 3   # healthy responses after a backoff before a host counts as steady again
+
+    def __init__(self, min_interval: float, start_interval: Optional[float] = None, max_interval: float = 30.0,
+                 slow_after: float = 5.0, step: float = 0.1, backoff: float = 0.5, jitter: float = 0.2):
+        self.min_interval = min_interval
+        self.start_interval = max(start_interval or min_interval, min_interval)
+        self.max_interval = max(max_interval, self.start_interval)
+        self.slow_after = slow_after
+        self.step = step
+        self.backoff = backoff
+        self.jitter = jitter
+        self._hosts: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def _host(self, url: str) -> Dict[str, float]:
+        host = urlparse(url).netloc
+        if host not in self._hosts:
+            self._hosts[host] = {"rate": 1.0 / self.start_interval, "next_slot": 0.0, "requests": 0,
+                                 "backoffs": 0, "streak": self.HEALTHY_STREAK}
+        return self._hosts[host]
+
+    def wait(self, url: str) -> float:
+        """Block until this host's next slot; returns the time waited."""
+        if self.min_interval <= 0:
+            return 0
+        with self._lock:
+            state = self._host(url)
+            now = time.monotonic()
+            slot = max(now, state["next_slot"])
+            interval = 1.0 / state["rate"]
+            state["next_slot"] = slot + interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+            state["requests"] += 1
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    def report(self, url: str, ok: bool, elapsed: float = 0.0):
+        """Feed back how a request went: speed up when healthy, back off when slow or failing."""
+        if self.min_interval <= 0:
+            return
+        with self._lock:
+            state = self._host(url)
+            if ok and elapsed < self.slow_after:
+                state["rate"] = min(1.0 / self.min_interval, state["rate"] + self.step)
+                state["streak"] += 1
+            else:
+                state["rate"] = max(1.0 / self.max_interval, state["rate"] * self.backoff)
+                state["next_slot"] = max(state["next_slot"], time.monotonic() + 1.0 / state["rate"])
+                state["backoffs"] += 1
+                state["streak"] = 0
+                logger.info(f"Backing off {urlparse(url).netloc}: {state['rate']:.2f} req/s "
+                            f"({'slow' if ok else 'unhealthy'} response after {elapsed:.1f}s)")
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Current rate and backoff state per host."""
+        with self._lock:
+            return {
+                host: {
+                    "rate": round(state["rate"], 3),
+                    "interval": round(1.0 / state["rate"], 3),
+                    "requests": state["requests"],
+                    "backoffs": state["backoffs"],
+                    "state": "steady" if state["streak"] >= self.HEALTHY_STREAK else "backoff",
+                }
+                for host, state in self._hosts.items()
+            }
+
+
+class SessionPool(Generic[S, R]):
+    """Fetch URLs on N sessions that share one queue, yielding results in input order.
+
+    A fetch that fails on a dead session restarts that session and puts the
+    URL back on the queue, up to max_retries times. A session that fails to
+    start (a slow login, a browser that would not launch) puts its URL back
+    for the other workers and is retried after a backoff; a worker gives up
+    after SPAWN_ATTEMPTS failures in a row, and the pool only stops once no
+    worker is left.
+    """
+
+    SPAWN_ATTEMPTS = 3    # failed session starts in a row before a worker gives up
+    SPAWN_BACKOFF = 2.0   # seconds before retrying a failed start, doubled after each failure
+
+    def __init__(self, spawn: Callable[[], S], fetch: Callable[[S, str], Optional[R]],
+                 is_alive: Callable[[S], bool], close: Callable[[S], None],
+                 size: int, max_retries: int = 2):
+        self.spawn = spawn
+        self.fetch = fetch
+        self.is_alive = is_alive
+        self.close = close
+        self.size = max(1, size)
+        self.max_retries = max_retries
+        self.restarts = 0
+        self._crashed: Optional[Exception] = None
+        self._live = 0
+
+    def _worker(self, jobs: queue.Queue, results: Dict[int, Optional[R]], ready: threading.Condition,
+                stop: threading.Event):
+        session = None
+        spawn_failures = 0
+        spawn_error: Optional[Exception] = None
+        try:
+            while not stop.is_set():
+                job = jobs.get()
+                if job is _DONE:
+                    break
+                index, url, attempt = job
+                if session is None:
+                    try:
+                        session = self.spawn()
+                        spawn_failures = 0
+                    except Exception as e:
+                        # The URL was never tried, so it goes back as it was for any worker to take
+                        jobs.put(job)
+                        spawn_failures += 1
+                        spawn_error = e
+                        if spawn_failures >= self.SPAWN_ATTEMPTS:
+                            logger.error(f"Session failed to start {spawn_failures} times, stopping this worker: {str(e)}")
+                            break
+                        logger.warning(f"Session failed to start ({spawn_failures}/{self.SPAWN_ATTEMPTS}), "
+                                       f"retrying: {str(e)}")
+                        stop.wait(self.SPAWN_BACKOFF * 2 ** (spawn_failures - 1))
+                        continue
+
+                result = None
+                try:
+                    result = self.fetch(session, url)
+                except Exception as e:
+                    logger.error(f"Fetch failed for {url}: {str(e)}")
+
+                if result is None and not self.is_alive(session):
+                    logger.warning(f"Session died on {url}, restarting")
+                    self._close_quietly(session)
+                    session = None
+                    with ready:
+                        self.restarts += 1
+                    if attempt < self.max_retries:
+                        jobs.put((index, url, attempt + 1))
+                        continue
+
+                with ready:
+                    results[index] = result
+                    ready.notify_all()
+        except Exception as e:
+            logger.error(f"Worker crashed: {str(e)}")
+            self._crashed = e
+            stop.set()
+            with ready:
+                ready.notify_all()
+        finally:
+            if session is not None:
+                self._close_quietly(session)
+            with ready:
+                self._live -= 1
+                if not self._live and not stop.is_set():
+                    # Every worker gave up on starting a session, so the queued URLs would never be fetched
+                    self._crashed = spawn_error or RuntimeError("no worker left")
+                    stop.set()
+                ready.notify_all()
+
+    def _close_quietly(self, session: S):
+        try:
+            self.close(session)
+        except Exception:
+            pass
+
+    def imap(self, urls: Iterable[str]) -> Iterator[Tuple[str, Optional[R]]]:
+        """Yield (url, result) pairs in the order the URLs were given."""
+        jobs: queue.Queue = queue.Queue()
+        results: Dict[int, Optional[R]] = {}
+        ready = threading.Condition()
+        stop = threading.Event()
+        workers = [
+            threading.Thread(target=self._worker, args=(jobs, results, ready, stop), daemon=True)
+            for _ in range(self.size)
+        ]
+        self._live = len(workers)
+        for worker in workers:
+            worker.start()
+
+        submitted = []
+        next_index = 0
+        try:
+            for url in urls:
+                jobs.put((len(submitted), url, 0))
+                submitted.append(url)
+                # Keep the queue short so a streamed URL source is not drained ahead of the workers.
+                while len(submitted) - next_index >= self.size * 2 and not stop.is_set():
+                    with ready:
+                        ready.wait_for(lambda: next_index in results or stop.is_set())
+                    while next_index in results:
+                        yield submitted[next_index], results.pop(next_index)
+                        next_index += 1
+            while next_index < len(submitted) and not stop.is_set():
+                with ready:
+                    ready.wait_for(lambda: next_index in results or stop.is_set())
+                while next_index in results:
+                    yield submitted[next_index], results.pop(next_index)
+                    next_index += 1
+            if self._crashed is not None:
+                raise RuntimeError(f"Session pool stopped: {self._crashed}")
+        finally:
+            stop.set()
+            for _ in workers:
+                jobs.put(_DONE)
+            for worker in workers:
+                worker.join()
@@ -0,0 +1,85 @@
+import re
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+
+# Combining marks left behind by NFD, plus the one Vietnamese letter that
+# does not decompose.
+_FOLD_TABLE = {code: None for code in range(0x0300, 0x0370)}
+_FOLD_TABLE.update({ord('đ'): 'd', ord('Đ'): 'D'})
+
+
+def fold_text(text: str) -> str:
+    """Lowercase text and strip Vietnamese diacritics ("Hòa Khê" -> "hoa khe")."""
+    if not text:
+        return ""
+    return unicodedata.normalize('NFD', text).translate(_FOLD_TABLE).lower()
+
+
+class Gazetteer:
+    """District/ward lookup built once from config.json.
+
+    Names are folded to lowercase ASCII, so "Hải Châu", "Hai Chau" and
+    "HẢI CHÂU" are the same entry and only need to be listed once. Results
+    always use the first spelling found in the config.
+    """
+
+    def __init__(self, districts: List[str], wards: Dict[str, List[str]]):
+        # folded name -> canonical district
+        self.district_names: Dict[str, str] = {}
+        # folded name -> [(canonical district, canonical ward)]
+        self.ward_names: Dict[str, List[Tuple[str, str]]] = {}
+        self.district_rank: Dict[str, int] = {}
+        self.ward_rank: Dict[Tuple[str, str], int] = {}
+
+        for district in districts:
+            key = fold_text(district)
+            if key and key not in self.district_names:
+                self.district_names[key] = district
+                self.district_rank[district] = len(self.district_rank)
+
+        for district_key, ward_list in wards.items():
+            district = self.district_names.get(fold_text(district_key), district_key)
+            canonical_wards: Dict[str, str] = {}
+            for ward in ward_list:
+                key = fold_text(ward)
+                if not key or key in canonical_wards:
+                    continue
+                canonical_wards[key] = ward
+                self.ward_names.setdefault(key, []).append((district, ward))
+                self.ward_rank[(district, ward)] = len(self.ward_rank)
+
+        names = set(self.district_names) | set(self.ward_names)
+        self.pattern: Optional[re.Pattern] = None
+        if names:
+            # Longest first, so "thanh khe dong" (ward) wins over "thanh khe" (district).
+            alternation = '|'.join(re.escape(n) for n in sorted(names, key=len, reverse=True))
+            self.pattern = re.compile(r'\b(?:' + alternation + r')\b')
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "Gazetteer":
+        """Build a gazetteer from a loaded config.json dict."""
+        return cls(config.get("districts", []), config.get("wards", {}))
+
+    def resolve(self, text: str) -> Tuple[Optional[str], Optional[str]]:
+        """Return (district, ward) mentioned in text, inferring the district from the ward if needed."""
+        if not text or self.pattern is None:
+            return None, None
+
+        districts = set()
+        wards: List[Tuple[str, str]] = []
+        for match in self.pattern.finditer(fold_text(text)):
+            name = match.group(0)
+            if name in self.district_names:
+                districts.add(self.district_names[name])
+            wards.extend(self.ward_names.get(name, ()))
+
+        if districts:
+            district = min(districts, key=self.district_rank.__getitem__)
+        elif wards:
+            district = wards[0][0]
+        else:
+            return None, None
+
+        in_district = [w for w in wards if w[0] == district]
+        ward = min(in_district, key=self.ward_rank.__getitem__)[1] if in_district else None
+        return district, ward
@@ -0,0 +1,105 @@
+import html as html_lib
+import logging
+import re
+from typing import Any, Dict, List, Tuple
+
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# CSS equivalents of the XPaths WebScraper reads through Selenium. Class
+# attributes are matched exactly, like @class='...' in the XPath versions.
+CONTENT_SELECTOR = 'div[class="border-bottom pb-3 mb-4"] > p'
+TIME_SELECTORS = ['td[class="border-0 pb-0"]', 'table[class="table table-borderless align-middle m-0"] > tbody tr:nth-of-type(5)']
+ADDRESS_SELECTORS = ['td[colspan="3"]', 'table[class="table table-borderless align-middle m-0"] > tbody tr:nth-of-type(3) > td:nth-of-type(2)']
+PRICE_SELECTORS = ['span[class="text-price fs-5 fw-bold"]', 'span[class="text-green fs-5 fw-bold"]']
+AREA_SELECTOR = 'div[class="d-flex justify-content-between"] > div > span:nth-of-type(3)'
+AMENITY_SELECTOR = 'div[class="text-body d-flex pt-1 pb-1"]:not([style*="--bs-text-opacity: 0.1;"])'
+CONTACT_SELECTOR = 'div[class="mb-4"] i[class="icon telephone-fill white me-2"]'
+
+ERROR_TITLES = ("Page not found", "Error")
+TITLE_PATTERN = re.compile(r"<title[^>]*>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+
+
+def element_text(element) -> str:
+    """Approximate Selenium's WebElement.text: collapsed whitespace, <br> as a line break."""
+    if element is None:
+        return ""
+    for br in element.find_all("br"):
+        br.replace_with("\n")
+    lines = (" ".join(line.split()) for line in element.get_text().split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def _select_text(soup, selector: str, position: int = 0) -> str:
+    matches = soup.select(selector)
+    return element_text(matches[position]) if len(matches) > position else ""
+
+
+def parse_detail_page(html: str) -> Dict[str, Any]:
+    """Read the raw detail-page fields from server-rendered HTML."""
+    soup = BeautifulSoup(html, "html.parser")
+    title = soup.title.get_text().strip() if soup.title else ""
+
+    paragraphs = [element_text(p).strip() for p in soup.select(CONTENT_SELECTOR)]
+    contact_icon = soup.select_one(CONTACT_SELECTOR)
+
+    return {
+        "title": title,
+        "content": "\n".join(paragraphs).strip(),
+        "time": _select_text(soup, TIME_SELECTORS[0], 1) or _select_text(soup, TIME_SELECTORS[1]),
+        "address": _select_text(soup, ADDRESS_SELECTORS[0], 2) or _select_text(soup, ADDRESS_SELECTORS[1]),
+        "price": _select_text(soup, PRICE_SELECTORS[0]) or _select_text(soup, PRICE_SELECTORS[1]),
+        "area": _select_text(soup, AREA_SELECTOR),
+        "amenities": [t for t in (element_text(e).strip() for e in soup.select(AMENITY_SELECTOR)) if t],
+        "contact": element_text(contact_icon.parent).strip() if contact_icon else "",
+    }
+
+
+def page_title(html: str) -> str:
+    """The page's <title> without building a soup, enough to spot an error page before parsing."""
+    match = TITLE_PATTERN.search(html)
+    return html_lib.unescape(match.group(1)).strip() if match else ""
+
+
+def is_error_page(page: Dict[str, Any]) -> bool:
+    return any(marker in page.get("title", "") for marker in ERROR_TITLES)
+
+
+def validate_detail_page(page: Dict[str, Any]) -> List[str]:
+    """Return the required fields missing from a parsed page (empty list = valid)."""
+    return [field for field in ("content", "address", "price") if not page.get(field)]
+
+
+class HttpFetcher:
+    """Plain GETs over a pooled keep-alive requests.Session, shareable between threads."""
+
+    def __init__(self, user_agent: str, pool_size: int = 10, timeout: float = 15):
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update({
+            "User-Agent": user_agent,
+            "Accept": "text/html,application/xhtml+xml",
+            "Accept-Language": "vi-VN,vi;q=0.9,en;q=0.8",
+        })
+        retry = Retry(total=2, backoff_factor=0.5, status_forcelist=(502, 503, 504), allowed_methods=("GET",))
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def fetch(self, url: str) -> Tuple[int, str]:
+        """GET url; returns (status code, body), or (0, "") on a network error."""
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+            if "charset" not in response.headers.get("Content-Type", ""):
+                response.encoding = "utf-8"
+            return response.status_code, response.text
+        except requests.RequestException as e:
+            logger.warning(f"HTTP fetch failed for {url}: {str(e)}")
+            return 0, ""
+
+    def close(self):
+        self.session.close()
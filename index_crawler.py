@@ -0,0 +1,178 @@
+import asyncio
+import logging
+import queue
+import threading
+import time
+from typing import AsyncIterator, Callable, Iterator, List, Optional
+from urllib.parse import urljoin
+
+import aiohttp
+from bs4 import BeautifulSoup
+
+logger = logging.getLogger(__name__)
+
+LISTING_LINK_SELECTOR = 'a[class*="line-clamp-2"]'
+
+_DONE = object()
+
+
+class _RateLimiter:
+    """Space request starts at least 1/rate seconds apart."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def parse_listing_urls(html: str, page_url: str) -> List[str]:
+    """Return the post URLs linked from one listing page, in page order."""
+    soup = BeautifulSoup(html, "html.parser")
+    urls = []
+    for link in soup.select(LISTING_LINK_SELECTOR):
+        href = link.get("href")
+        if href:
+            urls.append(urljoin(page_url, href))
+    return urls
+
+
+class IndexCrawler:
+    """Crawl the tinh-thanh/{city} listing pages concurrently, newest first.
+
+    Page URLs are built directly instead of clicking "Trang sau »". The crawl
+    stops at the first page that is empty or holds only known URLs, so a
+    recurring run only walks as far back as the last one reached.
+    """
+
+    def __init__(self, base_url: str, city: str, user_agent: str, concurrency: int = 4,
+                 rate: float = 2.0, max_pages: int = 0, known: Optional[Callable[[str], bool]] = None,
+                 timeout: float = 15, start_page: int = 1,
+                 on_page: Optional[Callable[[int, List[str]], None]] = None):
+        self.base_url = base_url.rstrip("/")
+        self.city = city
+        self.user_agent = user_agent
+        self.concurrency = max(1, concurrency)
+        self.rate = rate
+        self.max_pages = max_pages
+        self.known = known or (lambda url: False)
+        self.timeout = timeout
+        self.start_page = max(1, start_page)
+        self.on_page = on_page
+        self.pages_fetched = 0
+        self.last_page = 0
+
+    def page_url(self, page: int) -> str:
+        url = f"{self.base_url}/tinh-thanh/{self.city}?orderby=moi-nhat"
+        return url if page == 1 else f"{url}&page={page}"
+
+    async def _fetch_page(self, session: aiohttp.ClientSession, limiter: _RateLimiter, page: int) -> Optional[List[str]]:
+        url = self.page_url(page)
+        await limiter.wait()
+        try:
+            async with session.get(url) as response:
+                if response.status != 200:
+                    logger.warning(f"Listing page {page} returned HTTP {response.status}")
+                    return None
+                html = await response.text(encoding="utf-8", errors="replace")
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Error fetching listing page {page}: {str(e)}")
+            return None
+        self.pages_fetched += 1
+        return parse_listing_urls(html, url)
+
+    async def crawl(self) -> AsyncIterator[str]:
+        """Yield new post URLs page by page, keeping `concurrency` pages in flight."""
+        limiter = _RateLimiter(self.rate)
+        seen = set()
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        headers = {"User-Agent": self.user_agent, "Accept-Language": "vi-VN,vi;q=0.9"}
+        connector = aiohttp.TCPConnector(limit=self.concurrency)
+
+        async with aiohttp.ClientSession(timeout=timeout, headers=headers, connector=connector) as session:
+            tasks = {}
+            next_page = self.start_page
+
+            def schedule():
+                nonlocal next_page
+                while len(tasks) < self.concurrency and (not self.max_pages or next_page < self.start_page + self.max_pages):
+                    tasks[next_page] = asyncio.ensure_future(self._fetch_page(session, limiter, next_page))
+                    next_page += 1
+
+            page = self.start_page
+            try:
+                schedule()
+                while page in tasks:
+                    urls = await tasks.pop(page)
+                    self.last_page = page
+                    if not urls:
+                        logger.info(f"Listing page {page} is empty, stopping")
+                        break
+                    new_urls = [u for u in urls if u not in seen and not self.known(u)]
+                    seen.update(urls)
+                    if not new_urls:
+                        logger.info(f"Listing page {page} has only known posts, stopping")
+                        break
+                    logger.info(f"Listing page {page}: {len(new_urls)} new of {len(urls)} URLs")
+                    if self.on_page:
+                        self.on_page(page, new_urls)
+                    for url in new_urls:
+                        yield url
+                    page += 1
+                    schedule()
+            finally:
+                for task in tasks.values():
+                    task.cancel()
+                await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+    def iter_urls(self, limit: int = 0, buffer: int = 100) -> Iterator[str]:
+        """Run the crawl on a background event loop and stream URLs to the caller."""
+        urls: queue.Queue = queue.Queue(maxsize=buffer)
+        stop = threading.Event()
+
+        async def produce():
+            try:
+                async for url in self.crawl():
+                    while not stop.is_set():
+                        try:
+                            await asyncio.to_thread(urls.put, url, True, 0.5)
+                            break
+                        except queue.Full:
+                            continue
+                    if stop.is_set():
+                        break
+            except Exception as e:
+                logger.error(f"Index crawl failed: {str(e)}")
+            finally:
+                while not stop.is_set():
+                    try:
+                        urls.put(_DONE, timeout=0.5)
+                        break
+                    except queue.Full:
+                        continue
+
+        thread = threading.Thread(target=asyncio.run, args=(produce(),), daemon=True)
+        thread.start()
+        count = 0
+        try:
+            while True:
+                url = urls.get()
+                if url is _DONE:
+                    break
+                yield url
+                count += 1
+                if limit and count >= limit:
+                    logger.info(f"Reached limit of {limit} posts.")
+                    break
+        finally:
+            stop.set()
+            thread.join()
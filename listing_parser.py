@@ -0,0 +1,193 @@
+import json
+import logging
+import re
+import unicodedata
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from amenity_tagger import AmenityTagger
+from gazetteer import Gazetteer
+from street_index import StreetIndex
+
+logger = logging.getLogger(__name__)
+
+# "3,5 triệu", "3tr5", "3 triệu 500", "1,2 tỷ", "4 củ". Digits after the unit are its decimals
+# ("3tr5", "3 triệu 5") unless they count something else, so "3 triệu 1 tháng" stays 3 triệu.
+PRICE_UNIT_PATTERN = re.compile(
+    r'(?<![\d.,])(\d+(?:[.,]\d+)?)\s*(tỷ|ty|triệu|trieu|tr|củ|cu)(?![^\W\d_])'
+    r'(?:\s*(\d{1,3})(?!\d|[.,]\d|\s*(?:tháng|thang|th|năm|nam|tuần|tuan|ngày|ngay|người|nguoi|ng|phòng|phong'
+    r'|xe|m|m2|m²|k|đ)(?![^\W\d_])))?'
+)
+# "1500k"; smaller k amounts are utility or per-person fees, not rent
+PRICE_THOUSANDS_PATTERN = re.compile(r'(?<![\d.,])(\d{3,5})\s*k(?![^\W\d_])')
+# "3.500.000đ", "3,500,000 vnd", "3500000"; a leading 0 or +84 makes it a phone number
+PRICE_VND_PATTERN = re.compile(r'(?<![\d.,+])([1-9]\d{0,2}(?:([.,])\d{3})(?:\2\d{3}){0,2}|[1-9]\d{5,9})(?![\d.,]?\d)')
+PRICE_UNITS = {"tỷ": 1_000_000_000, "ty": 1_000_000_000, "triệu": 1_000_000, "trieu": 1_000_000,
+               "tr": 1_000_000, "củ": 1_000_000, "cu": 1_000_000}
+MIN_PRICE = 100_000
+
+AREA_PATTERN = re.compile(
+    r'(?<![\d.,])(\d+(?:[.,]\d+)?)\s*(?:m2|m²|m\^2|mét\s+vuông|met\s+vuong|m\s+vuông|m\s+vuong)(?![^\W\d_])'
+)
+# A plain "m" is ambiguous ("cách biển 500m"), so it only counts after an area keyword; this also
+# catches "m²" after the superscript was stripped
+AREA_KEYWORD_PATTERN = re.compile(
+    r'(?:dt|diện\s+tích|dien\s+tich|s\s*=|rộng|rong|phòng|phong)\s*:?\s*(\d+(?:[.,]\d+)?)\s*m(?![^\W\d_]|\s*[x×*])'
+)
+# "4x5m", "4 x 5 m", "4m x 5m"
+DIMENSIONS_PATTERN = re.compile(r'(?<![\d.,])(\d+(?:[.,]\d+)?)\s*m?\s*[x×*]\s*(\d+(?:[.,]\d+)?)\s*m(?![^\W\d_])')
+# A bare number is an area only when it is the whole text (the web detail page's area field)
+BARE_NUMBER_PATTERN = re.compile(r'\s*(\d+(?:[.,]\d+)?)\s*(?:m|m2|m²)?\s*')
+
+# 0 / 84 / +84 and nine more digits (ten for 11-digit landlines), in any grouping; zeros may be typed as O
+CONTACT_PATTERN = re.compile(r'(?<![\w+])(\+?84|[0O])((?:[\s.\-]{0,2}[\dO]){9,10}?)(?![\dO])', re.IGNORECASE)
+CONTACT_DIGITS_PATTERN = re.compile(r'[\dO]', re.IGNORECASE)
+
+
+class ParsedListing(NamedTuple):
+    """Fields read from a listing's text; None (or no amenities) where the text holds nothing."""
+    price: Optional[int]
+    area: Optional[float]
+    district: Optional[str]
+    ward: Optional[str]
+    address: Optional[str]
+    amenities: List[str]
+    contact: Optional[str]
+
+
+def _normalize(text: str) -> str:
+    """NFC and lowercase, so decomposed accents and upper case match the same patterns."""
+    return unicodedata.normalize("NFC", text).lower()
+
+
+def _number(text: str) -> float:
+    return float(text.replace(',', '.'))
+
+
+class ListingParser:
+    """Price, area, location, street, amenity and contact extraction shared by both scrapers.
+
+    Every pattern is compiled once, here or at import: the fixed price/area/
+    contact patterns at module level and the config.json ones (districts and
+    wards, ~1,900 streets, amenities) when the parser is built. Parsing keeps
+    no state, so one parser can be shared by any number of threads. A parser
+    pickles as its config and is rebuilt on the other side, so it can be
+    handed to worker processes; forked workers simply inherit it.
+    """
+
+    def __init__(self, config: Optional[Dict] = None):
+        self.config = config or {}
+        self.gazetteer = Gazetteer.from_config(self.config)
+        self.street_index = StreetIndex(self.config.get("streets", []))
+        self.amenity_tagger = AmenityTagger.from_config(self.config)
+
+    @classmethod
+    def from_file(cls, config_file: str) -> "ListingParser":
+        """Build a parser from config.json; a missing or broken file gives a parser without place names."""
+        try:
+            with open(config_file, 'r', encoding='utf-8') as f:
+                return cls(json.load(f))
+        except Exception as e:
+            logger.error(f"Error loading config file {config_file}: {str(e)}")
+            return cls({})
+
+    def __reduce__(self):
+        return self.__class__, (self.config,)
+
+    def parse_price(self, text: str) -> Optional[int]:
+        """Monthly price in VND from a price field or a whole post, or None."""
+        if not text:
+            return None
+        text = _normalize(text)
+        match = PRICE_UNIT_PATTERN.search(text)
+        if match:
+            number, unit, decimals = match.groups()
+            value = _number(number)
+            if decimals and not any(sep in number for sep in ".,"):
+                value += int(decimals) / 10 ** len(decimals)
+            return int(round(value * PRICE_UNITS[unit]))
+        for match in PRICE_THOUSANDS_PATTERN.finditer(text):
+            value = int(match.group(1)) * 1000
+            if value >= MIN_PRICE * 5:
+                return value
+        for match in PRICE_VND_PATTERN.finditer(text):
+            value = int(re.sub(r'[.,]', '', match.group(1)))
+            if value >= MIN_PRICE:
+                return value
+        return None
+
+    def parse_area(self, text: str) -> Optional[float]:
+        """Area in m² ("25 m²", "25,5m2", "4x5m" -> 20.0), or None."""
+        if not text:
+            return None
+        text = _normalize(text)
+        match = AREA_PATTERN.search(text)
+        if match:
+            return _number(match.group(1))
+        match = DIMENSIONS_PATTERN.search(text)
+        if match:
+            return _number(match.group(1)) * _number(match.group(2))
+        match = AREA_KEYWORD_PATTERN.search(text)
+        if match:
+            return _number(match.group(1))
+        match = BARE_NUMBER_PATTERN.fullmatch(text)
+        return _number(match.group(1)) if match else None
+
+    def parse_location(self, text: str) -> Tuple[Optional[str], Optional[str]]:
+        """(district, ward) named in the text."""
+        return self.gazetteer.resolve(text)
+
+    def parse_address(self, text: str) -> Optional[str]:
+        """The first street mentioned, with its house number, or None."""
+        return self.street_index.find(text) or None
+
+    def parse_amenities(self, text: str) -> List[str]:
+        """Amenity labels matched in the text, in config order."""
+        return self.amenity_tagger.tag(text)
+
+    def parse_contact(self, text: str) -> Optional[str]:
+        """First phone number as plain digits in 0xxx form ("+84 905 123 456" -> "0905123456"), or None."""
+        if not text:
+            return None
+        for match in CONTACT_PATTERN.finditer(text):
+            # Both a leading 0 and the 84 country code stand for the same 0 prefix
+            number = "0" + "".join(CONTACT_DIGITS_PATTERN.findall(match.group(2))).replace('O', '0').replace('o', '0')
+            if len(number) == 10 or (len(number) == 11 and number.startswith("02")):
+                return number
+        return None
+
+    def parse(self, text: str) -> ParsedListing:
+        """Every field of one listing's text."""
+        return self._parse(text, self.parse_amenities(text))
+
+    def _parse(self, text: str, amenities: List[str]) -> ParsedListing:
+        district, ward = self.parse_location(text)
+        return ParsedListing(
+            price=self.parse_price(text),
+            area=self.parse_area(text),
+            district=district,
+            ward=ward,
+            address=self.parse_address(text),
+            amenities=amenities,
+            contact=self.parse_contact(text),
+        )
+
+    def parse_many(self, texts: Iterable[str]) -> List[ParsedListing]:
+        """Parse a batch; amenities are tagged in one pass over the batch."""
+        texts = [text or "" for text in texts]
+        amenities = self.amenity_tagger.labels_from_matrix(self.amenity_tagger.tag_matrix(texts))
+        return [self._parse(text, labels) for text, labels in zip(texts, amenities)]
+
+
+# The parser of this worker process, for ProcessPoolExecutor parse stages (see parse_pipeline.py)
+_worker_parser: Optional[ListingParser] = None
+
+
+def init_worker(parser: ListingParser):
+    """Pool initializer: keep one parser per worker process instead of shipping it with every task."""
+    global _worker_parser
+    _worker_parser = parser
+
+
+def parse_in_worker(text: str) -> ParsedListing:
+    """ListingParser.parse() with the parser init_worker installed in this process."""
+    return _worker_parser.parse(text or "")
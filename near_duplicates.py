@@ -0,0 +1,217 @@
+import csv
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS listings (
+    doc INTEGER PRIMARY KEY,
+    post_id TEXT NOT NULL UNIQUE,
+    canonical_id TEXT NOT NULL,
+    signature BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS listing_bands (
+    key INTEGER NOT NULL,
+    doc INTEGER NOT NULL,
+    PRIMARY KEY (key, doc)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS listings_canonical ON listings(canonical_id);
+CREATE TABLE IF NOT EXISTS seeded_csvs (
+    path TEXT PRIMARY KEY
+);
+"""
+
+WORD_PATTERN = re.compile(r"\w+")
+# "0905 123 456" and "0905.123.456" are the same phone number as "0905123456"
+DIGIT_GROUP_PATTERN = re.compile(r"(?<=\d)[\s.]+(?=\d{3}\b)")
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+
+def shingles(text: str) -> List[str]:
+    """Word bigrams of the normalized text; emoji and punctuation are dropped."""
+    text = DIGIT_GROUP_PATTERN.sub("", unicodedata.normalize("NFC", text.lower()))
+    words = WORD_PATTERN.findall(text)
+    if len(words) < 2:
+        return words
+    return [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+class NearDuplicateIndex:
+    """MinHash LSH index that clusters reposted listings under one canonical post ID.
+
+    A repost with a new price, an emoji or a reworded line gets a new MD5
+    postID, but its word-bigram set barely changes. Each post's MinHash
+    signature is split into `bands` bands whose hashes are stored in an
+    indexed SQLite table, so a lookup only compares against posts that share
+    a band, however many posts the index holds. Candidates whose estimated
+    Jaccard similarity reaches `threshold` are near duplicates, and the post
+    joins the cluster of the most similar one. Safe to share between threads.
+
+    num_perm and bands are part of the stored data; changing them needs a new file.
+    """
+
+    def __init__(self, path: str, threshold: float = 0.7, num_perm: int = 64, bands: int = 16, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.path = path
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        rng = np.random.RandomState(seed)
+        # a < 2**31 and x < 2**32 keep a * x + b inside uint64
+        self._a = rng.randint(1, 1 << 31, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, 1 << 31, size=num_perm, dtype=np.uint64)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """MinHash signature of a post's content, or None if it has no words."""
+        features = shingles(text or "")
+        if not features:
+            return None
+        hashes = np.fromiter(
+            (int.from_bytes(hashlib.blake2b(f.encode("utf-8"), digest_size=4).digest(), "little") for f in features),
+            dtype=np.uint64, count=len(features))
+        permuted = (np.outer(self._a, hashes) + self._b[:, None]) % MERSENNE_PRIME & MAX_HASH
+        return permuted.min(axis=1).astype(np.uint32)
+
+    def band_keys(self, signature: np.ndarray) -> List[int]:
+        """One 64-bit key per band; the band number is hashed in, so keys never collide across bands."""
+        keys = []
+        for band in range(self.bands):
+            chunk = bytes([band]) + signature[band * self.rows:(band + 1) * self.rows].tobytes()
+            keys.append(int.from_bytes(hashlib.blake2b(chunk, digest_size=8).digest(), "little", signed=True))
+        return keys
+
+    def _match(self, signature: np.ndarray) -> Optional[Tuple[str, str, float]]:
+        keys = self.band_keys(signature)
+        placeholders = ", ".join("?" * len(keys))
+        candidates = self.conn.execute(
+            f"SELECT post_id, canonical_id, signature FROM listings WHERE doc IN ("
+            f"SELECT doc FROM listing_bands WHERE key IN ({placeholders}))", keys).fetchall()
+        best = None
+        for post_id, canonical_id, blob in candidates:
+            similarity = float(np.mean(np.frombuffer(blob, dtype=np.uint32) == signature))
+            if similarity >= self.threshold and (best is None or similarity > best[2]):
+                best = (post_id, canonical_id, similarity)
+        return best
+
+    def find(self, text: str) -> Optional[Tuple[str, str, float]]:
+        """(post_id, canonical_id, similarity) of the closest indexed near duplicate, if any."""
+        signature = self.signature(text)
+        if signature is None:
+            return None
+        with self._lock:
+            return self._match(signature)
+
+    def _insert(self, post_id: str, canonical_id: str, signature: np.ndarray):
+        doc = self.conn.execute(
+            "INSERT INTO listings (post_id, canonical_id, signature) VALUES (?, ?, ?)",
+            (post_id, canonical_id, signature.tobytes())).lastrowid
+        self.conn.executemany("INSERT OR IGNORE INTO listing_bands (key, doc) VALUES (?, ?)",
+                              [(key, doc) for key in self.band_keys(signature)])
+
+    def add(self, post_id: str, text: str) -> str:
+        """Index a post and return its canonical ID (its own ID unless it reposts an indexed listing)."""
+        signature = self.signature(text)
+        with self._lock:
+            row = self.conn.execute("SELECT canonical_id FROM listings WHERE post_id = ?", (post_id,)).fetchone()
+            if row:
+                return row[0]
+            if signature is None:
+                return post_id
+            match = self._match(signature)
+            canonical_id = match[1] if match else post_id
+            self.conn.execute("BEGIN")
+            try:
+                self._insert(post_id, canonical_id, signature)
+                self.conn.execute("COMMIT")
+            except BaseException:
+                # Leave the connection usable: otherwise every later BEGIN fails inside the open transaction
+                self.conn.execute("ROLLBACK")
+                raise
+        if match:
+            logger.info(f"Post {post_id} is a near duplicate of {match[0]} "
+                        f"(similarity {match[2]:.2f}, listing {canonical_id})")
+        return canonical_id
+
+    def canonical_id(self, post_id: str) -> Optional[str]:
+        with self._lock:
+            row = self.conn.execute("SELECT canonical_id FROM listings WHERE post_id = ?", (post_id,)).fetchone()
+        return row[0] if row else None
+
+    def count(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM listings").fetchone()[0]
+
+    def seed(self, rows: Iterable[tuple], batch_size: int = 1000) -> int:
+        """Cluster (post_id, content) pairs from older runs in one pass; returns posts indexed."""
+        count = 0
+        batch = []
+        for post_id, content in rows:
+            if post_id and content:
+                batch.append((post_id, content))
+            if len(batch) >= batch_size:
+                count += self._seed_batch(batch)
+                batch = []
+        if batch:
+            count += self._seed_batch(batch)
+        return count
+
+    def _seed_batch(self, batch: List[Tuple[str, str]]) -> int:
+        signatures = [(post_id, self.signature(content)) for post_id, content in batch]
+        count = 0
+        with self._lock:
+            self.conn.execute("BEGIN")
+            try:
+                for post_id, signature in signatures:
+                    if signature is None:
+                        continue
+                    if self.conn.execute("SELECT 1 FROM listings WHERE post_id = ?", (post_id,)).fetchone():
+                        continue
+                    match = self._match(signature)
+                    self._insert(post_id, match[1] if match else post_id, signature)
+                    count += 1
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+        return count
+
+    def seed_from_csv(self, csv_path: str) -> int:
+        """One-time clustering of the posts in an existing output CSV."""
+        path = os.path.abspath(csv_path)
+        with self._lock:
+            seeded = self.conn.execute("SELECT 1 FROM seeded_csvs WHERE path = ?", (path,)).fetchone()
+        if seeded or not os.path.exists(csv_path):
+            return 0
+        try:
+            with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+                reader = csv.DictReader(f)
+                count = self.seed((row.get("postID"), row.get("content")) for row in reader)
+            with self._lock:
+                self.conn.execute("INSERT OR IGNORE INTO seeded_csvs (path) VALUES (?)", (path,))
+            logger.info(f"Seeded near-duplicate index with {count} posts from {csv_path}")
+            return count
+        except Exception as e:
+            logger.error(f"Could not seed near-duplicate index from {csv_path}: {str(e)}")
+            return 0
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
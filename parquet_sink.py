@@ -0,0 +1,105 @@
+import logging
+import os
+import threading
+import time
+import uuid
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from post_store import PostStore
+
+logger = logging.getLogger(__name__)
+
+PARTITIONING = ds.partitioning(pa.schema([("source", pa.string()), ("scrape_date", pa.date32())]), flavor="hive")
+
+COLUMNS = ["postID", "time", "content", "address", "ward", "district", "area", "price", "amenities",
+           "contact", "url"]
+
+
+class ParquetSink:
+    """Append posts to a Parquet dataset partitioned by source and scrape date.
+
+    Layout: root/source=web/scrape_date=2025-04-10/part-<time>-<id>.parquet.
+    Posts are buffered in a PostStore and written as a new file every
+    flush_every posts and on close, so existing partitions are never
+    rewritten. Columns are typed (timestamp time, int64 price, float64 area,
+    list<string> amenities) and rows are sorted by district, so reads that
+    filter on district can skip files by their statistics.
+    """
+
+    def __init__(self, root: str, source: str, flush_every: int = 1000):
+        self.root = root
+        self.source = source
+        self.flush_every = max(1, flush_every)
+        self.written = 0
+        self.files = 0
+        self._store = PostStore(keep_text=True)
+        self._lock = threading.Lock()
+
+    def write(self, post: Dict[str, Any]):
+        with self._lock:
+            self._store.append(post, self.source)
+            if len(self._store) >= self.flush_every:
+                self._flush()
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        if not len(self._store):
+            return
+        store, self._store = self._store, PostStore(keep_text=True)
+        table = to_table(store)
+        scrape_date = date.today()
+        directory = os.path.join(self.root, f"source={self.source}", f"scrape_date={scrape_date.isoformat()}")
+        name = f"part-{time.strftime('%H%M%S')}-{uuid.uuid4().hex[:8]}.parquet"
+        path = os.path.join(directory, name)
+        # Dataset discovery skips files starting with "." or "_", so a write cut short is never read back
+        tmp_path = os.path.join(directory, f".{name}.tmp")
+        try:
+            os.makedirs(directory, exist_ok=True)
+            pq.write_table(table, tmp_path, compression="zstd")
+            os.replace(tmp_path, path)
+            self.written += table.num_rows
+            self.files += 1
+        except Exception as e:
+            logger.error(f"Could not write {table.num_rows} posts to {path}: {str(e)}")
+
+    def close(self):
+        self.flush()
+        if self.files:
+            logger.info(f"Wrote {self.written} posts to {self.files} Parquet files under {self.root}")
+
+
+def to_table(store: PostStore) -> pa.Table:
+    """The dataset's file schema: plain string categories, sorted by district."""
+    table = store.to_arrow()
+    table = table.set_column(table.schema.get_field_index("district"), "district",
+                             table.column("district").cast(pa.string()))
+    table = table.set_column(table.schema.get_field_index("ward"), "ward", table.column("ward").cast(pa.string()))
+    table = table.select(COLUMNS)
+    return table.sort_by([("district", "ascending")])
+
+
+def read_posts(root: str, district: Optional[str] = None, source: Optional[str] = None,
+               since: Optional[date] = None, columns: Optional[List[str]] = None) -> pa.Table:
+    """Read the dataset back; source/since prune partitions and district is pushed down to the files."""
+    dataset = ds.dataset(root, format="parquet", partitioning=PARTITIONING)
+    conditions = []
+    if source:
+        conditions.append(pc.field("source") == source)
+    if since:
+        since = since.date() if isinstance(since, datetime) else since
+        conditions.append(pc.field("scrape_date") >= pa.scalar(since, type=pa.date32()))
+    if district:
+        conditions.append(pc.field("district") == district)
+    condition = None
+    for expression in conditions:
+        condition = expression if condition is None else condition & expression
+    return dataset.to_table(columns=columns, filter=condition)
@@ -0,0 +1,214 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import BrokenExecutor, Future, ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from run_metrics import RunMetrics
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+class ParsePipeline:
+    """Browser stage -> bounded queue -> process-pool parse -> sink stage.
+
+    Browser threads only call put(raw, meta), which blocks while `queue_size`
+    items are already waiting, so a slow parse or sink pushes back on the
+    browsers instead of piling up pages in memory. A dispatcher thread hands
+    queued items to `workers` processes, with at most `max_in_flight` items
+    between the queue and the end of the sink, and a sink thread calls
+    handle(meta, parse(raw)) in put() order. put(None, meta) skips the pool
+    and calls handle(meta, None) in turn, for items already parsed elsewhere.
+
+    parse must be a module-level function (it is pickled to the workers);
+    initializer(*initargs) runs once in each worker, e.g. to build a parser.
+    close() lets everything already put through, then stops the threads and
+    the pool. depths() shows how many items wait at each stage. workers=0
+    parses and handles inline on the calling thread, one caller at a time.
+    """
+
+    LOG_INTERVAL = 30   # seconds between depth lines in the log while busy
+
+    def __init__(self, parse: Callable[[Any], Any], handle: Callable[[Any, Any], None], workers: int = 2,
+                 queue_size: int = 100, max_in_flight: int = 0, initializer: Optional[Callable] = None,
+                 initargs: Tuple = (), metrics: Optional[RunMetrics] = None):
+        self.parse = parse
+        self.handle = handle
+        self.workers = max(0, workers)
+        self.queue_size = max(1, queue_size)
+        self.max_in_flight = max_in_flight or self.workers * 2
+        self.metrics = metrics or RunMetrics(enabled=False)
+
+        self.put_count = 0
+        self.parsed = 0
+        self.handled = 0
+        self.failed = 0
+        self.put_wait = 0.0
+        self.peak_depths = {"queue": 0, "parse": 0, "sink": 0}
+        self._closed = False
+        self._lock = threading.Lock()
+        self._inline_lock = threading.Lock()
+        self._last_log = time.monotonic()
+
+        self._pool = None
+        if not self.workers:
+            if initializer:
+                initializer(*initargs)
+            return
+        self._queue: "queue.Queue" = queue.Queue(maxsize=self.queue_size)
+        self._results: "queue.Queue" = queue.Queue()
+        self._slots = threading.Semaphore(self.max_in_flight)
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=initializer, initargs=initargs)
+        # Start the workers now: forking later, with the crawl's threads running, risks inheriting a held lock
+        self._pool.submit(int).result()
+        self._dispatcher = threading.Thread(target=self._dispatch, name="parse-dispatch", daemon=True)
+        self._sink = threading.Thread(target=self._drain, name="parse-sink", daemon=True)
+        self._dispatcher.start()
+        self._sink.start()
+        logger.info(f"Parse pipeline started: {self.workers} workers, queue of {self.queue_size}, "
+                    f"{self.max_in_flight} in flight")
+
+    def put(self, raw: Any, meta: Any = None):
+        """Queue one raw item for parsing; blocks while the queue is full."""
+        if self._closed:
+            raise RuntimeError("Parse pipeline is closed")
+        if not self.workers:
+            with self._inline_lock:
+                with self._lock:
+                    self.put_count += 1
+                future = self._parse_inline(raw)
+                self._parsed(future)
+                self._finish(raw, meta, future)
+            return
+        started = time.perf_counter()
+        self._queue.put((raw, meta))
+        waited = time.perf_counter() - started
+        self.metrics.observe("parse_queue_wait", waited)
+        with self._lock:
+            self.put_count += 1
+            self.put_wait += waited
+            self._track()
+
+    def depths(self) -> Dict[str, int]:
+        """Items waiting for a worker (queue), being parsed (parse) and parsed but not yet handled (sink)."""
+        with self._lock:
+            return self._depths()
+
+    def _depths(self) -> Dict[str, int]:
+        queued = self._queue.qsize() if self.workers else 0
+        done = self.handled + self.failed
+        parsing = self.put_count - queued - self.parsed
+        return {"queue": queued, "parse": max(0, parsing), "sink": max(0, self.parsed - done)}
+
+    def _track(self):
+        for stage, depth in self._depths().items():
+            if depth > self.peak_depths[stage]:
+                self.peak_depths[stage] = depth
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queue_size": self.queue_size,
+                "max_in_flight": self.max_in_flight,
+                "items": self.put_count,
+                "handled": self.handled,
+                "failed": self.failed,
+                "put_wait_seconds": round(self.put_wait, 3),
+                "depths": self._depths(),
+                "peak_depths": dict(self.peak_depths),
+            }
+
+    def _parse_inline(self, raw: Any) -> Future:
+        future = Future()
+        try:
+            future.set_result(None if raw is None else self.parse(raw))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def _parsed(self, future: Future):
+        with self._lock:
+            self.parsed += 1
+            self._track()
+
+    def _dispatch(self):
+        while True:
+            item = self._queue.get()
+            if item is _DONE:
+                self._results.put(_DONE)
+                return
+            raw, meta = item
+            # A slot is only given back once the sink has handled the item, so a slow sink backs up to put()
+            self._slots.acquire()
+            if raw is None:
+                future = self._parse_inline(None)
+                self._parsed(future)
+            else:
+                try:
+                    submitted = time.perf_counter()
+                    future = self._pool.submit(self.parse, raw)
+                    future.add_done_callback(
+                        lambda f, t=submitted: self.metrics.observe("parse_pool", time.perf_counter() - t))
+                    future.add_done_callback(self._parsed)
+                except BrokenExecutor as e:
+                    logger.error(f"Parse workers are gone, parsing inline: {str(e)}")
+                    future = self._parse_inline(raw)
+                    self._parsed(future)
+            self._results.put((future, raw, meta))
+
+    def _drain(self):
+        while True:
+            item = self._results.get()
+            if item is _DONE:
+                return
+            future, raw, meta = item
+            try:
+                self._finish(raw, meta, future)
+            finally:
+                self._slots.release()
+            if time.monotonic() - self._last_log >= self.LOG_INTERVAL:
+                self._last_log = time.monotonic()
+                logger.info(f"Parse pipeline depths: {self.depths()}")
+
+    def _finish(self, raw: Any, meta: Any, future: Future):
+        try:
+            try:
+                parsed = future.result()
+            except BrokenExecutor as e:
+                # A worker died (killed or out of memory); the item itself is fine
+                logger.error(f"Parse worker died, parsing inline: {str(e)}")
+                parsed = self._parse_inline(raw).result()
+            self.handle(meta, parsed)
+        except Exception as e:
+            self._fail(e)
+            return
+        with self._lock:
+            self.handled += 1
+
+    def _fail(self, error: Exception):
+        logger.error(f"Error parsing or saving an item: {str(error)}")
+        self.metrics.count("parse_failed")
+        with self._lock:
+            self.failed += 1
+
+    def close(self):
+        """Let every queued item through the parse and sink stages, then stop the threads and workers."""
+        if self._closed:
+            return
+        self._closed = True
+        if self.workers:
+            self._queue.put(_DONE)
+            self._dispatcher.join()
+            self._sink.join()
+            self._pool.shutdown(wait=True)
+        logger.info(f"Parse pipeline closed: {self.stats()}")
+
+    def __enter__(self) -> "ParsePipeline":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
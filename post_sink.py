@@ -0,0 +1,194 @@
+import csv
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from near_duplicates import NearDuplicateIndex
+from parquet_sink import ParquetSink
+from seen_index import SeenIndex
+
+logger = logging.getLogger(__name__)
+
+
+class PostSink:
+    """Append posts to a CSV as they arrive and upsert them to the database in batches.
+
+    Only the header of an existing CSV is read, and at most one DB batch is held
+    in memory, so a run costs the same however large the output file has grown.
+    Posts already in the seen index (or, without one, in the CSV) are skipped.
+    With a near-duplicate index every new post is clustered under a canonical
+    listing ID, and reposts of a known listing are skipped too unless
+    skip_near_duplicates is off. With a ParquetSink, new posts are also
+    appended to the typed Parquet dataset. Safe to share between scraper threads.
+    """
+
+    def __init__(self, csv_path: str, fieldnames: Optional[List[str]] = None, source: str = "web",
+                 seen_index: Optional[SeenIndex] = None,
+                 db_writer: Optional[Callable[[List[Dict[str, Any]]], bool]] = None,
+                 db_batch_size: int = 500, csv_flush_every: int = 1, db_flush_interval: float = 60,
+                 near_duplicates: Optional[NearDuplicateIndex] = None, skip_near_duplicates: bool = True,
+                 parquet: Optional[ParquetSink] = None):
+        self.csv_path = csv_path
+        self.fieldnames = fieldnames
+        self.source = source
+        self.seen_index = seen_index
+        self.db_writer = db_writer
+        self.db_batch_size = max(1, db_batch_size)
+        self.csv_flush_every = max(1, csv_flush_every)
+        self.db_flush_interval = db_flush_interval
+        self.near_duplicates = near_duplicates
+        self.skip_near_duplicates = skip_near_duplicates
+        self.parquet = parquet
+
+        self.written = 0
+        self.skipped = 0
+        self.db_rows = 0
+        self.reposts = 0
+        self._file = None
+        self._writer = None
+        self._unflushed: List[Dict[str, Any]] = []
+        self._pending_ids = set()
+        self._db_queue: List[Dict[str, Any]] = []
+        self._last_db_flush = time.monotonic()
+        self._existing_ids = None
+        self._lock = threading.RLock()
+
+        if self.seen_index:
+            self.seen_index.seed_from_csv(csv_path, source)
+        else:
+            self._existing_ids = self._read_existing_ids()
+        if self.near_duplicates:
+            self.near_duplicates.seed_from_csv(csv_path)
+
+    def _read_existing_ids(self) -> set:
+        """Fallback without a seen index: the post IDs already in the CSV."""
+        if not os.path.exists(self.csv_path):
+            return set()
+        try:
+            with open(self.csv_path, 'r', encoding='utf-8', newline='') as f:
+                ids = {row.get('postID') for row in csv.DictReader(f) if row.get('postID')}
+            logger.info(f"Found {len(ids)} existing posts in {self.csv_path}")
+            return ids
+        except Exception as e:
+            logger.warning(f"Could not read existing CSV file: {str(e)}")
+            return set()
+
+    def _open(self, first_row: Dict[str, Any]):
+        existing_header = None
+        if os.path.exists(self.csv_path):
+            with open(self.csv_path, 'r', encoding='utf-8', newline='') as f:
+                existing_header = next(csv.reader(f), None)
+        # Appending keeps the file's own columns
+        fieldnames = existing_header or self.fieldnames or list(first_row.keys())
+        self._file = open(self.csv_path, 'a' if existing_header else 'w', encoding='utf-8', newline='')
+        self._writer = csv.DictWriter(self._file, fieldnames=fieldnames, extrasaction='ignore')
+        if not existing_header:
+            self._writer.writeheader()
+
+    def is_new(self, post_id: str) -> bool:
+        with self._lock:
+            if not post_id or post_id in self._pending_ids:
+                return False
+            if self.seen_index:
+                return not self.seen_index.has_post(post_id)
+            return post_id not in self._existing_ids
+
+    def write(self, post: Dict[str, Any]) -> bool:
+        """Persist one post; returns False if it was already saved."""
+        with self._lock:
+            post_id = post.get('postID')
+            if not self.is_new(post_id):
+                self.skipped += 1
+                if self.seen_index and post_id and post.get('url'):
+                    self.seen_index.record(post_id, self.source, post['url'])
+                return False
+            if self._is_repost(post):
+                return False
+
+            if self._writer is None:
+                self._open(post)
+            row = {key: json.dumps(value, ensure_ascii=False) if isinstance(value, list) else value
+                   for key, value in post.items()}
+            self._writer.writerow(row)
+            self._pending_ids.add(post_id)
+            self._unflushed.append(post)
+            self.written += 1
+            if len(self._unflushed) >= self.csv_flush_every:
+                self.flush_csv()
+            if self.parquet:
+                self.parquet.write(post)
+
+            if self.db_writer:
+                self._db_queue.append(post)
+                if (len(self._db_queue) >= self.db_batch_size
+                        or time.monotonic() - self._last_db_flush >= self.db_flush_interval):
+                    self.flush_db()
+            return True
+
+    def _is_repost(self, post: Dict[str, Any]) -> bool:
+        """Cluster a new post; True if it reposts a known listing and should not be saved again."""
+        if not self.near_duplicates or not post.get('content'):
+            return False
+        post_id = post['postID']
+        if self.near_duplicates.add(post_id, post['content']) == post_id:
+            return False
+        self.reposts += 1
+        if not self.skip_near_duplicates:
+            return False
+        self.skipped += 1
+        if self.seen_index:
+            self.seen_index.record(post_id, self.source, post.get('url'))
+        elif self._existing_ids is not None:
+            self._existing_ids.add(post_id)
+        return True
+
+    def flush_csv(self):
+        """Flush written rows to disk, then mark them seen."""
+        with self._lock:
+            if self._file:
+                self._file.flush()
+            for post in self._unflushed:
+                if self.seen_index:
+                    self.seen_index.record(post['postID'], self.source, post.get('url'))
+                elif self._existing_ids is not None:
+                    self._existing_ids.add(post['postID'])
+            self._unflushed = []
+            self._pending_ids.clear()
+
+    def flush_db(self):
+        """Upsert the queued posts in one batch."""
+        with self._lock:
+            self._last_db_flush = time.monotonic()
+            if not self._db_queue:
+                return
+            batch, self._db_queue = self._db_queue, []
+            try:
+                if self.db_writer(batch):
+                    self.db_rows += len(batch)
+                else:
+                    logger.error(f"Database upsert of {len(batch)} posts failed; they remain in {self.csv_path}")
+            except Exception as e:
+                logger.error(f"Database upsert of {len(batch)} posts failed: {str(e)}")
+
+    def close(self):
+        with self._lock:
+            self.flush_csv()
+            if self._file:
+                self._file.close()
+                self._file = None
+                self._writer = None
+            if self.parquet:
+                self.parquet.close()
+            if self.db_writer:
+                self.flush_db()
+            logger.info(f"Saved {self.written} new posts to {self.csv_path} "
+                        f"(skipped {self.skipped} existing, {self.reposts} reposts of known listings)")
+
+    def __enter__(self) -> "PostSink":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,264 @@
+import csv
+import json
+import logging
+import math
+from array import array
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MISSING_PRICE = -1
+# Post times are naive local times; they are stored as seconds since this naive epoch
+EPOCH = datetime(1970, 1, 1)
+
+
+class Categories:
+    """Interned strings: each distinct value is stored once and rows keep a small integer code."""
+
+    def __init__(self):
+        self.values: List[str] = []
+        self._codes: Dict[str, int] = {}
+
+    def code(self, value: Optional[str]) -> int:
+        """Code for value; 0 is reserved for empty/missing."""
+        if not value:
+            return 0
+        code = self._codes.get(value)
+        if code is None:
+            self.values.append(value)
+            code = self._codes[value] = len(self.values)
+        return code
+
+    def value(self, code: int) -> Optional[str]:
+        return self.values[code - 1] if code else None
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+def _parse_amenities(value: Any) -> List[str]:
+    """Amenities as written to CSV: a JSON list, or the older comma-separated string."""
+    if isinstance(value, list):
+        return value
+    if not value:
+        return []
+    if value.startswith("["):
+        try:
+            return json.loads(value)
+        except ValueError:
+            pass
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def _parse_number(value: Any) -> float:
+    if value is None or value == "":
+        return math.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _parse_time(value: Any) -> float:
+    if not value:
+        return math.nan
+    try:
+        moment = value if isinstance(value, datetime) else datetime.fromisoformat(str(value))
+        return (moment.replace(tzinfo=None) - EPOCH).total_seconds()
+    except ValueError:
+        return math.nan
+
+
+class PostStore:
+    """Column-oriented container for many posts with a small per-post footprint.
+
+    District, ward, source and amenity labels are interned and stored as
+    integer codes; price, area and time live in typed arrays. Post IDs (MD5
+    hex) take 16 bytes each. Free text (content, address, contact, url) is only
+    kept with keep_text=True. Rows can be read back as dicts, and the columns
+    convert to pandas or Arrow without a per-row Python loop.
+    """
+
+    def __init__(self, keep_text: bool = False):
+        self.keep_text = keep_text
+        self.districts = Categories()
+        self.wards = Categories()
+        self.sources = Categories()
+        self.amenities = Categories()
+        self._ids = bytearray()
+        self._time = array('d')
+        self._price = array('q')
+        self._area = array('d')
+        self._district = array('H')
+        self._ward = array('H')
+        self._source = array('B')
+        self._amenity_codes = array('H')
+        self._amenity_offsets = array('I', [0])
+        self._text: Dict[str, List[Optional[str]]] = {"content": [], "address": [], "contact": [], "url": []}
+        self._sorted_ids: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self._price)
+
+    def append(self, post: Dict[str, Any], source: Optional[str] = None):
+        """Add one post dict (scraper output or a CSV row)."""
+        post_id = post.get("postID") or ""
+        try:
+            digest = bytes.fromhex(post_id)
+        except ValueError:
+            digest = b""
+        self._ids += digest[:16].ljust(16, b"\0")
+        self._time.append(_parse_time(post.get("time") or post.get("postDate")))
+        price = _parse_number(post.get("price"))
+        self._price.append(MISSING_PRICE if math.isnan(price) else int(price))
+        self._area.append(_parse_number(post.get("area")))
+        self._district.append(self.districts.code(post.get("district")))
+        self._ward.append(self.wards.code(post.get("ward")))
+        self._source.append(self.sources.code(source or post.get("source")))
+        for amenity in _parse_amenities(post.get("amenities")):
+            self._amenity_codes.append(self.amenities.code(amenity))
+        self._amenity_offsets.append(len(self._amenity_codes))
+        if self.keep_text:
+            for key, column in self._text.items():
+                column.append(post.get(key))
+        self._sorted_ids = None
+
+    def extend(self, posts: Iterable[Dict[str, Any]], source: Optional[str] = None) -> "PostStore":
+        for post in posts:
+            self.append(post, source)
+        return self
+
+    @classmethod
+    def from_posts(cls, posts: Iterable[Dict[str, Any]], source: Optional[str] = None,
+                   keep_text: bool = False) -> "PostStore":
+        return cls(keep_text).extend(posts, source)
+
+    @classmethod
+    def from_csv(cls, csv_path: str, source: Optional[str] = None, keep_text: bool = False) -> "PostStore":
+        """Stream an output CSV into a store without holding its rows as dicts."""
+        store = cls(keep_text)
+        with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+            store.extend(csv.DictReader(f), source)
+        logger.info(f"Loaded {len(store)} posts from {csv_path}")
+        return store
+
+    def post_id(self, i: int) -> str:
+        return self._ids[i * 16:(i + 1) * 16].hex()
+
+    def row(self, i: int) -> Dict[str, Any]:
+        price = self._price[i]
+        start, end = self._amenity_offsets[i], self._amenity_offsets[i + 1]
+        row = {
+            "postID": self.post_id(i),
+            "time": None if math.isnan(self._time[i]) else EPOCH + timedelta(seconds=self._time[i]),
+            "district": self.districts.value(self._district[i]),
+            "ward": self.wards.value(self._ward[i]),
+            "price": None if price == MISSING_PRICE else price,
+            "area": None if math.isnan(self._area[i]) else self._area[i],
+            "amenities": [self.amenities.value(code) for code in self._amenity_codes[start:end]],
+            "source": self.sources.value(self._source[i]),
+        }
+        if self.keep_text:
+            row.update({key: column[i] for key, column in self._text.items()})
+        return row
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(len(self)):
+            yield self.row(i)
+
+    def __contains__(self, post_id: str) -> bool:
+        """Binary search over the sorted IDs (sorted once after the last append)."""
+        if not post_id:
+            return False
+        try:
+            key = np.frombuffer(bytes.fromhex(post_id)[:16].ljust(16, b"\0"), dtype="S16")[0]
+        except ValueError:
+            return False
+        if self._sorted_ids is None:
+            self._sorted_ids = np.sort(np.frombuffer(bytes(self._ids), dtype="S16"))
+        i = np.searchsorted(self._sorted_ids, key)
+        return i < len(self._sorted_ids) and self._sorted_ids[i] == key
+
+    def prices(self) -> np.ndarray:
+        """Known prices (VND) as an int64 array."""
+        prices = np.frombuffer(self._price, dtype=np.int64)
+        return prices[prices != MISSING_PRICE]
+
+    def district_counts(self) -> Dict[str, int]:
+        """Posts per district, most common first; posts without a district are not counted."""
+        counts = np.bincount(np.frombuffer(self._district, dtype=np.uint16), minlength=len(self.districts) + 1)
+        order = np.argsort(-counts[1:], kind="stable")
+        return {self.districts.values[i]: int(counts[i + 1]) for i in order if counts[i + 1]}
+
+    def _categorical(self, codes: array, categories: Categories):
+        import pandas as pd
+        return pd.Categorical.from_codes(np.frombuffer(codes, dtype=codes.typecode).astype(np.int32) - 1,
+                                         categories=categories.values)
+
+    def to_pandas(self):
+        """DataFrame with categorical district/ward/source, nullable price and a list column for amenities."""
+        import pandas as pd
+        if not len(self):
+            return pd.DataFrame(columns=["postID", "time", "district", "ward", "price", "area", "amenities", "source"])
+        prices = np.frombuffer(self._price, dtype=np.int64)
+        frame = pd.DataFrame({
+            "postID": self._hex_ids(),
+            "time": pd.to_datetime(np.frombuffer(self._time, dtype=np.float64), unit="s"),
+            "district": self._categorical(self._district, self.districts),
+            "ward": self._categorical(self._ward, self.wards),
+            "price": pd.arrays.IntegerArray(prices.copy(), prices == MISSING_PRICE),
+            "area": np.frombuffer(self._area, dtype=np.float64),
+            "amenities": self._amenity_lists().to_pandas(),
+            "source": self._categorical(self._source, self.sources),
+        })
+        if self.keep_text:
+            for key, column in self._text.items():
+                frame[key] = column
+        return frame
+
+    def _hex_ids(self) -> List[str]:
+        return [value.ljust(16, b"\0").hex() for value in np.frombuffer(bytes(self._ids), dtype="S16")]
+
+    def _amenity_lists(self):
+        import pyarrow as pa
+        values = pa.array(self.amenities.values, type=pa.string()).take(
+            pa.array(np.frombuffer(self._amenity_codes, dtype=np.uint16).astype(np.int32) - 1))
+        offsets = pa.array(np.frombuffer(self._amenity_offsets, dtype=np.uint32).astype(np.int32))
+        return pa.ListArray.from_arrays(offsets, values)
+
+    def _dictionary(self, codes: array, categories: Categories):
+        import pyarrow as pa
+        indices = pa.array(np.frombuffer(codes, dtype=codes.typecode).astype(np.int32) - 1,
+                           mask=np.frombuffer(codes, dtype=codes.typecode) == 0)
+        return pa.DictionaryArray.from_arrays(indices, pa.array(categories.values, type=pa.string()))
+
+    def to_arrow(self):
+        """pyarrow Table; categories become dictionary arrays and amenities a list<string> column."""
+        import pyarrow as pa
+        times = np.frombuffer(self._time, dtype=np.float64)
+        prices = np.frombuffer(self._price, dtype=np.int64)
+        areas = np.frombuffer(self._area, dtype=np.float64)
+        columns = {
+            "postID": pa.array(self._hex_ids(), type=pa.string()),
+            "time": pa.array(np.nan_to_num(times * 1e6).astype(np.int64), type=pa.timestamp("us"),
+                             mask=np.isnan(times)),
+            "district": self._dictionary(self._district, self.districts),
+            "ward": self._dictionary(self._ward, self.wards),
+            "price": pa.array(prices, mask=prices == MISSING_PRICE),
+            "area": pa.array(areas, mask=np.isnan(areas)),
+            "amenities": self._amenity_lists(),
+            "source": self._dictionary(self._source, self.sources),
+        }
+        if self.keep_text:
+            for key, column in self._text.items():
+                columns[key] = pa.array(column, type=pa.string())
+        return pa.table(columns)
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the columns (excluding kept free text)."""
+        arrays = [self._time, self._price, self._area, self._district, self._ward, self._source,
+                  self._amenity_codes, self._amenity_offsets]
+        return len(self._ids) + sum(a.itemsize * len(a) for a in arrays)
@@ -0,0 +1,248 @@
+"""Re-derive parsed fields from stored content without launching a browser.
+
+Streams an existing CSV (or the MySQL `post` table) through the current
+config.json patterns in fixed-size chunks, fanned out over a process pool.
+At most two chunks per worker are in flight, so memory stays bounded
+regardless of file size.
+
+    python reparse.py scrapData.csv                  # FB CSV, rewritten in place
+    python reparse.py phongtro_data.csv -o out.csv   # web CSV, to a new file
+    python reparse.py --from-db --source fb          # UPDATE rows of `post`
+
+Both scrapers upsert into the same `post` table, which does not record
+where a row came from, so --from-db only touches the rows the seen index
+(--seen-index) lists under --source.
+"""
+import argparse, json, logging, os, time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional
+
+import mysql.connector
+import pandas as pd
+from dotenv import load_dotenv
+
+from amenity_tagger import AmenityTagger
+from gazetteer import Gazetteer
+from Scrapping_FB import PostParser
+from seen_index import SeenIndex
+
+logger = logging.getLogger("reparse")
+
+FB_FIELDS = ["area", "district", "ward", "address", "amenities", "price", "contact"]
+
+# Largest value the `price` INT column holds (Scrapping_Web.MAX_DB_PRICE; importing it would reset that scraper's log)
+MAX_DB_PRICE = 2_147_483_647
+
+# Per-process parsers, built once by _init_worker.
+_fb_parser: Optional[PostParser] = None
+_gazetteer: Optional[Gazetteer] = None
+_amenity_tagger: Optional[AmenityTagger] = None
+
+
+def _init_worker(config_file: str):
+    global _fb_parser, _gazetteer, _amenity_tagger
+    _fb_parser = PostParser(config_file, logger)
+    _gazetteer = _fb_parser.gazetteer
+    _amenity_tagger = _fb_parser.amenity_tagger
+
+
+def detect_source(columns: List[str]) -> str:
+    """Tell FB exports (postDate) from phongtro123 exports (time)."""
+    return "fb" if "postDate" in columns else "web"
+
+
+def _reparse_web_amenities(content: str, stored: str) -> str:
+    """Re-tag content; stored DOM amenities are kept, re-labelled where a pattern now matches."""
+    try:
+        previous = json.loads(stored) if stored else []
+    except (TypeError, ValueError):
+        previous = []
+    amenities = _amenity_tagger.tag(content)
+    for item in previous:
+        label = _amenity_tagger.first(item) or item
+        if label not in amenities:
+            amenities.append(label)
+    return json.dumps(amenities, ensure_ascii=False)
+
+
+def reparse_chunk(chunk: pd.DataFrame, source: str) -> pd.DataFrame:
+    """Recompute derived columns of one chunk of rows."""
+    chunk = chunk.copy()
+    contents = chunk["content"].fillna("").astype(str)
+
+    if source == "fb":
+        details = [_fb_parser.parse_property_details(content) for content in contents]
+        for field in FB_FIELDS:
+            chunk[field] = [d[field] for d in details]
+        return chunk
+
+    # Web price/area come from dedicated page elements that are not stored,
+    # so only the text-derived fields can be refreshed.
+    locations = [_gazetteer.resolve(address) for address in chunk["address"].fillna("").astype(str)]
+    chunk["district"] = [d or "" for d, _ in locations]
+    chunk["ward"] = [w or "" for _, w in locations]
+    chunk["amenities"] = [
+        _reparse_web_amenities(content, stored)
+        for content, stored in zip(contents, chunk["amenities"].fillna("").astype(str))
+    ]
+    return chunk
+
+
+def _map_in_order(chunks: Iterator[pd.DataFrame], source: str, workers: int, config_file: str) -> Iterator[pd.DataFrame]:
+    """Reparse chunks across a process pool, yielding results in input order."""
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(config_file,)) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(reparse_chunk, chunk, source))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def reparse_csv(path: str, output: Optional[str], source: Optional[str], chunksize: int,
+                workers: int, config_file: str) -> int:
+    """Rewrite derived columns of a CSV; returns the number of rows processed."""
+    if source is None:
+        source = detect_source(list(pd.read_csv(path, nrows=0).columns))
+    output = output or path
+    tmp_path = output + ".reparse.tmp"
+
+    reader = pd.read_csv(path, chunksize=chunksize, dtype=str, keep_default_na=False, encoding='utf-8')
+    rows = 0
+    try:
+        with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+            for i, chunk in enumerate(_map_in_order(reader, source, workers, config_file)):
+                chunk.to_csv(f, header=(i == 0), index=False)
+                rows += len(chunk)
+                logger.info(f"Reparsed {rows} rows")
+        os.replace(tmp_path, output)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return rows
+
+
+def _db_connect():
+    return mysql.connector.connect(
+        host=os.getenv('db_host'),
+        user=os.getenv('db_user'),
+        password=os.getenv('db_password'),
+        database=os.getenv('db_name'),
+        connection_timeout=10
+    )
+
+
+def _db_chunks(cursor, chunksize: int, post_ids: set) -> Iterator[pd.DataFrame]:
+    """Rows of the cursor whose postID is in post_ids, in chunks of up to chunksize."""
+    columns = ["postID", "content", "address", "amenities"]
+    while True:
+        rows = cursor.fetchmany(chunksize)
+        if not rows:
+            break
+        rows = [row for row in rows if row[0] in post_ids]
+        if rows:
+            yield pd.DataFrame(rows, columns=columns)
+
+
+def reparse_db(source: str, chunksize: int, workers: int, config_file: str, seen_index_file: str) -> int:
+    """Rewrite derived columns of the source's rows of the `post` table in place; returns rows updated."""
+    if not os.path.exists(seen_index_file):
+        raise ValueError(f"Seen index {seen_index_file} not found; it is needed to tell {source} rows apart")
+    index = SeenIndex(seen_index_file)
+    try:
+        post_ids = index.post_ids(source)
+    finally:
+        index.close()
+    if not post_ids:
+        raise ValueError(f"Seen index {seen_index_file} lists no {source} posts")
+    logger.info(f"Reparsing the {len(post_ids)} {source} posts listed in {seen_index_file}")
+
+    load_dotenv()
+    read_conn, write_conn = _db_connect(), _db_connect()
+    read_cursor = read_conn.cursor(buffered=False)
+    write_cursor = write_conn.cursor()
+
+    if source == "fb":
+        update_sql = """
+            UPDATE post SET district = %s, ward = %s, street_address = %s, price = %s,
+                area = %s, amenities = %s, contact_info = %s
+            WHERE postID = %s
+        """
+    else:
+        update_sql = "UPDATE post SET district = %s, ward = %s, amenities = %s WHERE postID = %s"
+
+    rows = 0
+    try:
+        read_cursor.execute("SELECT postID, content, street_address, amenities FROM post")
+        for chunk in _map_in_order(_db_chunks(read_cursor, chunksize, post_ids), source, workers, config_file):
+            if source == "fb":
+                values = [
+                    (r.district, r.ward, r.address, r.price if r.price <= MAX_DB_PRICE else None,
+                     r.area if r.area != "" else None,
+                     json.dumps(r.amenities.split(', ') if r.amenities else [], ensure_ascii=False),
+                     r.contact, r.postID)
+                    for r in chunk.itertuples(index=False)
+                ]
+            else:
+                values = [(r.district, r.ward, r.amenities, r.postID) for r in chunk.itertuples(index=False)]
+            try:
+                write_cursor.executemany(update_sql, values)
+                write_conn.commit()
+                rows += len(values)
+            except Exception as e:
+                write_conn.rollback()
+                logger.error(f"Error updating a chunk of {len(values)} rows: {str(e)}; retrying them one by one")
+                # One bad value fails the whole statement, so only rows that also fail alone are skipped
+                for row in values:
+                    try:
+                        write_cursor.execute(update_sql, row)
+                        write_conn.commit()
+                        rows += 1
+                    except Exception as e:
+                        write_conn.rollback()
+                        logger.error(f"Error updating row {row[-1]}: {str(e)}")
+            logger.info(f"Updated {rows} rows")
+    finally:
+        read_cursor.close()
+        write_cursor.close()
+        read_conn.close()
+        write_conn.close()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-derive parsed fields from stored post content.")
+    parser.add_argument("csv_file", nargs="?", help="CSV written by Scrapping_FB.py or Scrapping_Web.py")
+    parser.add_argument("-o", "--output", help="Output CSV (default: rewrite the input in place)")
+    parser.add_argument("--from-db", action="store_true", help="Reparse the MySQL `post` table instead of a CSV")
+    parser.add_argument("--source", choices=["fb", "web"], help="Row format (default: detected from CSV header); "
+                        "with --from-db, only rows the seen index lists under this source are updated")
+    parser.add_argument("--seen-index", default="seen_index.sqlite",
+                        help="Seen index telling fb rows of `post` from web rows (used with --from-db)")
+    parser.add_argument("--chunksize", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--config", default="config.json")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    start_time = time.time()
+
+    if args.from_db:
+        if not args.source:
+            parser.error("--source is required with --from-db")
+        try:
+            rows = reparse_db(args.source, args.chunksize, args.workers, args.config, args.seen_index)
+        except ValueError as e:
+            parser.error(str(e))
+    elif args.csv_file:
+        rows = reparse_csv(args.csv_file, args.output, args.source, args.chunksize, args.workers, args.config)
+    else:
+        parser.error("give a CSV file or --from-db")
+
+    print(f"Reparsed {rows} rows in {time.time() - start_time:.2f} seconds")
+
+
+if __name__ == "__main__":
+    main()
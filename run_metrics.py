@@ -0,0 +1,171 @@
+import functools
+import json
+import logging
+import os
+import re
+import threading
+import time
+from array import array
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+_NULL_STAGE = nullcontext()
+
+
+def _percentile(ordered: array, q: float) -> float:
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, int(round(q * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+class RunMetrics:
+    """Stage timers for one scraper run, summarised as p50/p95/max per stage and per URL.
+
+    Wrap work in `with metrics.stage("driver_get", url):` or decorate a
+    method with @timed("db_upsert"). Durations are kept as raw samples, so
+    percentiles are exact. A URL's total only adds up its outermost stages,
+    so nested timers are broken out without being counted twice. When
+    disabled, stage() hands back one shared no-op context manager and
+    nothing is recorded. Safe to share between threads.
+    """
+
+    def __init__(self, enabled: bool = True, slowest_urls: int = 20):
+        self.enabled = enabled
+        self.slowest_urls = slowest_urls
+        self.started = time.time()
+        self._samples: Dict[str, array] = {}
+        self._urls: Dict[str, Dict[str, float]] = {}
+        self._counters: Dict[str, int] = {}
+        self._url_totals: Dict[str, float] = {}
+        self._depth = threading.local()
+        self._lock = threading.Lock()
+
+    def stage(self, name: str, url: Optional[str] = None):
+        """Context manager timing one stage; url also files the time under that URL."""
+        if not self.enabled:
+            return _NULL_STAGE
+        return self._timer(name, url)
+
+    @contextmanager
+    def _timer(self, name: str, url: Optional[str]) -> Iterator[None]:
+        depth = getattr(self._depth, "value", 0)
+        self._depth.value = depth + 1
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._depth.value = depth
+            self.observe(name, time.perf_counter() - started, url)
+
+    def observe(self, name: str, seconds: float, url: Optional[str] = None):
+        """Record a duration measured elsewhere (e.g. the throttle's wait)."""
+        if not self.enabled:
+            return
+        with self._lock:
+            samples = self._samples.get(name)
+            if samples is None:
+                samples = self._samples[name] = array('d')
+            samples.append(seconds)
+            if url:
+                stages = self._urls.setdefault(url, {})
+                stages[name] = stages.get(name, 0.0) + seconds
+                if not getattr(self._depth, "value", 0):
+                    self._url_totals[url] = self._url_totals.get(url, 0.0) + seconds
+
+    def count(self, name: str, n: int = 1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            stages = {}
+            for name, samples in self._samples.items():
+                ordered = array('d', sorted(samples))
+                stages[name] = {
+                    "count": len(ordered),
+                    "total": round(sum(ordered), 6),
+                    "p50": round(_percentile(ordered, 0.50), 6),
+                    "p95": round(_percentile(ordered, 0.95), 6),
+                    "max": round(ordered[-1], 6),
+                }
+            url_totals = sorted(((self._url_totals.get(url, 0.0), url, s) for url, s in self._urls.items()),
+                                reverse=True)
+            slowest = [{"url": url, "total": round(total, 6), "stages": {k: round(v, 6) for k, v in s.items()}}
+                       for total, url, s in url_totals[:self.slowest_urls]]
+            per_url = array('d', sorted(total for total, _, _ in url_totals))
+            return {
+                "started": self.started,
+                "elapsed": round(time.time() - self.started, 3),
+                "stages": stages,
+                "urls": {
+                    "count": len(per_url),
+                    "p50": round(_percentile(per_url, 0.50), 6),
+                    "p95": round(_percentile(per_url, 0.95), 6),
+                    "max": round(per_url[-1], 6) if per_url else 0.0,
+                    "slowest": slowest,
+                },
+                "counters": dict(self._counters),
+            }
+
+    def write_report(self, path: str, extra: Optional[Dict[str, Any]] = None):
+        """JSON run report: stage and URL histograms plus any extra sections (pacing, sessions...)."""
+        if not self.enabled or not path:
+            return
+        report = self.summary()
+        report.update(extra or {})
+        try:
+            with open(f"{path}.tmp", 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2, default=str)
+            os.replace(f"{path}.tmp", path)
+            logger.info(f"Run report written to {path}")
+        except Exception as e:
+            logger.error(f"Could not write run report {path}: {str(e)}")
+
+    def write_prometheus(self, path: str, job: str):
+        """Prometheus textfile-collector output (node_exporter --collector.textfile.directory)."""
+        if not self.enabled or not path:
+            return
+        summary = self.summary()
+        job = re.sub(r"[^a-zA-Z0-9_]", "_", job)
+        lines = [
+            "# HELP scraper_stage_seconds Time spent per scraper stage in the last run.",
+            "# TYPE scraper_stage_seconds summary",
+        ]
+        for name, stats in summary["stages"].items():
+            labels = f'job="{job}",stage="{name}"'
+            lines.append(f'scraper_stage_seconds{{{labels},quantile="0.5"}} {stats["p50"]}')
+            lines.append(f'scraper_stage_seconds{{{labels},quantile="0.95"}} {stats["p95"]}')
+            lines.append(f'scraper_stage_seconds{{{labels},quantile="1"}} {stats["max"]}')
+            lines.append(f'scraper_stage_seconds_sum{{{labels}}} {stats["total"]}')
+            lines.append(f'scraper_stage_seconds_count{{{labels}}} {stats["count"]}')
+        lines += ["# HELP scraper_events_total Events counted in the last run.", "# TYPE scraper_events_total gauge"]
+        for name, value in summary["counters"].items():
+            lines.append(f'scraper_events_total{{job="{job}",event="{name}"}} {value}')
+        lines += ["# HELP scraper_run_seconds Wall time of the last run.", "# TYPE scraper_run_seconds gauge",
+                  f'scraper_run_seconds{{job="{job}"}} {summary["elapsed"]}',
+                  "# HELP scraper_run_finished_timestamp_seconds When the last run finished.",
+                  "# TYPE scraper_run_finished_timestamp_seconds gauge",
+                  f'scraper_run_finished_timestamp_seconds{{job="{job}"}} {time.time():.0f}']
+        try:
+            # The collector may read at any moment, so the file is swapped in whole
+            with open(f"{path}.tmp", 'w', encoding='utf-8') as f:
+                f.write("\n".join(lines) + "\n")
+            os.replace(f"{path}.tmp", path)
+        except Exception as e:
+            logger.error(f"Could not write Prometheus textfile {path}: {str(e)}")
+
+
+def timed(stage: str) -> Callable:
+    """Method decorator: time calls under `stage` on the instance's `metrics`."""
+    def decorate(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            with self.metrics.stage(stage):
+                return func(self, *args, **kwargs)
+        return wrapper
+    return decorate
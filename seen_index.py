@@ -0,0 +1,124 @@
+import csv
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS posts (
+    post_id TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS urls (
+    url TEXT PRIMARY KEY,
+    post_id TEXT,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS posts_source ON posts(source);
+"""
+
+
+class SeenIndex:
+    """Persistent URL -> postID -> last-seen index, kept in SQLite.
+
+    Lets a recurring run decide what is new before navigating, so its cost
+    follows the number of new listings rather than the size of the output
+    CSV. Safe to share between threads.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def seen_url(self, url: str, max_age_hours: float = 0) -> bool:
+        """True if url was visited before (and, with max_age_hours, recently enough)."""
+        with self._lock:
+            row = self.conn.execute("SELECT last_seen FROM urls WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            return False
+        return not max_age_hours or time.time() - row[0] < max_age_hours * 3600
+
+    def has_post(self, post_id: str) -> bool:
+        with self._lock:
+            return self.conn.execute("SELECT 1 FROM posts WHERE post_id = ?", (post_id,)).fetchone() is not None
+
+    def record(self, post_id: str, source: str, url: Optional[str] = None):
+        """Mark a post (and the URL it came from) as seen now."""
+        now = time.time()
+        with self._lock:
+            self.conn.execute("BEGIN")
+            try:
+                self.conn.execute(
+                    "INSERT INTO posts (post_id, source, first_seen, last_seen) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(post_id) DO UPDATE SET last_seen = excluded.last_seen",
+                    (post_id, source, now, now))
+                if url:
+                    self.conn.execute(
+                        "INSERT INTO urls (url, post_id, first_seen, last_seen) VALUES (?, ?, ?, ?) "
+                        "ON CONFLICT(url) DO UPDATE SET post_id = excluded.post_id, last_seen = excluded.last_seen",
+                        (url, post_id, now, now))
+                self.conn.execute("COMMIT")
+            except BaseException:
+                # Leave the connection usable: otherwise every later BEGIN fails inside the open transaction
+                self.conn.execute("ROLLBACK")
+                raise
+
+    def count(self, source: Optional[str] = None) -> int:
+        with self._lock:
+            if source:
+                return self.conn.execute("SELECT COUNT(*) FROM posts WHERE source = ?", (source,)).fetchone()[0]
+            return self.conn.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+
+    def post_ids(self, source: str) -> set:
+        """Every post ID recorded for source."""
+        with self._lock:
+            return {row[0] for row in self.conn.execute("SELECT post_id FROM posts WHERE source = ?", (source,))}
+
+    def seed(self, rows: Iterable[tuple], source: str) -> int:
+        """Bulk-insert (post_id, url) pairs from an older run; returns rows read."""
+        now = time.time()
+        count = 0
+        with self._lock:
+            self.conn.execute("BEGIN")
+            try:
+                for post_id, url in rows:
+                    if not post_id:
+                        continue
+                    self.conn.execute("INSERT OR IGNORE INTO posts VALUES (?, ?, ?, ?)", (post_id, source, now, now))
+                    if url:
+                        self.conn.execute("INSERT OR IGNORE INTO urls VALUES (?, ?, ?, ?)", (url, post_id, now, now))
+                    count += 1
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+        return count
+
+    def seed_from_csv(self, csv_path: str, source: str) -> int:
+        """One-time import of post IDs from an existing output CSV when the index has none for source."""
+        if self.count(source) or not os.path.exists(csv_path):
+            return 0
+        try:
+            with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+                reader = csv.DictReader(f)
+                count = self.seed(((row.get("postID"), row.get("url")) for row in reader), source)
+            logger.info(f"Seeded seen index with {count} {source} posts from {csv_path}")
+            return count
+        except Exception as e:
+            logger.error(f"Could not seed seen index from {csv_path}: {str(e)}")
+            return 0
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
@@ -0,0 +1,56 @@
+import re
+from typing import Dict, List, Optional
+
+
+class StreetIndex:
+    """Precompiled street matcher built once from config.json["streets"].
+
+    All street names are folded into a single alternation, factored on their
+    first characters so the regex engine only tries the streets that can
+    start at the current position. Alternatives keep their config order, so
+    the result is the same as running one pattern per street and keeping the
+    leftmost match.
+    """
+
+    PREFIX_DEPTH = 3
+
+    def __init__(self, streets: List[str]):
+        self.streets = [s for s in streets if s]
+        self.pattern: Optional[re.Pattern] = None
+        if self.streets:
+            alternation = self._build_alternation(self.streets, self.PREFIX_DEPTH)
+            self.pattern = re.compile(
+                r'\b(\d*\s*(?:' + alternation + r')(?:\s+\d+)?)\b', re.IGNORECASE
+            )
+
+    @classmethod
+    def _build_alternation(cls, names: List[str], depth: int) -> str:
+        """Build an ordered alternation, grouping names by their leading characters."""
+        # A name that ends at this level can overlap with longer siblings,
+        # so stop factoring there to keep the config order intact.
+        if depth == 0 or any(not name for name in names):
+            return '|'.join(re.escape(name) for name in names)
+
+        groups: Dict[str, List[str]] = {}
+        for name in names:
+            groups.setdefault(name[0].lower(), []).append(name)
+
+        parts = []
+        for members in groups.values():
+            tail = cls._build_alternation([m[1:] for m in members], depth - 1)
+            parts.append(re.escape(members[0][0]) + '(?:' + tail + ')')
+        return '|'.join(parts)
+
+    def search(self, content: str) -> Optional[re.Match]:
+        """Return the leftmost street mention in content, if any."""
+        if not content or self.pattern is None:
+            return None
+        return self.pattern.search(content)
+
+    def find(self, content: str) -> str:
+        """Return the leftmost street mention with its house number prefix and suffix."""
+        match = self.search(content)
+        return match.group(0).strip() if match else ""
+
+    def __len__(self) -> int:
+        return len(self.streets)